@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+
+# Define class ...
+class Raster:
+    """
+    A georeferenced raster container which is loaded lazily.
+
+    Arguments:
+    fname -- the name of the raster container
+
+    Note:
+    See hml.createRaster() for a description of the raster container. Only the
+    header is read when a Raster is made. The pixels are not read until they
+    are used: "grid" loads the whole raster (which, if it is not compressed,
+    only memory-maps it) and "window()" only loads the pixels which overlap a
+    rectangle (so that, if it is compressed, only the tiles which overlap the
+    rectangle are decompressed). The arithmetic methods, "sum()" and "toPNG()"
+    only read one band of rows at a time (see "rows()").
+    """
+
+    # Define function ...
+    def __init__(self, fname, /):
+        # Import sub-functions ...
+        from .loadRasterHeader import loadRasterHeader
+
+        # Load the header ...
+        self.fname = fname
+        self.header = loadRasterHeader(fname)
+        self.loadedGrid = None
+
+    # Define function ...
+    @property
+    def crs(self):
+        """
+        The coordinate reference system of the raster, e.g. "EPSG:27700" (or
+        None).
+        """
+
+        # Return answer ...
+        return self.header["crs"]
+
+    # Define function ...
+    @property
+    def extent(self):
+        """
+        The [left, right, bottom, top] edges of the raster (in the same order
+        as the "extent" of matplotlib.pyplot.imshow()).
+        """
+
+        # Return answer ...
+        return [self.xmin, self.xmax, self.ymin, self.ymax]
+
+    # Define function ...
+    @property
+    def grid(self):
+        """
+        The whole raster with axes (ny, nx), which is loaded the first time it
+        is used (see hml.loadRaster()).
+        """
+
+        # Import sub-functions ...
+        from .loadRaster import loadRaster
+
+        # Check if the raster needs loading ...
+        if self.loadedGrid is None:
+            self.loadedGrid = loadRaster(self.fname)
+
+        # Return answer ...
+        return self.loadedGrid
+
+    # Define function ...
+    @property
+    def nx(self):
+        """
+        The number of x pixels.
+        """
+
+        # Return answer ...
+        return self.header["shape"][1]
+
+    # Define function ...
+    @property
+    def ny(self):
+        """
+        The number of y pixels.
+        """
+
+        # Return answer ...
+        return self.header["shape"][0]
+
+    # Define function ...
+    @property
+    def px(self):
+        """
+        The size of the pixels.
+        """
+
+        # Return answer ...
+        return self.header["px"]
+
+    # Define function ...
+    @property
+    def xmin(self):
+        """
+        The x position of the left-hand side of the raster.
+        """
+
+        # Return answer ...
+        return self.header["x0"]
+
+    # Define function ...
+    @property
+    def xmax(self):
+        """
+        The x position of the right-hand side of the raster.
+        """
+
+        # Return answer ...
+        return self.header["x0"] + self.header["px"] * float(self.nx)
+
+    # Define function ...
+    @property
+    def ymin(self):
+        """
+        The y position of the bottom of the raster.
+        """
+
+        # Return answer ...
+        return self.header["y0"]
+
+    # Define function ...
+    @property
+    def ymax(self):
+        """
+        The y position of the top of the raster.
+        """
+
+        # Return answer ...
+        return self.header["y0"] + self.header["px"] * float(self.ny)
+
+    # Define function ...
+    def add(self, fname, /, *others, bandSize = 256):
+        """
+        Add other rasters to this raster and save the total as a new raster
+        container.
+
+        Arguments:
+        fname -- the name of the new raster container
+        others -- the other Rasters
+
+        Keyword arguments:
+        bandSize -- the number of rows to add at a time (default 256)
+
+        Note:
+        The other rasters must have the same shape and georeference as this
+        raster. The new raster container is uncompressed, it has the same data
+        type and georeference as this raster and it is returned as a Raster.
+        """
+
+        # Import special modules ...
+        try:
+            import numpy
+        except:
+            raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+        # Import sub-functions ...
+        from .createRaster import createRaster
+        from .loadRaster import loadRaster
+
+        # Check the other rasters ...
+        for other in others:
+            if other.header["shape"] != self.header["shape"] or other.extent != self.extent:
+                raise ValueError(f"\"{other.fname}\" does not have the same shape and georeference as \"{self.fname}\"") from None
+
+        # Create the new raster container and memory-map it ...
+        createRaster(
+            fname,
+            self.nx,
+            self.ny,
+              crs = self.crs,
+            dtype = self.header["dtype"],
+               px = self.px,
+               x0 = self.xmin,
+               y0 = self.ymin,
+        )
+        total = loadRaster(fname, mode = "r+")
+
+        # Loop over bands of rows ...
+        for iy in range(0, self.ny, bandSize):
+            # Add the band of rows of all of the rasters together ...
+            band = numpy.array(self.rows(iy, iy + bandSize))
+            for other in others:
+                band += other.rows(iy, iy + bandSize)
+            total[iy:iy + bandSize, :] = band
+        total.flush()
+        del total
+
+        # Return answer ...
+        return Raster(fname)
+
+    # Define function ...
+    def multiply(self, fname, factor, /, *, bandSize = 256):
+        """
+        Multiply this raster by a factor and save the answer as a new raster
+        container.
+
+        Arguments:
+        fname -- the name of the new raster container
+        factor -- the factor
+
+        Keyword arguments:
+        bandSize -- the number of rows to multiply at a time (default 256)
+
+        Note:
+        The new raster container is uncompressed, it has the same data type and
+        georeference as this raster and it is returned as a Raster.
+        """
+
+        # Import sub-functions ...
+        from .createRaster import createRaster
+        from .loadRaster import loadRaster
+
+        # Create the new raster container and memory-map it ...
+        createRaster(
+            fname,
+            self.nx,
+            self.ny,
+              crs = self.crs,
+            dtype = self.header["dtype"],
+               px = self.px,
+               x0 = self.xmin,
+               y0 = self.ymin,
+        )
+        answer = loadRaster(fname, mode = "r+")
+
+        # Loop over bands of rows ...
+        for iy in range(0, self.ny, bandSize):
+            # Multiply the band of rows by the factor ...
+            answer[iy:iy + bandSize, :] = self.rows(iy, iy + bandSize) * factor
+        answer.flush()
+        del answer
+
+        # Return answer ...
+        return Raster(fname)
+
+    # Define function ...
+    def radialProfile(self, cx, cy, radii, /, *, ndiv = 0):
+        """
+        Sum the raster within many circles around a point.
+
+        Arguments:
+        cx -- x position of centre of circles
+        cy -- y position of centre of circles
+        radii -- 1D array of radii of circles
+
+        Keyword arguments:
+        ndiv -- number sub-divisions (default 0, which means find the exact
+                fractions)
+
+        Note:
+        Only the window of the raster which contains the largest circle is
+        loaded (see "window()") and it is passed to hml.radialProfile().
+        """
+
+        # Import special modules ...
+        try:
+            import numpy
+        except:
+            raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+        # Import sub-functions ...
+        from .radialProfile import radialProfile
+
+        # Load the window which contains the largest circle and return early
+        # if it is empty ...
+        radii = numpy.asarray(radii, dtype = numpy.float64).reshape(-1)
+        r = float(radii.max()) if radii.size > 0 else 0.0
+        img, extent = self.window(cx - r, cx + r, cy - r, cy + r)
+        if img.size == 0:
+            return numpy.zeros(radii.size, dtype = numpy.float64)
+
+        # Return answer ...
+        return radialProfile(
+            img,
+            *extent,
+            radii,
+              cx = cx,
+              cy = cy,
+            ndiv = ndiv,
+        )
+
+    # Define function ...
+    def rows(self, iy1, iy2, /):
+        """
+        Load a band of rows of the raster.
+
+        Arguments:
+        iy1 -- the y index of the lowermost row
+        iy2 -- the y index after the uppermost row
+
+        Note:
+        If the raster is not compressed then this is a slice of the
+        memory-map of the whole raster, otherwise only the tiles which overlap
+        the band of rows are decompressed.
+        """
+
+        # Import sub-functions ...
+        from .loadRaster import loadRaster
+
+        # Clip the band of rows to the raster ...
+        iy1 = min(self.ny, max(0, iy1))
+        iy2 = min(self.ny, max(iy1, iy2))
+
+        # Check if the raster is compressed ...
+        if self.header["compression"] == "none":
+            # Return answer ...
+            return self.grid[iy1:iy2, :]
+
+        # Return answer ...
+        return loadRaster(self.fname, iy1 = iy1, ny = iy2 - iy1)
+
+    # Define function ...
+    def sum(self, /, *, bandSize = 256):
+        """
+        Sum the raster.
+
+        Keyword arguments:
+        bandSize -- the number of rows to sum at a time (default 256)
+        """
+
+        # Import special modules ...
+        try:
+            import numpy
+        except:
+            raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+        # Initialize total ...
+        tot = 0.0
+
+        # Loop over bands of rows ...
+        for iy in range(0, self.ny, bandSize):
+            # Add the band of rows to the total ...
+            tot += float(self.rows(iy, iy + bandSize).sum(dtype = numpy.float64))
+
+        # Return answer ...
+        return tot
+
+    # Define function ...
+    def sumWithinCircle(self, cx, cy, r, /, *, method = None, ndiv = 0):
+        """
+        Sum the raster within a circle.
+
+        Arguments:
+        cx -- x position of centre of circle
+        cy -- y position of centre of circle
+        r -- radius of circle
+
+        Keyword arguments:
+        method -- the method to pass to hml.sumImageWithinCircle() (default
+                  None)
+        ndiv -- number sub-divisions (default 0, which means find the exact
+                fractions)
+
+        Note:
+        Only the window of the raster which contains the circle is loaded (see
+        "window()") and it is passed to hml.sumImageWithinCircle().
+        """
+
+        # Import sub-functions ...
+        from .sumImageWithinCircle import sumImageWithinCircle
+
+        # Load the window which contains the circle and return early if it is
+        # empty ...
+        img, extent = self.window(cx - r, cx + r, cy - r, cy + r)
+        if img.size == 0:
+            return 0.0
+
+        # Return answer ...
+        return sumImageWithinCircle(
+            img,
+            *extent,
+            r,
+                cx = cx,
+                cy = cy,
+            method = method,
+              ndiv = ndiv,
+        )
+
+    # Define function ...
+    def sumWithinCircles(self, cx, cy, radii, /, *, ndiv = 0):
+        """
+        Sum the raster within many circles around many points.
+
+        Arguments:
+        cx -- 1D array of x positions of centres of circles
+        cy -- 1D array of y positions of centres of circles
+        radii -- 1D array of radii of circles
+
+        Keyword arguments:
+        ndiv -- number sub-divisions (default 0, which means find the exact
+                fractions)
+
+        Note:
+        Only the window of the raster which contains all of the largest circles
+        is loaded (see "window()") and it is passed to
+        hml.sumImageWithinCircles(), which returns a (ncentre, nradius) array.
+        """
+
+        # Import special modules ...
+        try:
+            import numpy
+        except:
+            raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+        # Import sub-functions ...
+        from .sumImageWithinCircles import sumImageWithinCircles
+
+        # Load the window which contains all of the largest circles and return
+        # early if it is empty ...
+        cx = numpy.asarray(cx, dtype = numpy.float64).reshape(-1)
+        cy = numpy.asarray(cy, dtype = numpy.float64).reshape(-1)
+        radii = numpy.asarray(radii, dtype = numpy.float64).reshape(-1)
+        if cx.size == 0 or radii.size == 0:
+            return numpy.zeros((cx.size, radii.size), dtype = numpy.float64)
+        r = float(radii.max())
+        img, extent = self.window(float(cx.min()) - r, float(cx.max()) + r, float(cy.min()) - r, float(cy.max()) + r)
+        if img.size == 0:
+            return numpy.zeros((cx.size, radii.size), dtype = numpy.float64)
+
+        # Return answer ...
+        return sumImageWithinCircles(
+            img,
+            *extent,
+            cx,
+            cy,
+            radii,
+            ndiv = ndiv,
+        )
+
+    # Define function ...
+    def toPNG(self, fname, /, *, bandSize = 256, ct = "turbo", debug = False, timeout = 60.0):
+        """
+        Save the raster as a PNG.
+
+        Arguments:
+        fname -- the name of the PNG
+
+        Keyword arguments:
+        bandSize -- the number of rows to scale at a time (default 256)
+        ct -- the colour table to pass to
+              pyguymer3.image.save_array_as_image() (default "turbo")
+        debug -- print debug messages (default False)
+        timeout -- the timeout for any requests/subprocess calls (in seconds)
+                   (default 60.0)
+
+        Note:
+        The raster is assumed to be the area of each pixel which is covered (in
+        the same units as the size of the pixels squared), so it is divided by
+        the area of a pixel and scaled to 0-255 before it is saved. The rows
+        are flipped, because the rows of the raster are ordered from south to
+        north whereas the rows of the PNG are ordered from north to south.
+        """
+
+        # Import special modules ...
+        try:
+            import numpy
+        except:
+            raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+        try:
+            import pyguymer3
+            import pyguymer3.image
+        except:
+            raise Exception("\"pyguymer3\" is not installed; run \"pip install --user PyGuymer3\"") from None
+
+        # Initialize array ...
+        img = numpy.zeros((self.ny, self.nx), dtype = numpy.float32)            # [colour level]
+
+        # Loop over bands of rows ...
+        for iy in range(0, self.ny, bandSize):
+            # Flip the band of rows, scale it correctly and put it in the
+            # array ...
+            band = numpy.flip(self.rows(iy, iy + bandSize), axis = 0).astype(numpy.float32)
+            band *= 255.0 / (self.px * self.px)                                 # [colour level]
+            img[self.ny - iy - band.shape[0]:self.ny - iy, :] = numpy.clip(band, 0.0, 255.0)  # [colour level]
+
+        # Save array as PNG ...
+        pyguymer3.image.save_array_as_image(
+            img,
+            fname,
+                 ct = ct,
+              debug = debug,
+            timeout = timeout,
+        )
+
+    # Define function ...
+    def window(self, xmin, xmax, ymin, ymax, /):
+        """
+        Load the window of the raster which contains a rectangle.
+
+        Arguments:
+        xmin -- left edge of rectangle
+        xmax -- right edge of rectangle
+        ymin -- lower edge of rectangle
+        ymax -- upper edge of rectangle
+
+        Note:
+        The rectangle is expanded to whole pixels and clipped to the raster.
+        This function returns the window (see hml.loadRaster()) and its
+        [left, right, bottom, top] edges. The window is empty if the rectangle
+        does not overlap the raster.
+        """
+
+        # Import standard modules ...
+        import math
+
+        # Import sub-functions ...
+        from .loadRaster import loadRaster
+
+        # Find the window of pixels which overlap the rectangle ...
+        ix1 = min(self.nx, max(0, math.floor((xmin - self.xmin) / self.px)))
+        ix2 = max(ix1, min(self.nx, math.ceil((xmax - self.xmin) / self.px)))
+        iy1 = min(self.ny, max(0, math.floor((ymin - self.ymin) / self.px)))
+        iy2 = max(iy1, min(self.ny, math.ceil((ymax - self.ymin) / self.px)))
+
+        # Check if the raster is compressed ...
+        if self.header["compression"] == "none":
+            # Slice the memory-map of the whole raster (so that it is only
+            # memory-mapped once) ...
+            img = self.grid[iy1:iy2, ix1:ix2]
+        else:
+            # Decompress only the tiles which overlap the window ...
+            img = loadRaster(
+                self.fname,
+                ix1 = ix1,
+                iy1 = iy1,
+                 nx = ix2 - ix1,
+                 ny = iy2 - iy1,
+            )
+
+        # Return answer ...
+        return img, [
+            self.xmin + self.px * float(ix1),
+            self.xmin + self.px * float(ix2),
+            self.ymin + self.px * float(iy1),
+            self.ymin + self.px * float(iy2),
+        ]
@@ -1,8 +1,40 @@
 #!/usr/bin/env python3
 
 # Import sub-functions ...
+from .attachSharedGrid import attachSharedGrid
+from .convolveImageWithCircle import convolveImageWithCircle
+from .createRaster import createRaster
+from .findAreaOfRectangleWithinCircle import findAreaOfRectangleWithinCircle
+from .findCircleKernel import findCircleKernel
 from .findExtent import findExtent
 from .findFractionOfPixelWithinCircle import findFractionOfPixelWithinCircle
+from .findFractionOfPixelsWithinCircle import findFractionOfPixelsWithinCircle
+from .findRecordBboxes import findRecordBboxes
+from .handleRasterConnection import handleRasterConnection
+from .ingestShapefile import ingestShapefile
+from .iterPolygons import iterPolygons
+from .loadGeometries import loadGeometries
+from .loadRaster import loadRaster
+from .loadRasterHeader import loadRasterHeader
+from .makePyramid import makePyramid
+from .makeSummedAreaTable import makeSummedAreaTable
+from .queryRaster import queryRaster
+from .radialProfile import radialProfile
+from .Raster import Raster
 from .rasterizePolygon import rasterizePolygon
+from .rasterizePolygons import rasterizePolygons
+from .rasterizeRings import rasterizeRings
 from .rasterizeShapefile import rasterizeShapefile
+from .rasterizeTile import rasterizeTile
+from .saveRaster import saveRaster
+from .serveRaster import serveRaster
+from .splitPolygon import splitPolygon
 from .sumImageWithinCircle import sumImageWithinCircle
+from .sumImageWithinCircleFortran import sumImageWithinCircleFortran
+from .sumImageWithinCircleKernel import sumImageWithinCircleKernel
+from .sumImageWithinCircleLoop import sumImageWithinCircleLoop
+from .sumImageWithinCirclePyramid import sumImageWithinCirclePyramid
+from .sumImageWithinCircleSAT import sumImageWithinCircleSAT
+from .sumImageWithinCircleVectorized import sumImageWithinCircleVectorized
+from .sumImageWithinCircles import sumImageWithinCircles
+from .updateRaster import updateRaster
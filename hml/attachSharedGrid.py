@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+# Define dictionary ...
+# NOTE: This is populated in each worker by "attachSharedGrid()" and then read
+#       by "rasterizePolygons()".
+sharedGrid: dict[str, object] = {}
+
+# Define function ...
+def attachSharedGrid(name, ny, nx, locks, nrow, /, *, fname = None, offset = 0):
+    """
+    Attach a worker to a global grid that is in shared memory.
+
+    Arguments:
+    name -- the name of the multiprocessing.shared_memory.SharedMemory block
+    ny -- number of y pixels
+    nx -- number of x pixels
+    locks -- a list of multiprocessing.Lock, one for each band of rows
+    nrow -- the number of rows in each band
+
+    Keyword arguments:
+    fname -- the name of a file to memory-map instead of attaching to a
+             multiprocessing.shared_memory.SharedMemory block (default None)
+    offset -- the offset (in bytes) of the global grid within "fname" (default
+              0)
+
+    Note:
+    This function is the initializer of the pool of workers in
+    hml.rasterizeShapefile() and it must be called before any calls to
+    hml.rasterizePolygons(..., shared = True).
+    """
+
+    # Import standard modules ...
+    import multiprocessing
+    import multiprocessing.shared_memory
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+    # Check if the global grid is in a file ...
+    if fname is not None:
+        # Memory-map the file ...
+        # NOTE: All processes which memory-map the same file share the same
+        #       pages, so writes from the workers are seen by the parent.
+        shm = None
+        grid = numpy.memmap(
+            fname,
+                dtype = numpy.float32,
+                 mode = "r+",
+               offset = offset,
+                shape = (ny, nx),
+        )                                                                       # [m2]
+    else:
+        # Attach to the shared memory ...
+        # NOTE: The workers share the resource tracker of the parent, so
+        #       attaching to the shared memory here does not stop the parent
+        #       from being the one that unlinks it.
+        shm = multiprocessing.shared_memory.SharedMemory(name = name)
+        grid = numpy.ndarray((ny, nx), dtype = numpy.float32, buffer = shm.buf) # [m2]
+
+    # Populate dictionary ...
+    sharedGrid["shm"] = shm
+    sharedGrid["grid"] = grid                                                   # [m2]
+    sharedGrid["locks"] = locks
+    sharedGrid["nrow"] = nrow
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def convolveImageWithCircle(img, r, /, *, ndiv = 0, out = None, px = 1024.0, tileSize = 1024):
+    """
+    Sum the pixel values on an image that are within a hard circular mask
+    centred on every pixel of the image.
+
+    Arguments:
+    img -- 2D image with axes (ny, nx)
+    r -- radius of circle
+
+    Keyword arguments:
+    ndiv -- number sub-divisions (default 0, which means find the exact
+            fractions)
+    out -- the 2D array with axes (ny, nx) to put the answers in (default None,
+           which means make a new float64 array)
+    px -- the size of the pixels (default 1024.0)
+    tileSize -- the number of rows and columns of the image to convolve at a
+                time (default 1024)
+
+    Note:
+    Element [iy, ix] of the answer is the same as calling
+    hml.sumImageWithinCircle() for a circle centred on the centre of pixel
+    [iy, ix], but the answers for all of the pixels are found at once by
+    convolving the image with a kernel which contains the fraction of each
+    pixel that is within a circle centred on the middle of the kernel (see
+    hml.findFractionOfPixelsWithinCircle()).
+
+    The convolution is done using FFTs with the overlap-add method: the image
+    is split into tiles, each tile is padded by the radius of the kernel and
+    convolved on its own, and the result is added on to the answer (so that
+    the tiles overlap by the radius of the kernel). Tiles which are empty are
+    skipped. Only one tile is ever in RAM at a time, so "img" and "out" can both
+    be a numpy.memmap (for example, from hml.loadRaster()). If "out" is
+    passed then it is overwritten.
+
+    The answers are only accurate to the precision of the FFTs, so pixels which
+    should be zero will typically be of order 1e-12 of the largest answer.
+    """
+
+    # Import standard modules ...
+    import math
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+    # Import sub-functions ...
+    from .findFractionOfPixelsWithinCircle import findFractionOfPixelsWithinCircle
+
+    # Check output ...
+    if out is None:
+        out = numpy.zeros(img.shape, dtype = numpy.float64)
+    elif out.shape != img.shape:
+        raise ValueError(f"\"out\" is not the same shape as \"img\" ({repr(out.shape)} and {repr(img.shape)})") from None
+    else:
+        out[:, :] = 0.0
+
+    # Create short-hands ...
+    nx = img.shape[1]                                                           # [#]
+    ny = img.shape[0]                                                           # [#]
+    nk = math.ceil(r / px + 0.5)                                                # [#]
+
+    # Create nodes of the kernel relative to the centre of the circle ...
+    axis = (numpy.arange(-nk, nk + 2, dtype = numpy.float64) - 0.5) * px       # [m]
+
+    # Make the kernel ...
+    kernel = findFractionOfPixelsWithinCircle(
+        axis[:-1].reshape(1, -1),
+        axis[1:].reshape(1, -1),
+        axis[:-1].reshape(-1, 1),
+        axis[1:].reshape(-1, 1),
+        r,
+        ndiv = ndiv,
+    )
+
+    # Find the FFT of the kernel (which is the same size as a padded tile) ...
+    shape = (tileSize + 2 * nk, tileSize + 2 * nk)
+    kernel = numpy.fft.rfft2(kernel, s = shape)
+
+    # Loop over tiles ...
+    for iy in range(0, ny, tileSize):
+        for ix in range(0, nx, tileSize):
+            # Load the tile and skip it if it is empty ...
+            tile = numpy.asarray(img[iy:iy + tileSize, ix:ix + tileSize], dtype = numpy.float64)
+            if not tile.any():
+                continue
+
+            # Convolve the tile with the kernel ...
+            tile = numpy.fft.irfft2(numpy.fft.rfft2(tile, s = shape) * kernel, s = shape)
+
+            # Find the part of the convolved tile which is within the image
+            # (the convolved tile starts "nk" pixels before the tile) ...
+            iy1 = max(0, iy - nk)
+            iy2 = min(ny, iy + tileSize + nk)
+            ix1 = max(0, ix - nk)
+            ix2 = min(nx, ix + tileSize + nk)
+
+            # Add the convolved tile to the answer ...
+            out[iy1:iy2, ix1:ix2] += tile[iy1 - iy + nk:iy2 - iy + nk, ix1 - ix + nk:ix2 - ix + nk]
+
+    # Return answer ...
+    return out
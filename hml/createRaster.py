@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def createRaster(fname, nx, ny, /, *, crs = None, dtype = "float32", px = 1024.0, x0 = 0.0, y0 = 0.0):
+    """
+    Create an uncompressed raster container which is full of zeros.
+
+    Arguments:
+    fname -- the name of the raster container
+    nx -- number of x pixels
+    ny -- number of y pixels
+
+    Keyword arguments:
+    crs -- the coordinate reference system of the raster, e.g. "EPSG:27700"
+           (default None)
+    dtype -- the data type of the pixels (default "float32")
+    px -- pixel size (default 1024.0)
+    x0 -- the x position of the left-hand side of the raster (default 0.0)
+    y0 -- the y position of the bottom of the raster (default 0.0)
+
+    Note:
+    A raster container starts with the 8 bytes "HMLRAST1", followed by the
+    length of the header as a little-endian 8-byte unsigned integer and then
+    the header itself as UTF-8 JSON. The header contains the shape, the data
+    type and the georeference of the raster, the compression and the offset
+    of the data. The data starts on a 4096-byte boundary. The rows are ordered
+    from south to north (the same way round as the grids from
+    hml.rasterizeShapefile()).
+
+    Uncompressed data is stored row-major, so it can be memory-mapped (see
+    hml.loadRaster()) or filled in directly by passing "fname" and the
+    "dataOffset" from the header to hml.rasterizeShapefile(). Compressed data is
+    stored as individually compressed tiles (see hml.saveRaster()).
+
+    This function returns the header.
+    """
+
+    # Import standard modules ...
+    import json
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+    # Create header ...
+    header = {
+        "compression" : "none",
+                "crs" : crs,
+         "dataOffset" : 0,
+              "dtype" : numpy.dtype(dtype).str,
+                 "px" : float(px),                                              # [m]
+              "shape" : [ny, nx],
+            "version" : 1,
+                 "x0" : float(x0),                                              # [m]
+                 "y0" : float(y0),                                              # [m]
+    }
+
+    # Find the offset of the data (leaving room for the digits of the offset
+    # itself in the header) ...
+    header["dataOffset"] = 4096 * ((16 + len(json.dumps(header)) + 20 + 4095) // 4096)
+
+    # Save the header and then extend the file to its full length (which fills
+    # the data with zeros) ...
+    with open(fname, "wb") as fObj:
+        text = json.dumps(header).encode("utf-8")
+        fObj.write(b"HMLRAST1")
+        fObj.write(len(text).to_bytes(8, byteorder = "little"))
+        fObj.write(text)
+        fObj.truncate(header["dataOffset"] + nx * ny * numpy.dtype(dtype).itemsize)
+
+    # Return answer ...
+    return header
@@ -0,0 +1,84 @@
+PURE SUBROUTINE findAreaOfRectangleWithinCircle(xmin, xmax, ymin, ymax, r, cx, cy, area)
+    !f2py threadsafe
+
+    ! Import standard modules ...
+    USE ISO_C_BINDING
+
+    IMPLICIT NONE
+
+    ! Declare inputs/outputs ...
+    REAL(kind = C_DOUBLE), INTENT(in)                                           :: xmin
+    REAL(kind = C_DOUBLE), INTENT(in)                                           :: xmax
+    REAL(kind = C_DOUBLE), INTENT(in)                                           :: ymin
+    REAL(kind = C_DOUBLE), INTENT(in)                                           :: ymax
+    REAL(kind = C_DOUBLE), INTENT(in)                                           :: r
+    REAL(kind = C_DOUBLE), INTENT(in)                                           :: cx
+    REAL(kind = C_DOUBLE), INTENT(in)                                           :: cy
+    REAL(kind = C_DOUBLE), INTENT(out)                                          :: area
+
+    ! Declare internal variables ...
+    INTEGER(kind = C_LONG_LONG)                                                 :: i
+    REAL(kind = C_DOUBLE)                                                       :: s1
+    REAL(kind = C_DOUBLE)                                                       :: s2
+    REAL(kind = C_DOUBLE)                                                       :: sgn
+    REAL(kind = C_DOUBLE)                                                       :: x
+    REAL(kind = C_DOUBLE)                                                       :: xc
+    REAL(kind = C_DOUBLE)                                                       :: y
+
+    ! Initialize area ...
+    area = 0.0e0_C_DOUBLE
+
+    ! Return early if the circle has no area ...
+    IF(r <= 0.0e0_C_DOUBLE)THEN
+        RETURN
+    END IF
+
+    ! Loop over the four corners of the rectangle ...
+    ! NOTE: The area of the circle within the quadrant [0, x] x [0, y] (for x
+    !       and y both positive) is x * y if the corner is within the circle,
+    !       otherwise it is the rectangle up to where the circle crosses y plus
+    !       the circular segment beyond it. Extending this to negative x and y
+    !       by symmetry (with the sign flipping for each negative coordinate)
+    !       makes it a cumulative area, so the area of the rectangle is found by
+    !       combining the quadrants at its four corners.
+    DO i = 1_C_LONG_LONG, 4_C_LONG_LONG
+        ! Find the corner relative to the centre of the circle and whether it
+        ! is added or subtracted ...
+        SELECT CASE(i)
+            CASE(1_C_LONG_LONG)
+                x = xmax - cx
+                y = ymax - cy
+                sgn = 1.0e0_C_DOUBLE
+            CASE(2_C_LONG_LONG)
+                x = xmin - cx
+                y = ymax - cy
+                sgn = -1.0e0_C_DOUBLE
+            CASE(3_C_LONG_LONG)
+                x = xmax - cx
+                y = ymin - cy
+                sgn = -1.0e0_C_DOUBLE
+            CASE DEFAULT
+                x = xmin - cx
+                y = ymin - cy
+                sgn = 1.0e0_C_DOUBLE
+        END SELECT
+
+        ! Find the signs of the coordinates and clip them to the circle ...
+        sgn = sgn * SIGN(1.0e0_C_DOUBLE, x) * SIGN(1.0e0_C_DOUBLE, y)
+        IF(x == 0.0e0_C_DOUBLE .OR. y == 0.0e0_C_DOUBLE)THEN
+            CYCLE
+        END IF
+        x = MIN(ABS(x), r)
+        y = MIN(ABS(y), r)
+
+        ! Add (or subtract) the area of the circle within the quadrant ...
+        IF(x * x + y * y <= r * r)THEN
+            area = area + sgn * x * y
+        ELSE
+            xc = SQRT(MAX(r * r - y * y, 0.0e0_C_DOUBLE))
+            s1 = 0.5e0_C_DOUBLE * (xc * y + r * r * ASIN(MIN(xc / r, 1.0e0_C_DOUBLE)))
+            s2 = 0.5e0_C_DOUBLE * (x * SQRT(MAX(r * r - x * x, 0.0e0_C_DOUBLE)) + r * r * ASIN(MIN(x / r, 1.0e0_C_DOUBLE)))
+            area = area + sgn * (xc * y + s2 - s1)
+        END IF
+    END DO
+END SUBROUTINE findAreaOfRectangleWithinCircle
@@ -26,6 +26,25 @@ PURE SUBROUTINE findFractionOfPixelWithinCircle(ndiv, xmin, xmax, ymin, ymax, r,
     REAL(kind = C_DOUBLE), ALLOCATABLE, DIMENSION(:)                            :: yaxis
     REAL(kind = C_DOUBLE), ALLOCATABLE, DIMENSION(:, :)                         :: dist
 
+    ! Check if the exact fraction is wanted ...
+    IF(ndiv == 0_C_LONG_LONG)THEN
+        ! Find the exact area of the pixel that is within the circle ...
+        CALL findAreaOfRectangleWithinCircle(                                   &
+            xmin = xmin,                                                        &
+            xmax = xmax,                                                        &
+            ymin = ymin,                                                        &
+            ymax = ymax,                                                        &
+               r = r,                                                           &
+              cx = cx,                                                          &
+              cy = cy,                                                          &
+            area = frac                                                         &
+        )
+
+        ! Convert the area to a fraction ...
+        frac = frac / ((xmax - xmin) * (ymax - ymin))
+        RETURN
+    END IF
+
     ! Allocate arrays ...
     ! NOTE: I decided not to use "sub_allocate_array()" here so as to keep this
     !       subroutine "PURE".
@@ -0,0 +1,275 @@
+SUBROUTINE rasterizeRings(npoint, nring, npart, nx, ny, ix1, iy1, px, x, y, ringOffsets, partOffsets, grid)
+    !f2py threadsafe
+
+    ! Import standard modules ...
+    USE ISO_C_BINDING
+
+    IMPLICIT NONE
+
+    ! Declare inputs/outputs ...
+    INTEGER(kind = C_LONG_LONG), INTENT(in)                                     :: npoint
+    INTEGER(kind = C_LONG_LONG), INTENT(in)                                     :: nring
+    INTEGER(kind = C_LONG_LONG), INTENT(in)                                     :: npart
+    INTEGER(kind = C_LONG_LONG), INTENT(in)                                     :: nx
+    INTEGER(kind = C_LONG_LONG), INTENT(in)                                     :: ny
+    INTEGER(kind = C_LONG_LONG), INTENT(in)                                     :: ix1
+    INTEGER(kind = C_LONG_LONG), INTENT(in)                                     :: iy1
+    REAL(kind = C_DOUBLE), INTENT(in)                                           :: px
+    REAL(kind = C_DOUBLE), DIMENSION(npoint), INTENT(in)                        :: x
+    REAL(kind = C_DOUBLE), DIMENSION(npoint), INTENT(in)                        :: y
+    INTEGER(kind = C_LONG_LONG), DIMENSION(nring + 1), INTENT(in)               :: ringOffsets
+    INTEGER(kind = C_LONG_LONG), DIMENSION(npart + 1), INTENT(in)               :: partOffsets
+    REAL(kind = C_DOUBLE), DIMENSION(ny, nx), INTENT(out)                       :: grid
+
+    ! Declare internal variables ...
+    INTEGER(kind = C_LONG_LONG)                                                 :: icol
+    INTEGER(kind = C_LONG_LONG)                                                 :: ip
+    INTEGER(kind = C_LONG_LONG)                                                 :: ipart
+    INTEGER(kind = C_LONG_LONG)                                                 :: ipoint
+    INTEGER(kind = C_LONG_LONG)                                                 :: iring
+    INTEGER(kind = C_LONG_LONG)                                                 :: irow
+    INTEGER(kind = C_LONG_LONG)                                                 :: ix
+    INTEGER(kind = C_LONG_LONG)                                                 :: iy
+    INTEGER(kind = C_LONG_LONG)                                                 :: kx
+    INTEGER(kind = C_LONG_LONG)                                                 :: ky
+    INTEGER(kind = C_LONG_LONG)                                                 :: sx
+    INTEGER(kind = C_LONG_LONG)                                                 :: sy
+    INTEGER(kind = C_LONG_LONG)                                                 :: wnx
+    INTEGER(kind = C_LONG_LONG)                                                 :: wny
+    INTEGER(kind = C_LONG_LONG)                                                 :: wx1
+    INTEGER(kind = C_LONG_LONG)                                                 :: wy1
+    REAL(kind = C_DOUBLE)                                                       :: dx
+    REAL(kind = C_DOUBLE)                                                       :: dy
+    REAL(kind = C_DOUBLE)                                                       :: frac
+    REAL(kind = C_DOUBLE)                                                       :: fx
+    REAL(kind = C_DOUBLE)                                                       :: tnext
+    REAL(kind = C_DOUBLE)                                                       :: tx
+    REAL(kind = C_DOUBLE)                                                       :: ty
+    REAL(kind = C_DOUBLE)                                                       :: xa
+    REAL(kind = C_DOUBLE)                                                       :: xb
+    REAL(kind = C_DOUBLE)                                                       :: xp
+    REAL(kind = C_DOUBLE)                                                       :: xq
+    REAL(kind = C_DOUBLE)                                                       :: ya
+    REAL(kind = C_DOUBLE)                                                       :: yb
+    REAL(kind = C_DOUBLE)                                                       :: yp
+    REAL(kind = C_DOUBLE)                                                       :: yq
+    REAL(kind = C_DOUBLE), ALLOCATABLE, DIMENSION(:, :)                         :: acc
+
+    ! Initialize grid ...
+    grid = 0.0e0_C_DOUBLE
+
+    !$omp parallel                                                              &
+    !$omp default(none)                                                         &
+    !$omp private(acc)                                                          &
+    !$omp private(dx)                                                           &
+    !$omp private(dy)                                                           &
+    !$omp private(frac)                                                         &
+    !$omp private(fx)                                                           &
+    !$omp private(icol)                                                         &
+    !$omp private(ip)                                                           &
+    !$omp private(ipart)                                                        &
+    !$omp private(ipoint)                                                       &
+    !$omp private(iring)                                                        &
+    !$omp private(irow)                                                         &
+    !$omp private(ix)                                                           &
+    !$omp private(iy)                                                           &
+    !$omp private(kx)                                                           &
+    !$omp private(ky)                                                           &
+    !$omp private(sx)                                                           &
+    !$omp private(sy)                                                           &
+    !$omp private(tnext)                                                        &
+    !$omp private(tx)                                                           &
+    !$omp private(ty)                                                           &
+    !$omp private(wnx)                                                          &
+    !$omp private(wny)                                                          &
+    !$omp private(wx1)                                                          &
+    !$omp private(wy1)                                                          &
+    !$omp private(xa)                                                           &
+    !$omp private(xb)                                                           &
+    !$omp private(xp)                                                           &
+    !$omp private(xq)                                                           &
+    !$omp private(ya)                                                           &
+    !$omp private(yb)                                                           &
+    !$omp private(yp)                                                           &
+    !$omp private(yq)                                                           &
+    !$omp shared(grid)                                                          &
+    !$omp shared(ix1)                                                           &
+    !$omp shared(iy1)                                                           &
+    !$omp shared(npart)                                                         &
+    !$omp shared(nx)                                                            &
+    !$omp shared(ny)                                                            &
+    !$omp shared(partOffsets)                                                   &
+    !$omp shared(px)                                                            &
+    !$omp shared(ringOffsets)                                                   &
+    !$omp shared(x)                                                             &
+    !$omp shared(y)
+        !$omp do                                                                &
+        !$omp schedule(dynamic)
+            ! Loop over parts ...
+            DO ipart = 1_C_LONG_LONG, npart
+                ! Skip parts without any rings ...
+                IF(partOffsets(ipart + 1_C_LONG_LONG) <= partOffsets(ipart))THEN
+                    CYCLE
+                END IF
+
+                ! Find the bounding box of the part (in pixels relative to the
+                ! corner of the grid) ...
+                xa = HUGE(xa)
+                xb = -HUGE(xb)
+                ya = HUGE(ya)
+                yb = -HUGE(yb)
+                DO ipoint = ringOffsets(partOffsets(ipart) + 1_C_LONG_LONG) + 1_C_LONG_LONG, ringOffsets(partOffsets(ipart + 1_C_LONG_LONG) + 1_C_LONG_LONG)
+                    xa = MIN(xa, x(ipoint))
+                    xb = MAX(xb, x(ipoint))
+                    ya = MIN(ya, y(ipoint))
+                    yb = MAX(yb, y(ipoint))
+                END DO
+                xa = (xa - REAL(ix1, kind = C_DOUBLE) * px) / px
+                xb = (xb - REAL(ix1, kind = C_DOUBLE) * px) / px
+                ya = (ya - REAL(iy1, kind = C_DOUBLE) * px) / px
+                yb = (yb - REAL(iy1, kind = C_DOUBLE) * px) / px
+
+                ! Find the window of the grid that the part covers and skip the
+                ! part if it does not cover any of the grid ...
+                ! NOTE: Parts which are to the left of the window still cover
+                !       the whole row, which is why the window always starts
+                !       at, or to the right of, the left-hand side of the part.
+                wx1 = MAX(0_C_LONG_LONG, INT(FLOOR(xa), kind = C_LONG_LONG))
+                wy1 = MAX(0_C_LONG_LONG, INT(FLOOR(ya), kind = C_LONG_LONG))
+                wnx = MIN(nx, INT(CEILING(xb), kind = C_LONG_LONG)) - wx1
+                wny = MIN(ny, INT(CEILING(yb), kind = C_LONG_LONG)) - wy1
+                IF(wnx <= 0_C_LONG_LONG .OR. wny <= 0_C_LONG_LONG)THEN
+                    CYCLE
+                END IF
+
+                ! Allocate accumulation window ...
+                ! NOTE: The accumulation window has two extra columns: the first
+                !       one catches the contributions from the edges that are
+                !       to the left of the grid (which still cover the whole
+                !       row) and the last one catches the contributions from the
+                !       edges that are to the right of the grid (which are
+                !       thrown away).
+                ALLOCATE(acc(0_C_LONG_LONG:wnx + 1_C_LONG_LONG, wny))
+                acc = 0.0e0_C_DOUBLE
+
+                ! Loop over rings ...
+                DO iring = partOffsets(ipart) + 1_C_LONG_LONG, partOffsets(ipart + 1_C_LONG_LONG)
+                    ! Loop over edges ...
+                    DO ipoint = ringOffsets(iring) + 1_C_LONG_LONG, ringOffsets(iring + 1_C_LONG_LONG) - 1_C_LONG_LONG
+                        ! Find the ends of the edge (in pixels relative to the
+                        ! corner of the grid) ...
+                        xa = (x(ipoint) - REAL(ix1, kind = C_DOUBLE) * px) / px
+                        ya = (y(ipoint) - REAL(iy1, kind = C_DOUBLE) * px) / px
+                        xb = (x(ipoint + 1_C_LONG_LONG) - REAL(ix1, kind = C_DOUBLE) * px) / px
+                        yb = (y(ipoint + 1_C_LONG_LONG) - REAL(iy1, kind = C_DOUBLE) * px) / px
+                        dx = xb - xa
+                        dy = yb - ya
+
+                        ! Skip horizontal edges (as they do not contribute
+                        ! anything) ...
+                        IF(dy == 0.0e0_C_DOUBLE)THEN
+                            CYCLE
+                        END IF
+
+                        ! Find the first grid lines that the edge crosses and
+                        ! the fractions along the edge where it crosses them ...
+                        IF(dx > 0.0e0_C_DOUBLE)THEN
+                            sx = 1_C_LONG_LONG
+                            kx = INT(FLOOR(xa), kind = C_LONG_LONG) + 1_C_LONG_LONG
+                            tx = (REAL(kx, kind = C_DOUBLE) - xa) / dx
+                        ELSE IF(dx < 0.0e0_C_DOUBLE)THEN
+                            sx = -1_C_LONG_LONG
+                            kx = INT(CEILING(xa), kind = C_LONG_LONG) - 1_C_LONG_LONG
+                            tx = (REAL(kx, kind = C_DOUBLE) - xa) / dx
+                        ELSE
+                            sx = 0_C_LONG_LONG
+                            kx = 0_C_LONG_LONG
+                            tx = 2.0e0_C_DOUBLE
+                        END IF
+                        IF(dy > 0.0e0_C_DOUBLE)THEN
+                            sy = 1_C_LONG_LONG
+                            ky = INT(FLOOR(ya), kind = C_LONG_LONG) + 1_C_LONG_LONG
+                        ELSE
+                            sy = -1_C_LONG_LONG
+                            ky = INT(CEILING(ya), kind = C_LONG_LONG) - 1_C_LONG_LONG
+                        END IF
+                        ty = (REAL(ky, kind = C_DOUBLE) - ya) / dy
+
+                        ! Walk along the edge one piece at a time, where each
+                        ! piece lies within a single pixel ...
+                        xp = xa
+                        yp = ya
+                        DO
+                            ! Find the end of the piece ...
+                            tnext = MIN(tx, ty, 1.0e0_C_DOUBLE)
+                            IF(tnext >= 1.0e0_C_DOUBLE)THEN
+                                xq = xb
+                                yq = yb
+                            ELSE
+                                xq = xa + tnext * dx
+                                yq = ya + tnext * dy
+                            END IF
+
+                            ! Find which pixel the piece is in (using its
+                            ! mid-point) and add the area between it and the
+                            ! right-hand side of its pixel to its pixel and the
+                            ! rest of its height to the next pixel along ...
+                            IF(yq /= yp)THEN
+                                fx = 0.5e0_C_DOUBLE * (xp + xq)
+                                ix = INT(FLOOR(fx), kind = C_LONG_LONG)
+                                iy = INT(FLOOR(0.5e0_C_DOUBLE * (yp + yq)), kind = C_LONG_LONG)
+                                fx = fx - REAL(ix, kind = C_DOUBLE)
+                                irow = iy - wy1 + 1_C_LONG_LONG
+                                IF(irow >= 1_C_LONG_LONG .AND. irow <= wny)THEN
+                                    icol = MIN(MAX(ix - wx1 + 1_C_LONG_LONG, 0_C_LONG_LONG), wnx + 1_C_LONG_LONG)
+                                    acc(icol, irow) = acc(icol, irow) + (yq - yp) * (1.0e0_C_DOUBLE - fx)
+                                    icol = MIN(MAX(ix - wx1 + 2_C_LONG_LONG, 0_C_LONG_LONG), wnx + 1_C_LONG_LONG)
+                                    acc(icol, irow) = acc(icol, irow) + (yq - yp) * fx
+                                END IF
+                            END IF
+
+                            ! Stop if this is the last piece ...
+                            IF(tnext >= 1.0e0_C_DOUBLE)THEN
+                                EXIT
+                            END IF
+
+                            ! Move on to the next grid lines ...
+                            IF(tx == tnext)THEN
+                                kx = kx + sx
+                                tx = (REAL(kx, kind = C_DOUBLE) - xa) / dx
+                            END IF
+                            IF(ty == tnext)THEN
+                                ky = ky + sy
+                                ty = (REAL(ky, kind = C_DOUBLE) - ya) / dy
+                            END IF
+                            xp = xq
+                            yp = yq
+                        END DO
+                    END DO
+                END DO
+
+                ! Loop over rows ...
+                DO irow = 1_C_LONG_LONG, wny
+                    ! Sum the contributions along the row (counter-clockwise
+                    ! rings have upwards edges on their right-hand side, so the
+                    ! signs need flipping), remove any rounding errors and add
+                    ! the covered area to the grid ...
+                    frac = -acc(0_C_LONG_LONG, irow)
+                    DO icol = 1_C_LONG_LONG, wnx
+                        frac = frac - acc(icol, irow)
+                        IF(frac < 1.0e-12_C_DOUBLE)THEN
+                            CYCLE
+                        END IF
+                        ip = wx1 + icol
+                        !$omp atomic update
+                        grid(wy1 + irow, ip) = grid(wy1 + irow, ip) + MIN(frac, 1.0e0_C_DOUBLE) * px * px
+                        !$omp end atomic
+                    END DO
+                END DO
+
+                ! Clean up ...
+                DEALLOCATE(acc)
+            END DO
+        !$omp end do
+    !$omp end parallel
+END SUBROUTINE rasterizeRings
@@ -26,6 +26,8 @@ SUBROUTINE sumImageWithinCircle(ndiv, nx, ny, xmin, xmax, ymin, ymax, r, cx, cy,
     REAL(kind = C_DOUBLE)                                                       :: dx
     REAL(kind = C_DOUBLE)                                                       :: dy
     REAL(kind = C_DOUBLE)                                                       :: frac
+    REAL(kind = C_DOUBLE)                                                       :: xNear
+    REAL(kind = C_DOUBLE)                                                       :: yNear
     REAL(kind = C_DOUBLE), ALLOCATABLE, DIMENSION(:)                            :: xaxis
     REAL(kind = C_DOUBLE), ALLOCATABLE, DIMENSION(:)                            :: yaxis
     REAL(kind = C_DOUBLE), ALLOCATABLE, DIMENSION(:, :)                         :: dist
@@ -49,6 +51,8 @@ SUBROUTINE sumImageWithinCircle(ndiv, nx, ny, xmin, xmax, ymin, ymax, r, cx, cy,
     !$omp private(frac)                                                         &
     !$omp private(ix)                                                           &
     !$omp private(iy)                                                           &
+    !$omp private(xNear)                                                        &
+    !$omp private(yNear)                                                        &
     !$omp shared(cx)                                                            &
     !$omp shared(cy)                                                            &
     !$omp shared(dist)                                                          &
@@ -101,8 +105,22 @@ SUBROUTINE sumImageWithinCircle(ndiv, nx, ny, xmin, xmax, ymin, ymax, r, cx, cy,
                         CYCLE
                     END IF
 
+                    ! Find out the distance of the nearest point of this pixel
+                    ! to the centre of the circle (which is not necessarily a
+                    ! corner) ...
+                    IF(xaxis(ix) <= 0.0e0_C_DOUBLE .AND. xaxis(ix + 1_C_LONG_LONG) >= 0.0e0_C_DOUBLE)THEN
+                        xNear = 0.0e0_C_DOUBLE
+                    ELSE
+                        xNear = MIN(ABS(xaxis(ix)), ABS(xaxis(ix + 1_C_LONG_LONG)))
+                    END IF
+                    IF(yaxis(iy) <= 0.0e0_C_DOUBLE .AND. yaxis(iy + 1_C_LONG_LONG) >= 0.0e0_C_DOUBLE)THEN
+                        yNear = 0.0e0_C_DOUBLE
+                    ELSE
+                        yNear = MIN(ABS(yaxis(iy)), ABS(yaxis(iy + 1_C_LONG_LONG)))
+                    END IF
+
                     ! Add none of this pixel if it is all outside the circle ...
-                    IF(ALL(dist(iy:iy + 1_C_LONG_LONG, ix:ix + 1_C_LONG_LONG) >= r))THEN
+                    IF(HYPOT(xNear, yNear) >= r)THEN
                         CYCLE
                     END IF
 
@@ -0,0 +1,198 @@
+SUBROUTINE sumImageWithinCircleSAT(ndiv, nx, ny, xmin, xmax, ymin, ymax, r, cx, cy, img, sat, tot)
+    !f2py threadsafe
+
+    ! Import standard modules ...
+    USE ISO_C_BINDING
+
+    IMPLICIT NONE
+
+    ! Declare inputs/outputs ...
+    INTEGER(kind = C_LONG_LONG), INTENT(in)                                     :: ndiv
+    INTEGER(kind = C_LONG_LONG), INTENT(in)                                     :: nx
+    INTEGER(kind = C_LONG_LONG), INTENT(in)                                     :: ny
+    REAL(kind = C_DOUBLE), INTENT(in)                                           :: xmin
+    REAL(kind = C_DOUBLE), INTENT(in)                                           :: xmax
+    REAL(kind = C_DOUBLE), INTENT(in)                                           :: ymin
+    REAL(kind = C_DOUBLE), INTENT(in)                                           :: ymax
+    REAL(kind = C_DOUBLE), INTENT(in)                                           :: r
+    REAL(kind = C_DOUBLE), INTENT(in)                                           :: cx
+    REAL(kind = C_DOUBLE), INTENT(in)                                           :: cy
+    REAL(kind = C_DOUBLE), DIMENSION(ny, nx), INTENT(in)                        :: img
+    REAL(kind = C_DOUBLE), DIMENSION(ny + 1, nx + 1), INTENT(in)                :: sat
+    REAL(kind = C_DOUBLE), INTENT(out)                                          :: tot
+
+    ! Declare internal variables ...
+    INTEGER(kind = C_LONG_LONG)                                                 :: ix
+    INTEGER(kind = C_LONG_LONG)                                                 :: ix1
+    INTEGER(kind = C_LONG_LONG)                                                 :: ix2
+    INTEGER(kind = C_LONG_LONG)                                                 :: iy
+    INTEGER(kind = C_LONG_LONG)                                                 :: iy1
+    INTEGER(kind = C_LONG_LONG)                                                 :: iy2
+    INTEGER(kind = C_LONG_LONG)                                                 :: ox1
+    INTEGER(kind = C_LONG_LONG)                                                 :: ox2
+    REAL(kind = C_DOUBLE)                                                       :: dFar
+    REAL(kind = C_DOUBLE)                                                       :: dNear
+    REAL(kind = C_DOUBLE)                                                       :: dx
+    REAL(kind = C_DOUBLE)                                                       :: dy
+    REAL(kind = C_DOUBLE)                                                       :: frac
+    REAL(kind = C_DOUBLE)                                                       :: hw
+    REAL(kind = C_DOUBLE)                                                       :: x1
+    REAL(kind = C_DOUBLE)                                                       :: x2
+    REAL(kind = C_DOUBLE)                                                       :: xNear
+    REAL(kind = C_DOUBLE)                                                       :: y1
+    REAL(kind = C_DOUBLE)                                                       :: y2
+    REAL(kind = C_DOUBLE), DIMENSION(4)                                         :: dist
+
+    ! Calculate size of pixels ...
+    dx = (xmax - xmin) / REAL(nx, kind = C_DOUBLE)
+    dy = (ymax - ymin) / REAL(ny, kind = C_DOUBLE)
+
+    ! Find the rows which overlap the circle ...
+    ! NOTE: These are zero-indexed, like the edges of the pixels, so row "iy"
+    !       is "img(iy + 1, :)".
+    iy1 = MAX(0_C_LONG_LONG, FLOOR((cy - r - ymin) / dy, kind = C_LONG_LONG))
+    iy2 = MIN(ny, CEILING((cy + r - ymin) / dy, kind = C_LONG_LONG))
+
+    ! Initialize total ...
+    tot = 0.0e0_C_DOUBLE
+
+    !$omp parallel do                                                           &
+    !$omp default(none)                                                         &
+    !$omp private(dFar)                                                         &
+    !$omp private(dist)                                                         &
+    !$omp private(dNear)                                                        &
+    !$omp private(frac)                                                         &
+    !$omp private(hw)                                                           &
+    !$omp private(ix)                                                           &
+    !$omp private(ix1)                                                          &
+    !$omp private(ix2)                                                          &
+    !$omp private(ox1)                                                          &
+    !$omp private(ox2)                                                          &
+    !$omp private(x1)                                                           &
+    !$omp private(x2)                                                           &
+    !$omp private(xNear)                                                        &
+    !$omp private(y1)                                                           &
+    !$omp private(y2)                                                           &
+    !$omp shared(cx)                                                            &
+    !$omp shared(cy)                                                            &
+    !$omp shared(dx)                                                            &
+    !$omp shared(dy)                                                            &
+    !$omp shared(img)                                                           &
+    !$omp shared(iy1)                                                           &
+    !$omp shared(iy2)                                                           &
+    !$omp shared(ndiv)                                                          &
+    !$omp shared(nx)                                                            &
+    !$omp shared(r)                                                             &
+    !$omp shared(sat)                                                           &
+    !$omp shared(xmin)                                                          &
+    !$omp shared(ymin)                                                          &
+    !$omp reduction(+:tot)                                                      &
+    !$omp schedule(dynamic)
+        ! Loop over the rows which overlap the circle ...
+        DO iy = iy1, iy2 - 1_C_LONG_LONG
+            ! Find the edges of this row relative to the centre of the circle ...
+            y1 = ymin + REAL(iy, kind = C_DOUBLE) * dy - cy
+            y2 = ymin + REAL(iy + 1_C_LONG_LONG, kind = C_DOUBLE) * dy - cy
+
+            ! Find the distances from the centre of the circle to the nearest
+            ! and furthest edges of this row ...
+            IF(y1 <= 0.0e0_C_DOUBLE .AND. y2 >= 0.0e0_C_DOUBLE)THEN
+                dNear = 0.0e0_C_DOUBLE
+            ELSE
+                dNear = MIN(ABS(y1), ABS(y2))
+            END IF
+            dFar = MAX(ABS(y1), ABS(y2))
+
+            ! Skip this row if it is all outside of the circle ...
+            IF(dNear >= r)THEN
+                CYCLE
+            END IF
+
+            ! Find the span of pixels which overlap the circle ...
+            hw = SQRT(r * r - dNear * dNear)
+            ox1 = MAX(0_C_LONG_LONG, FLOOR((cx - hw - xmin) / dx, kind = C_LONG_LONG))
+            ox2 = MIN(nx, CEILING((cx + hw - xmin) / dx, kind = C_LONG_LONG))
+
+            ! Skip this row if none of its pixels overlap the circle (which
+            ! happens when the centre of the circle is beyond the left or right
+            ! edge of the image) ...
+            IF(ox1 >= ox2)THEN
+                CYCLE
+            END IF
+
+            ! Find the span of pixels which are entirely within the circle (if
+            ! there are any) ...
+            ix1 = ox1
+            ix2 = ox1
+            IF(dFar < r)THEN
+                hw = SQRT(r * r - dFar * dFar)
+                ix1 = MIN(ox2, MAX(ox1, CEILING((cx - hw - xmin) / dx, kind = C_LONG_LONG)))
+                ix2 = MIN(ox2, MAX(ix1, FLOOR((cx + hw - xmin) / dx, kind = C_LONG_LONG)))
+            END IF
+
+            ! Add all of the span of pixels which are entirely within the
+            ! circle ...
+            tot = tot + sat(iy + 2_C_LONG_LONG, ix2 + 1_C_LONG_LONG) - sat(iy + 1_C_LONG_LONG, ix2 + 1_C_LONG_LONG) &
+                      - sat(iy + 2_C_LONG_LONG, ix1 + 1_C_LONG_LONG) + sat(iy + 1_C_LONG_LONG, ix1 + 1_C_LONG_LONG)
+
+            ! Loop over the pixels either side of the span ...
+            DO ix = ox1, ox2 - 1_C_LONG_LONG
+                ! Skip this pixel if it is in the span ...
+                IF(ix >= ix1 .AND. ix < ix2)THEN
+                    CYCLE
+                END IF
+
+                ! Skip this pixel if it is empty ...
+                IF(img(iy + 1_C_LONG_LONG, ix + 1_C_LONG_LONG) == 0.0e0_C_DOUBLE)THEN
+                    CYCLE
+                END IF
+
+                ! Find the edges of this pixel relative to the centre of the
+                ! circle ...
+                x1 = xmin + REAL(ix, kind = C_DOUBLE) * dx - cx
+                x2 = xmin + REAL(ix + 1_C_LONG_LONG, kind = C_DOUBLE) * dx - cx
+
+                ! Find out the distance of each corner to the centre of the
+                ! circle ...
+                dist(1) = HYPOT(x1, y1)
+                dist(2) = HYPOT(x2, y1)
+                dist(3) = HYPOT(x1, y2)
+                dist(4) = HYPOT(x2, y2)
+
+                ! Find out the distance of the nearest point of this pixel to
+                ! the centre of the circle (which is not necessarily a
+                ! corner) ...
+                IF(x1 <= 0.0e0_C_DOUBLE .AND. x2 >= 0.0e0_C_DOUBLE)THEN
+                    xNear = 0.0e0_C_DOUBLE
+                ELSE
+                    xNear = MIN(ABS(x1), ABS(x2))
+                END IF
+
+                ! Add none of this pixel if it is all outside the circle ...
+                IF(HYPOT(xNear, dNear) >= r)THEN
+                    CYCLE
+                END IF
+
+                ! Add all of this pixel if it is all within the circle ...
+                IF(ALL(dist <= r))THEN
+                    tot = tot + img(iy + 1_C_LONG_LONG, ix + 1_C_LONG_LONG)
+                    CYCLE
+                END IF
+
+                ! Add part of this pixel ...
+                CALL findFractionOfPixelWithinCircle(                           &
+                    ndiv = ndiv,                                                &
+                    xmin = x1,                                                  &
+                    xmax = x2,                                                  &
+                    ymin = y1,                                                  &
+                    ymax = y2,                                                  &
+                       r = r,                                                   &
+                      cx = 0.0e0_C_DOUBLE,                                      &
+                      cy = 0.0e0_C_DOUBLE,                                      &
+                    frac = frac                                                 &
+                )
+                tot = tot + img(iy + 1_C_LONG_LONG, ix + 1_C_LONG_LONG) * frac
+            END DO
+        END DO
+    !$omp end parallel do
+END SUBROUTINE sumImageWithinCircleSAT
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def findAreaOfRectangleWithinCircle(xmin, xmax, ymin, ymax, r, /, *, cx = 0.0, cy = 0.0):
+    """
+    Find the exact area of an axis-aligned rectangle that is within a hard
+    circular mask.
+
+    Arguments:
+    xmin -- left edge
+    xmax -- right edge
+    ymin -- lower edge
+    ymax -- upper edge
+    r -- radius of circle
+
+    Keyword arguments:
+    cx -- x position of centre of circle (default 0.0)
+    cy -- y position of centre of circle (default 0.0)
+
+    Note:
+    The area of the circle within the quadrant [0, x] x [0, y] (for x and y
+    both positive) is x * y if the corner is within the circle, otherwise it is
+    the rectangle up to where the circle crosses y plus the circular segment
+    beyond it, using:
+
+        S(t) = ∫_0^t sqrt(r² - s²) ds = (t * sqrt(r² - t²) + r² * asin(t / r)) / 2
+
+    Extending this to negative x and y by symmetry (with the sign flipping
+    for each negative coordinate) makes it a cumulative area, so the area of
+    the rectangle is found by combining the quadrants at its four corners.
+
+    All of the arguments can be numpy arrays (which are broadcast against each
+    other), in which case an array of areas is returned.
+    """
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+    # Make sure that the radius is an array (so that a radius of zero does not
+    # divide by zero below) ...
+    r = numpy.maximum(numpy.asarray(r, dtype = numpy.float64), numpy.finfo(numpy.float64).tiny)
+
+    # Initialize area ...
+    area = 0.0
+
+    # Loop over the four corners of the rectangle ...
+    for x, y, sign in [(xmax - cx, ymax - cy, 1.0), (xmin - cx, ymax - cy, -1.0), (xmax - cx, ymin - cy, -1.0), (xmin - cx, ymin - cy, 1.0)]:
+        # Find the signs of the coordinates and clip them to the circle ...
+        sign = sign * numpy.sign(x) * numpy.sign(y)
+        x = numpy.minimum(numpy.abs(x), r)
+        y = numpy.minimum(numpy.abs(y), r)
+
+        # Find where the circle crosses y and the integral of the circle from
+        # the y-axis to there and to x ...
+        xc = numpy.sqrt(numpy.maximum(r * r - y * y, 0.0))
+        s1 = 0.5 * (xc * y + r * r * numpy.arcsin(numpy.minimum(xc / r, 1.0)))
+        s2 = 0.5 * (x * numpy.sqrt(numpy.maximum(r * r - x * x, 0.0)) + r * r * numpy.arcsin(numpy.minimum(x / r, 1.0)))
+
+        # Add (or subtract) the area of the circle within the quadrant ...
+        area = area + sign * numpy.where(x * x + y * y <= r * r, x * y, xc * y + s2 - s1)
+
+    # Return answer ...
+    if numpy.ndim(area) == 0:
+        return float(area)
+    return area
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+# Define dictionary ...
+# NOTE: This is the in-memory cache of "findCircleKernel()". Dictionaries
+#       remember the order that keys were inserted in, so moving a key to the
+#       end whenever it is used makes the first key the least recently used
+#       one.
+circleKernels: dict[tuple, object] = {}
+
+# Define function ...
+def findCircleKernel(r, /, *, cacheDir = None, maxBytes = 268435456, ndiv = 0, nq = 64, ox = 0.5, oy = 0.5, px = 1024.0):
+    """
+    Find the fractions of the pixels around a pixel that are within a hard
+    circular mask centred within that pixel.
+
+    Arguments:
+    r -- radius of circle
+
+    Keyword arguments:
+    cacheDir -- the directory to store kernels in (default None, which means
+                only cache them in RAM)
+    maxBytes -- the maximum total size (in bytes) of the kernels to cache in
+                RAM (default 268435456)
+    ndiv -- number sub-divisions (default 0, which means find the exact
+            fractions)
+    nq -- the number of steps across a pixel to round the offsets of the centre
+          of the circle to (default 64, or 0, which means do not round them)
+    ox -- x offset of centre of circle within the pixel, as a fraction of a
+          pixel (default 0.5)
+    oy -- y offset of centre of circle within the pixel, as a fraction of a
+          pixel (default 0.5)
+    px -- the size of the pixels (default 1024.0)
+
+    Note:
+    The kernel has axes (2 * n + 1, 2 * n + 1), where n is the radius of the
+    circle rounded up to a whole number of pixels, and element [n, n] is the
+    pixel which contains the centre of the circle. The sum of an image within
+    the circle is then the sum of the kernel multiplied by the same sized
+    window of the image (see hml.sumImageWithinCircle(..., method = "kernel")).
+
+    The kernel only depends on the radius of the circle, the size of the pixels
+    and the offset of the centre of the circle within its pixel, so kernels are
+    cached (in RAM and, optionally, in "cacheDir") and reused. The offsets are
+    rounded to the nearest multiple of 1 / "nq", so that circles around
+    different centres can share kernels, which moves the centre of the circle
+    by at most half of a step. The kernels are returned as read-only arrays
+    because they are shared. The cache in RAM is limited by the total size of
+    the kernels, rather than by how many there are, because the size of a
+    kernel grows with the square of the radius of the circle (for example, a
+    kernel for a 100 km radius with 128 m pixels is about 20 MB).
+    """
+
+    # Import standard modules ...
+    import math
+    import os
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+    # Import sub-functions ...
+    from .findFractionOfPixelsWithinCircle import findFractionOfPixelsWithinCircle
+
+    # Round the offsets ...
+    if nq > 0:
+        ox = round(ox * nq)                                                     # [#]
+        oy = round(oy * nq)                                                     # [#]
+        fx = ox / nq
+        fy = oy / nq
+    else:
+        ox = float(ox)
+        oy = float(oy)
+        fx = ox
+        fy = oy
+
+    # Create key ...
+    key = (float(r), float(px), ndiv, nq, ox, oy)
+
+    # Check if the kernel is cached in RAM ...
+    if key in circleKernels:
+        # Move the kernel to the end of the cache and return it ...
+        circleKernels[key] = circleKernels.pop(key)
+        return circleKernels[key]
+
+    # Create file name (if the kernel should be cached on disk) ...
+    fname = None
+    if cacheDir is not None:
+        fname = f"{cacheDir}/r={key[0]!r}_px={key[1]!r}_ndiv={ndiv:d}_nq={nq:d}_ox={ox!r}_oy={oy!r}.npy"
+
+    # Check if the kernel is cached on disk ...
+    if fname is not None and os.path.exists(fname):
+        # Load kernel ...
+        kernel = numpy.load(fname)
+    else:
+        # Create nodes of the kernel relative to the pixel which contains the
+        # centre of the circle ...
+        n = max(0, math.ceil(r / px))                                           # [#]
+        axis = numpy.arange(-n, n + 2, dtype = numpy.float64) * px
+
+        # Make the kernel ...
+        kernel = findFractionOfPixelsWithinCircle(
+            axis[:-1].reshape(1, -1),
+            axis[1:].reshape(1, -1),
+            axis[:-1].reshape(-1, 1),
+            axis[1:].reshape(-1, 1),
+            r,
+              cx = fx * px,
+              cy = fy * px,
+            ndiv = ndiv,
+        )
+
+        # Check if the kernel should be cached on disk ...
+        if fname is not None:
+            # Save kernel (using a temporary file, so that other processes
+            # never load a partial file) ...
+            os.makedirs(cacheDir, exist_ok = True)
+            numpy.save(f"{fname}.tmp{os.getpid():d}.npy", kernel)
+            os.replace(f"{fname}.tmp{os.getpid():d}.npy", fname)
+
+    # Cache the kernel in RAM (removing the least recently used kernels if
+    # they are too big in total) ...
+    kernel.setflags(write = False)
+    circleKernels[key] = kernel
+    nbytes = sum(cached.nbytes for cached in circleKernels.values())            # [B]
+    while len(circleKernels) > 0 and nbytes > maxBytes:
+        nbytes -= circleKernels.pop(next(iter(circleKernels))).nbytes           # [B]
+
+    # Return answer ...
+    return kernel
@@ -1,42 +1,83 @@
 #!/usr/bin/env python3
 
 # Define function ...
-def findExtent(sfObj, /, *, x1 = 1.0e10, x2 = 0.0, y1 = 1.0e10, y2 = 0.0):
+def findExtent(sfObj, /, *, validate = False, x1 = 1.0e10, x2 = 0.0, y1 = 1.0e10, y2 = 0.0):
     """
     Update the supplied bounding box so that it encompasses the overall bounding
     box of the Polygons in the supplied ShapeFile.
 
     Arguments:
-    sfObj -- a shapefile.Reader of a ShapeFile
+    sfObj -- a shapefile.Reader of a ShapeFile, or the name of the directory of
+             a geometry store (see hml.ingestShapefile())
 
     Keyword arguments:
+    validate -- check the shape type and bounding box of every record rather
+                than trusting the header of the ShapeFile (default False)
     x1 -- lower x position of bounding box (default 1.0e100)
     y1 -- left y position of bounding box (default 1.0e100)
     x2 -- upper x position of bounding box (default 0.0)
     y2 -- right y position of bounding box (default 0.0)
+
+    Note:
+    By default, the shape type and the bounding box are read from the header of
+    the ".shp" file, so no records are read at all. If "validate" is True then
+    the shape type and the bounding box of every record are read straight from
+    the bytes of the ".shp" file (see hml.findRecordBboxes()), which is still
+    much faster than parsing every geometry. The bounding box of every record
+    is always used for a geometry store (as it is already an array).
     """
 
     # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
     try:
         import shapefile
     except:
         raise Exception("\"shapefile\" is not installed; run \"pip install --user pyshp\"") from None
 
+    # Import sub-functions ...
+    from .findRecordBboxes import findRecordBboxes
+
     # Check argument ...
-    if not isinstance(sfObj, shapefile.Reader):
-        raise TypeError("\"sfObj\" is not a shapefile.Reader")
+    if not isinstance(sfObj, (shapefile.Reader, str)):
+        raise TypeError("\"sfObj\" is not a shapefile.Reader or a str")
+
+    # Check if every record should be checked ...
+    if isinstance(sfObj, str) or validate:
+        # Check if the records are in a geometry store ...
+        if isinstance(sfObj, str):
+            # Load the bounding box of every record ...
+            # NOTE: Only shapefile polygons can be put in a geometry store.
+            bboxes = numpy.load(f"{sfObj}/bboxes.npy")                          # [m]
+        else:
+            # Find the shape type and the bounding box of every record ...
+            shapeTypes, bboxes = findRecordBboxes(sfObj)                        # [#], [m]
+
+            # Crash if any of the records are not shapefile polygons ...
+            if (shapeTypes != shapefile.POLYGON).any():
+                raise Exception("\"shape\" is not a POLYGON") from None
 
-    # Loop over shape+record pairs ...
-    for shapeRecord in sfObj.iterShapeRecords():
-        # Crash if this shape+record is not a shapefile polygon ...
-        if shapeRecord.shape.shapeType != shapefile.POLYGON:
+        # Check if there are any records ...
+        if bboxes.shape[0] > 0:
+            # Update extents ...
+            x1 = min(x1, float(bboxes[:, 0].min()))                             # [m]
+            y1 = min(y1, float(bboxes[:, 1].min()))                             # [m]
+            x2 = max(x2, float(bboxes[:, 2].max()))                             # [m]
+            y2 = max(y2, float(bboxes[:, 3].max()))                             # [m]
+    else:
+        # Crash if this ShapeFile is not a shapefile polygon ...
+        if sfObj.shapeType != shapefile.POLYGON:
             raise Exception("\"shape\" is not a POLYGON") from None
 
-        # Update extents ...
-        x1 = min(x1, shapeRecord.shape.bbox[0])                                 # [m]
-        y1 = min(y1, shapeRecord.shape.bbox[1])                                 # [m]
-        x2 = max(x2, shapeRecord.shape.bbox[2])                                 # [m]
-        y2 = max(y2, shapeRecord.shape.bbox[3])                                 # [m]
+        # Check if there are any records ...
+        if len(sfObj) > 0:
+            # Update extents ...
+            x1 = min(x1, sfObj.bbox[0])                                         # [m]
+            y1 = min(y1, sfObj.bbox[1])                                         # [m]
+            x2 = max(x2, sfObj.bbox[2])                                         # [m]
+            y2 = max(y2, sfObj.bbox[3])                                         # [m]
 
     # Return answer ...
     return x1, y1, x2, y2
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 # Define function ...
-def findFractionOfPixelWithinCircle(xmin, xmax, ymin, ymax, r, /, *, cx = 0.0, cy = 0.0, ndiv = 16):
+def findFractionOfPixelWithinCircle(xmin, xmax, ymin, ymax, r, /, *, cx = 0.0, cy = 0.0, ndiv = 0):
     """
     Find the fraction of a pixel that is within a hard circular mask.
 
@@ -15,10 +15,20 @@ def findFractionOfPixelWithinCircle(xmin, xmax, ymin, ymax, r, /, *, cx = 0.0, c
     Keyword arguments:
     cx -- x position of centre of circle (default 0.0)
     cy -- y position of centre of circle (default 0.0)
-    ndiv -- number sub-divisions (default 16)
+    ndiv -- number sub-divisions (default 0, which means find the exact
+            fraction)
 
     Note:
     This function is crying out for FORTRAN+OpenMP.
+
+    If "ndiv" is zero then the exact area of the pixel that is within the
+    circle is found (see hml.findAreaOfRectangleWithinCircle()). Otherwise the
+    pixel is sub-divided into ndiv x ndiv sub-pixels and the fraction of them
+    whose centroids are within the circle is returned (which is how this
+    function used to work).
+
+    See hml.findFractionOfPixelsWithinCircle() for finding the fractions of
+    many pixels at once.
     """
 
     # Import special modules ...
@@ -27,6 +37,22 @@ def findFractionOfPixelWithinCircle(xmin, xmax, ymin, ymax, r, /, *, cx = 0.0, c
     except:
         raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
 
+    # Import sub-functions ...
+    from .findAreaOfRectangleWithinCircle import findAreaOfRectangleWithinCircle
+
+    # Check if the exact fraction is wanted ...
+    if ndiv == 0:
+        # Return answer ...
+        return findAreaOfRectangleWithinCircle(
+            xmin,
+            xmax,
+            ymin,
+            ymax,
+            r,
+            cx = cx,
+            cy = cy,
+        ) / ((xmax - xmin) * (ymax - ymin))
+
     # Create nodes relative to the centre of the circle ...
     xaxis = numpy.linspace(xmin, xmax, num = ndiv + 1) - cx
     yaxis = numpy.linspace(ymin, ymax, num = ndiv + 1) - cy
@@ -37,10 +63,7 @@ def findFractionOfPixelWithinCircle(xmin, xmax, ymin, ymax, r, /, *, cx = 0.0, c
     yaxis = 0.5 * (yaxis[1:] + yaxis[:-1])
 
     # Find out the distance of each centroid to the centre of the circle ...
-    dist = numpy.zeros((ndiv, ndiv), dtype = numpy.float64)
-    for ix in range(ndiv):
-        for iy in range(ndiv):
-            dist[iy, ix] = numpy.hypot(xaxis[ix], yaxis[iy])
+    dist = numpy.hypot(xaxis.reshape(1, -1), yaxis.reshape(-1, 1))
 
     # Return answer ...
     return float((dist <= r).sum()) / float(ndiv * ndiv)
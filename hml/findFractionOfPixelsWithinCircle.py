@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def findFractionOfPixelsWithinCircle(xmin, xmax, ymin, ymax, r, /, *, chunkSize = 4194304, cx = 0.0, cy = 0.0, ndiv = 0):
+    """
+    Find the fractions of many pixels that are within a hard circular mask.
+
+    Arguments:
+    xmin -- array of left edges
+    xmax -- array of right edges
+    ymin -- array of lower edges
+    ymax -- array of upper edges
+    r -- radius of circle (or an array of radii of circles)
+
+    Keyword arguments:
+    chunkSize -- the number of sub-pixels to find the distances of at a time
+                 (default 4194304)
+    cx -- x position of centre of circle (default 0.0)
+    cy -- y position of centre of circle (default 0.0)
+    ndiv -- number sub-divisions (default 0, which means find the exact
+            fractions)
+
+    Note:
+    This function returns an array of the same answers as calling
+    hml.findFractionOfPixelWithinCircle() for each pixel. All of the arguments
+    (and "cx" and "cy") are broadcast against each other, so that the fractions
+    of all of the pixels are found without looping over them in Python. If
+    "ndiv" is not zero then the pixels are sub-divided a chunk at a time, so as
+    to limit the amount of RAM that is used.
+    """
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+    # Import sub-functions ...
+    from .findAreaOfRectangleWithinCircle import findAreaOfRectangleWithinCircle
+
+    # Broadcast the arguments against each other ...
+    xmin, xmax, ymin, ymax, r, cx, cy = numpy.broadcast_arrays(
+        numpy.asarray(xmin, dtype = numpy.float64),
+        numpy.asarray(xmax, dtype = numpy.float64),
+        numpy.asarray(ymin, dtype = numpy.float64),
+        numpy.asarray(ymax, dtype = numpy.float64),
+        numpy.asarray(r, dtype = numpy.float64),
+        numpy.asarray(cx, dtype = numpy.float64),
+        numpy.asarray(cy, dtype = numpy.float64),
+    )
+
+    # Check if the exact fractions are wanted ...
+    if ndiv == 0:
+        # Return answer ...
+        return findAreaOfRectangleWithinCircle(
+            xmin,
+            xmax,
+            ymin,
+            ymax,
+            r,
+            cx = cx,
+            cy = cy,
+        ) / ((xmax - xmin) * (ymax - ymin))
+
+    # Flatten the arguments ...
+    shape = xmin.shape
+    xmin, xmax, ymin, ymax, r, cx, cy = [arr.reshape(-1) for arr in [xmin, xmax, ymin, ymax, r, cx, cy]]
+
+    # Create the offsets of the centroids of the sub-pixels ...
+    offsets = (numpy.arange(ndiv, dtype = numpy.float64) + 0.5) / float(ndiv)
+
+    # Initialize array ...
+    frac = numpy.zeros(xmin.size, dtype = numpy.float64)
+
+    # Loop over chunks of pixels ...
+    n = max(1, chunkSize // (ndiv * ndiv))                                      # [#]
+    for i in range(0, xmin.size, n):
+        # Create centroids relative to the centre of the circle ...
+        xaxis = xmin[i:i + n].reshape(-1, 1) + offsets.reshape(1, -1) * (xmax[i:i + n] - xmin[i:i + n]).reshape(-1, 1) - cx[i:i + n].reshape(-1, 1)
+        yaxis = ymin[i:i + n].reshape(-1, 1) + offsets.reshape(1, -1) * (ymax[i:i + n] - ymin[i:i + n]).reshape(-1, 1) - cy[i:i + n].reshape(-1, 1)
+
+        # Find out the distance of each centroid to the centre of the circle
+        # and count the ones which are within it ...
+        dist = numpy.hypot(xaxis.reshape(-1, 1, ndiv), yaxis.reshape(-1, ndiv, 1))
+        frac[i:i + n] = (dist <= r[i:i + n].reshape(-1, 1, 1)).sum(axis = (1, 2)) / float(ndiv * ndiv)
+
+    # Return answer ...
+    return frac.reshape(shape)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def findRecordBboxes(sfObj, /):
+    """
+    Find the shape type and the bounding box of every record in a ShapeFile
+    without parsing any of the geometries.
+
+    Arguments:
+    sfObj -- a shapefile.Reader of a ShapeFile
+
+    Note:
+    This function returns a (nrecord) array of the shape types and a (nrecord,
+    4) array of the bounding boxes (x1, y1, x2, y2). The bounding boxes of
+    records which have no geometry (shape type 0) are NaN.
+
+    Every record in a ".shp" file starts with an 8-byte big-endian header (the
+    record number and the length) followed by a little-endian 4-byte shape type
+    and, for everything apart from Points and Null shapes, a little-endian
+    32-byte bounding box. If there is a ".shx" file then the offset of every
+    record is read from it in one go, otherwise the ".shp" file is walked one
+    record header at a time. Either way, the shape types and bounding boxes are
+    then gathered from the bytes of the ".shp" file by NumPy in bulk, which is
+    orders of magnitude faster than creating a shapefile.Shape for every
+    record. The ".shp" file is memory-mapped (or, if it is already in RAM, its
+    buffer is used directly), so only the pages which contain the record
+    headers are read rather than all of the geometries.
+    """
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+    try:
+        import shapefile
+    except:
+        raise Exception("\"shapefile\" is not installed; run \"pip install --user pyshp\"") from None
+
+    # Check argument ...
+    if not isinstance(sfObj, shapefile.Reader):
+        raise TypeError("\"sfObj\" is not a shapefile.Reader")
+
+    # Find the ".shp" and ".shx" files ...
+    # NOTE: Newer versions of "shapefile" raise an exception when a file is
+    #       missing, rather than returning None.
+    try:
+        shpObj = sfObj.shp
+    except:
+        shpObj = None
+    try:
+        shxObj = sfObj.shx
+    except:
+        shxObj = None
+    if shpObj is None:
+        raise Exception("\"sfObj\" does not have a \".shp\" file") from None
+
+    # Memory-map the ".shp" file (leaving the file position where it was) ...
+    pos = shpObj.tell()
+    try:
+        shp = numpy.memmap(shpObj, dtype = numpy.uint8, mode = "r")
+    except:
+        # Use the buffer of the ".shp" file if it is in RAM, otherwise read
+        # it ...
+        if hasattr(shpObj, "getbuffer"):
+            shp = numpy.frombuffer(shpObj.getbuffer(), dtype = numpy.uint8)
+        else:
+            shpObj.seek(0)
+            shp = numpy.frombuffer(shpObj.read(), dtype = numpy.uint8)
+    shpObj.seek(pos)
+
+    # Check if there is a ".shx" file ...
+    if shxObj is not None:
+        # Read the ".shx" file (leaving the file position where it was) and
+        # find the offset (in bytes) of every record in the ".shp" file from
+        # it ...
+        # NOTE: The ".shx" file has a 100-byte header followed by an 8-byte
+        #       big-endian (offset, length) pair for every record, both of
+        #       which are in 16-bit words.
+        pos = shxObj.tell()
+        shxObj.seek(100)
+        offsets = 2 * numpy.frombuffer(shxObj.read(), dtype = ">i4")[0::2].astype(numpy.int64)
+        shxObj.seek(pos)
+    else:
+        # Walk the ".shp" file one record header at a time and find the offset
+        # (in bytes) of every record in it ...
+        # NOTE: The ".shp" file has a 100-byte header and the length of each
+        #       record (which does not include its 8-byte header) is in 16-bit
+        #       words.
+        offsets = []
+        offset = 100
+        while offset + 8 <= shp.size:
+            offsets.append(offset)
+            offset += 8 + 2 * int(shp[offset + 4:offset + 8].view(">i4")[0])
+        offsets = numpy.array(offsets, dtype = numpy.int64)
+
+    # Gather the shape type of every record ...
+    shapeTypes = shp[(offsets + 8)[:, None] + numpy.arange(4)].copy().view("<i4")[:, 0].astype(numpy.int32)
+
+    # Gather the bounding box of every record which has one ...
+    bboxes = numpy.full((offsets.size, 4), numpy.nan, dtype = numpy.float64)   # [m]
+    keep = (shapeTypes != shapefile.NULL) & (shapeTypes != shapefile.POINT) & (shapeTypes != shapefile.POINTZ) & (shapeTypes != shapefile.POINTM)
+    if keep.any():
+        bboxes[keep, :] = shp[(offsets[keep] + 12)[:, None] + numpy.arange(32)].copy().view("<f8") # [m]
+
+    # Return answers ...
+    return shapeTypes, bboxes
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+# Define function ...
+async def handleRasterConnection(grid, header, reader, writer, /, *, crs = None, method = "pyramid", pyramid = None):
+    """
+    Answer the HTTP requests on a connection to a raster query server.
+
+    Arguments:
+    grid -- the 2D raster with axes (ny, nx)
+    header -- the header of the raster (see hml.loadRasterHeader())
+    reader -- the asyncio.StreamReader of the connection
+    writer -- the asyncio.StreamWriter of the connection
+
+    Keyword arguments:
+    crs -- the cartopy.crs.CRS of the raster (default None, which means that
+           queries by latitude and longitude are not allowed)
+    method -- the method to pass to hml.sumImageWithinCircle() (default
+              "pyramid")
+    pyramid -- the pyramid of block sums of the raster (default None, which
+               means make it for every query, if the method is "pyramid")
+
+    Note:
+    This function is the callback which hml.serveRaster() passes to
+    asyncio.start_server() or asyncio.start_unix_server() (with "grid",
+    "header" and the keyword arguments filled in by functools.partial()). The
+    queries (see hml.queryRaster()) are either the JSON body of a POST request
+    or the parameters of a GET request (for example,
+    "GET /?easting=530000&northing=180000&radius=2000"), and the answers are
+    JSON. Connections are kept alive until the client closes them (or sends
+    "Connection: close"), so that many queries can be sent without opening a
+    new connection for each one. Each query is answered in a thread, so that
+    the server can carry on accepting connections whilst it is busy.
+    """
+
+    # Import standard modules ...
+    import asyncio
+    import json
+    import urllib.parse
+
+    # Import sub-functions ...
+    from .queryRaster import queryRaster
+
+    # Catch clients which disconnect part way through a request (or which send
+    # a request which cannot be parsed) ...
+    try:
+        # Loop over requests ...
+        while True:
+            # Read the request line and stop if the client has closed the
+            # connection ...
+            line = await reader.readline()
+            if not line:
+                break
+            parts = line.decode("ascii", errors = "replace").split()
+
+            # Read the headers ...
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in [b"", b"\r\n", b"\n"]:
+                    break
+                key, _, value = line.decode("ascii", errors = "replace").partition(":")
+                headers[key.strip().lower()] = value.strip()
+
+            # Read the body ...
+            body = await reader.readexactly(int(headers.get("content-length", "0")))
+
+            # Answer the request ...
+            try:
+                if len(parts) != 3:
+                    status = "400 Bad Request"
+                    answer = {"error" : "the request line is not valid"}
+                elif parts[0] == "GET":
+                    # Convert the parameters to a query (where "radius" may be
+                    # repeated) ...
+                    query = {}
+                    for key, values in urllib.parse.parse_qs(urllib.parse.urlsplit(parts[1]).query).items():
+                        query[key] = values if key == "radius" and len(values) > 1 else values[0]
+                    status = "200 OK"
+                    answer = await asyncio.to_thread(queryRaster, query, grid, header, crs = crs, method = method, pyramid = pyramid)
+                elif parts[0] == "POST":
+                    status = "200 OK"
+                    answer = await asyncio.to_thread(queryRaster, json.loads(body), grid, header, crs = crs, method = method, pyramid = pyramid)
+                else:
+                    status = "405 Method Not Allowed"
+                    answer = {"error" : f"the method is not allowed ({repr(parts[0])})"}
+            except ValueError as err:
+                # NOTE: "json.JSONDecodeError" is a sub-class of "ValueError".
+                status = "400 Bad Request"
+                answer = {"error" : str(err)}
+
+            # Send the answer ...
+            content = json.dumps(answer).encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\nContent-Length: {len(content):d}\r\n\r\n".encode("ascii") + content
+            )
+            await writer.drain()
+
+            # Stop if the client asked to close the connection ...
+            if headers.get("connection", "").lower() == "close":
+                break
+    except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+        pass
+    finally:
+        # Close the connection ...
+        writer.close()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def ingestShapefile(sfObj, dname, /):
+    """
+    Convert a ShapeFile into a geometry store.
+
+    Arguments:
+    sfObj -- a shapefile.Reader of a ShapeFile
+    dname -- the name of the directory to save the geometry store in
+
+    Note:
+    A geometry store is a directory of NumPy arrays which describe every record
+    in the ShapeFile as a MultiPolygon in the same layout as
+    "shapely.to_ragged_array()": "coords.npy" is the (npoint, 2) array of the
+    coordinates, "ringOffsets.npy" is where each ring starts in "coords.npy",
+    "partOffsets.npy" is where each Polygon starts in "ringOffsets.npy" and
+    "geomOffsets.npy" is where each record starts in "partOffsets.npy". There is
+    also "bboxes.npy", which is the (nrecord, 4) array of the bounding box of
+    every record, and "valid.npy", which says whether each record is both valid
+    and not empty.
+
+    The arrays can all be memory-mapped, so later runs can skip parsing the
+    ShapeFile entirely: see hml.loadGeometries(), which builds the geometries
+    in bulk using "shapely.from_ragged_array()". The geometry store is written
+    to a temporary directory first and then renamed, so an interrupted call
+    does not leave a partial geometry store behind.
+    """
+
+    # Import standard modules ...
+    import os
+    import shutil
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+    try:
+        import shapefile
+    except:
+        raise Exception("\"shapefile\" is not installed; run \"pip install --user pyshp\"") from None
+    try:
+        import shapely
+        import shapely.geometry
+        import shapely.validation
+    except:
+        raise Exception("\"shapely\" is not installed; run \"pip install --user Shapely\"") from None
+
+    # Import sub-functions ...
+    from .findRecordBboxes import findRecordBboxes
+
+    # Check arguments ...
+    if not isinstance(sfObj, shapefile.Reader):
+        raise TypeError("\"sfObj\" is not a shapefile.Reader")
+    if os.path.exists(dname):
+        raise Exception(f"\"{dname}\" already exists") from None
+
+    # Find the shape type and the bounding box of every record and crash if any
+    # of the records are not shapefile polygons ...
+    shapeTypes, bboxes = findRecordBboxes(sfObj)                                # [#], [m]
+    if (shapeTypes != shapefile.POLYGON).any():
+        raise Exception("\"shape\" is not a POLYGON") from None
+
+    # Initialize list ...
+    polys = []
+
+    # Loop over shapes ...
+    for shape in sfObj.iterShapes():
+        # Convert shapefile.Shape to shapely.geometry.multipolygon.MultiPolygon
+        # (so that every record has the same type) and append it to the list ...
+        poly = shapely.geometry.shape(shape)
+        if isinstance(poly, shapely.geometry.polygon.Polygon):
+            poly = shapely.geometry.multipolygon.MultiPolygon([poly])
+        polys.append(poly)
+
+    # Find out which records are valid and not empty ...
+    valid = shapely.is_valid(polys) & ~shapely.is_empty(polys)
+    for i in numpy.flatnonzero(~shapely.is_valid(polys)):
+        print(f"WARNING: Shape {i:,d} is not valid ({shapely.validation.explain_validity(polys[i])}).")
+
+    # Convert the MultiPolygons to flat arrays ...
+    _, coords, (ringOffsets, partOffsets, geomOffsets) = shapely.to_ragged_array(
+        polys,
+        include_z = False,
+    )
+
+    # Make a clean temporary directory ...
+    if os.path.exists(f"{dname}.tmp"):
+        shutil.rmtree(f"{dname}.tmp")
+    os.makedirs(f"{dname}.tmp")
+
+    # Save the arrays and then rename the temporary directory ...
+    numpy.save(f"{dname}.tmp/coords.npy", coords)                               # [m]
+    numpy.save(f"{dname}.tmp/ringOffsets.npy", ringOffsets.astype(numpy.int64))
+    numpy.save(f"{dname}.tmp/partOffsets.npy", partOffsets.astype(numpy.int64))
+    numpy.save(f"{dname}.tmp/geomOffsets.npy", geomOffsets.astype(numpy.int64))
+    numpy.save(f"{dname}.tmp/bboxes.npy", bboxes)                               # [m]
+    numpy.save(f"{dname}.tmp/valid.npy", valid)
+    os.replace(f"{dname}.tmp", dname)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def iterPolygons(sfObj, /):
+    """
+    Yield the valid [Multi]Polygons in a ShapeFile.
+
+    Arguments:
+    sfObj -- a shapefile.Reader of a ShapeFile, or the name of the directory of
+             a geometry store (see hml.ingestShapefile())
+
+    Note:
+    Invalid and empty [Multi]Polygons are skipped (with a warning for the
+    invalid ones) and the number of skipped records is printed once all of the
+    records have been yielded. The [Multi]Polygons are loaded from a geometry
+    store in chunks of 4096 records (see hml.loadGeometries()), in which case
+    the warnings were printed when the geometry store was made.
+    """
+
+    # Import special modules ...
+    try:
+        import shapefile
+    except:
+        raise Exception("\"shapefile\" is not installed; run \"pip install --user pyshp\"") from None
+    try:
+        import shapely
+        import shapely.geometry
+        import shapely.validation
+    except:
+        raise Exception("\"shapely\" is not installed; run \"pip install --user Shapely\"") from None
+
+    # Import sub-functions ...
+    from .loadGeometries import loadGeometries
+
+    # Check argument ...
+    if not isinstance(sfObj, (shapefile.Reader, str)):
+        raise TypeError("\"sfObj\" is not a shapefile.Reader or a str")
+
+    # Initialize counter ...
+    n = 0                                                                       # [#]
+
+    # Check if the [Multi]Polygons are in a geometry store ...
+    if isinstance(sfObj, str):
+        # Loop over chunks of records ...
+        start = 0
+        while True:
+            # Load chunk and stop looping if it is empty ...
+            polys, valid = loadGeometries(sfObj, start = start, stop = start + 4096)
+            if polys.size == 0:
+                break
+            start += polys.size
+
+            # Yield the valid [Multi]Polygons ...
+            n += int((~valid).sum())                                            # [#]
+            yield from polys[valid]
+
+        print(f"INFO: {n:,d} records were skipped because they were invalid")
+        return
+
+    # Loop over shape+record pairs ...
+    for shapeRecord in sfObj.iterShapeRecords():
+        # Crash if this shape+record is not a shapefile polygon ...
+        if shapeRecord.shape.shapeType != shapefile.POLYGON:
+            raise Exception("\"shape\" is not a POLYGON") from None
+
+        # Convert shapefile.Shape to shapely.geometry.polygon.Polygon or
+        # shapely.geometry.multipolygon.MultiPolygon ...
+        poly = shapely.geometry.shape(shapeRecord.shape)
+        if not poly.is_valid:
+            print(f"WARNING: Skipping a shape as it is not valid ({shapely.validation.explain_validity(poly)}).")
+            n += 1                                                              # [#]
+            continue
+        if poly.is_empty:
+            n += 1                                                              # [#]
+            continue
+
+        # Yield [Multi]Polygon ...
+        yield poly
+
+    print(f"INFO: {n:,d} records were skipped because they were invalid")
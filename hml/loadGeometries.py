@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def loadGeometries(dname, /, *, start = 0, stop = None):
+    """
+    Load some of the records from a geometry store.
+
+    Arguments:
+    dname -- the name of the directory of the geometry store (see
+             hml.ingestShapefile())
+
+    Keyword arguments:
+    start -- the index of the first record to load (default 0)
+    stop -- the index after the last record to load (default None, which means
+            load up to the last record)
+
+    Note:
+    This function returns an array of the [Multi]Polygons and an array of
+    whether each one is both valid and not empty. Records which only have one
+    Polygon are returned as a Polygon (rather than a MultiPolygon with one
+    part), which is what "shapely.geometry.shape()" would have returned for the
+    original record.
+
+    Only the parts of the arrays that are needed are read from the geometry
+    store (as they are all memory-mapped) and all of the [Multi]Polygons are
+    built in one go by "shapely.from_ragged_array()".
+    """
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+    try:
+        import shapely
+    except:
+        raise Exception("\"shapely\" is not installed; run \"pip install --user Shapely\"") from None
+
+    # Memory-map the arrays ...
+    coords = numpy.load(f"{dname}/coords.npy", mmap_mode = "r")                 # [m]
+    ringOffsets = numpy.load(f"{dname}/ringOffsets.npy", mmap_mode = "r")
+    partOffsets = numpy.load(f"{dname}/partOffsets.npy", mmap_mode = "r")
+    geomOffsets = numpy.load(f"{dname}/geomOffsets.npy", mmap_mode = "r")
+    valid = numpy.load(f"{dname}/valid.npy", mmap_mode = "r")
+
+    # Find the range of records ...
+    if stop is None:
+        stop = valid.size
+    stop = min(stop, valid.size)
+    start = min(start, stop)
+
+    # Find the ranges of parts, rings and points that the records use ...
+    p1 = int(geomOffsets[start])
+    p2 = int(geomOffsets[stop])
+    r1 = int(partOffsets[p1])
+    r2 = int(partOffsets[p2])
+    c1 = int(ringOffsets[r1])
+    c2 = int(ringOffsets[r2])
+
+    # Build the MultiPolygons (with the offsets moved so that they start at
+    # zero) ...
+    polys = shapely.from_ragged_array(
+        shapely.GeometryType.MULTIPOLYGON,
+        numpy.array(coords[c1:c2, :]),
+        (
+            numpy.array(ringOffsets[r1:r2 + 1]) - c1,
+            numpy.array(partOffsets[p1:p2 + 1]) - r1,
+            numpy.array(geomOffsets[start:stop + 1]) - p1,
+        ),
+    )
+
+    # Convert the MultiPolygons which only have one part to Polygons ...
+    single = shapely.get_num_geometries(polys) == 1
+    polys[single] = shapely.get_geometry(polys[single], 0)
+
+    # Return answers ...
+    return polys, numpy.array(valid[start:stop])
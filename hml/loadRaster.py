@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def loadRaster(fname, /, *, ix1 = 0, iy1 = 0, mode = "r", nx = None, ny = None):
+    """
+    Load a window of a raster container.
+
+    Arguments:
+    fname -- the name of the raster container
+
+    Keyword arguments:
+    ix1 -- the x index of the leftmost pixel of the window (default 0)
+    iy1 -- the y index of the lowermost pixel of the window (default 0)
+    mode -- the mode to memory-map uncompressed data with, either "r" or "r+"
+            (default "r")
+    nx -- number of x pixels in the window (default None, which means up to the
+          right-hand side of the raster)
+    ny -- number of y pixels in the window (default None, which means up to the
+          top of the raster)
+
+    Note:
+    See hml.createRaster() for a description of the raster container. If the
+    data are uncompressed then a numpy.memmap of the window is returned, so
+    nothing is read until it is used (and, if "mode" is "r+", changes to it are
+    written back to the raster container). If the data are compressed then
+    only the tiles which overlap the window are read and decompressed.
+    """
+
+    # Import standard modules ...
+    import zlib
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+    # Import sub-functions ...
+    from .loadRasterHeader import loadRasterHeader
+
+    # Load the header ...
+    header = loadRasterHeader(fname)
+
+    # Find the window ...
+    if nx is None:
+        nx = header["shape"][1] - ix1
+    if ny is None:
+        ny = header["shape"][0] - iy1
+    if ix1 < 0 or iy1 < 0 or ix1 + nx > header["shape"][1] or iy1 + ny > header["shape"][0]:
+        raise ValueError("the window is not within the raster") from None
+
+    # Check if the data are compressed ...
+    if header["compression"] == "none":
+        # Return answer ...
+        return numpy.memmap(
+            fname,
+             dtype = numpy.dtype(header["dtype"]),
+              mode = mode,
+            offset = header["dataOffset"],
+             shape = tuple(header["shape"]),
+        )[iy1:iy1 + ny, ix1:ix1 + nx]
+
+    if header["compression"] == "zlib":
+        # Create short-hands ...
+        ty, tx = header["tileShape"]
+        ntx = (header["shape"][1] + tx - 1) // tx
+
+        # Initialize window ...
+        window = numpy.zeros((ny, nx), dtype = numpy.dtype(header["dtype"]))
+
+        # Open the raster container ...
+        with open(fname, "rb") as fObj:
+            # Loop over the tiles which overlap the window ...
+            for jy in range(iy1 // ty, (iy1 + ny + ty - 1) // ty):
+                for jx in range(ix1 // tx, (ix1 + nx + tx - 1) // tx):
+                    # Find the extent of the tile ...
+                    ky1 = jy * ty
+                    kx1 = jx * tx
+                    ky2 = min(ky1 + ty, header["shape"][0])
+                    kx2 = min(kx1 + tx, header["shape"][1])
+
+                    # Read and decompress the tile ...
+                    offset, length = header["tiles"][jy * ntx + jx]
+                    fObj.seek(header["dataOffset"] + offset)
+                    tile = numpy.frombuffer(
+                        zlib.decompress(fObj.read(length)),
+                        dtype = numpy.dtype(header["dtype"]),
+                    ).reshape((ky2 - ky1, kx2 - kx1))
+
+                    # Copy the part of the tile which is in the window ...
+                    y1 = max(ky1, iy1)
+                    y2 = min(ky2, iy1 + ny)
+                    x1 = max(kx1, ix1)
+                    x2 = min(kx2, ix1 + nx)
+                    window[y1 - iy1:y2 - iy1, x1 - ix1:x2 - ix1] = tile[y1 - ky1:y2 - ky1, x1 - kx1:x2 - kx1]
+
+        # Return answer ...
+        return window
+
+    # Crash ...
+    raise ValueError(f"\"compression\" is an unexpected value ({repr(header['compression'])})") from None
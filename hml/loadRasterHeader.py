@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def loadRasterHeader(fname, /):
+    """
+    Load the header of a raster container.
+
+    Arguments:
+    fname -- the name of the raster container
+
+    Note:
+    See hml.createRaster() for a description of the raster container. Only the
+    header is read, so this is cheap regardless of the size of the raster.
+    """
+
+    # Import standard modules ...
+    import json
+
+    # Load the header ...
+    with open(fname, "rb") as fObj:
+        if fObj.read(8) != b"HMLRAST1":
+            raise Exception(f"\"{fname}\" is not a raster container") from None
+        n = int.from_bytes(fObj.read(8), byteorder = "little")
+        header = json.loads(fObj.read(n).decode("utf-8"))
+
+    # Return answer ...
+    return header
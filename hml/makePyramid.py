@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def makePyramid(img, /, *, bandSize = 256):
+    """
+    Make the pyramid of block sums (mipmap) of an image.
+
+    Arguments:
+    img -- 2D image with axes (ny, nx)
+
+    Keyword arguments:
+    bandSize -- the number of rows of each level to sum at a time (default 256)
+
+    Note:
+    The pyramid is a list of levels. The first level is the image itself and
+    each following level is half the size of the level before it (rounded up),
+    with element [iy, ix] being the sum of the 2x2 block of pixels
+    [2 * iy:2 * iy + 2, 2 * ix:2 * ix + 2] of the level before it, so element
+    [iy, ix] of level k is the sum of the 2^k x 2^k block of pixels of the
+    image which starts at [2^k * iy, 2^k * ix]. The last level is 1x1 and
+    contains the sum of the whole image.
+
+    The levels after the first one are accumulated in float64 (regardless of
+    the type of the image) and together they are only a third of the size of
+    the image. The image is only read one band of rows at a time and it is not
+    copied, so it can be a numpy.memmap.
+
+    The image must not have any negative pixels, because
+    hml.sumImageWithinCirclePyramid() skips blocks whose sums are zero as being
+    empty (which is only true if none of the pixels are negative).
+    """
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+    # Initialize list ...
+    pyramid = [img]
+
+    # Loop until the last level is a single pixel ...
+    while pyramid[-1].shape[0] > 1 or pyramid[-1].shape[1] > 1:
+        # Create short-hand and initialize array ...
+        prev = pyramid[-1]
+        level = numpy.zeros(((prev.shape[0] + 1) // 2, (prev.shape[1] + 1) // 2), dtype = numpy.float64)
+
+        # Loop over bands of rows ...
+        for iy in range(0, level.shape[0], bandSize):
+            # Load the band of rows of the level before this one ...
+            band = numpy.asarray(prev[2 * iy:2 * (iy + bandSize), :], dtype = numpy.float64)
+
+            # Check that the image does not have any negative pixels (the
+            # levels after the first one are sums of the image, so they only
+            # need checking on the first pass) ...
+            if len(pyramid) == 1 and (band < 0.0).any():
+                raise ValueError(f"the image has negative pixels (the smallest is {float(band.min()):e})") from None
+
+            # Sum pairs of rows and then pairs of columns (where the last row
+            # or column is on its own if there are an odd number of them) ...
+            band = numpy.add.reduceat(band, numpy.arange(0, band.shape[0], 2), axis = 0)
+            level[iy:iy + bandSize, :] = numpy.add.reduceat(band, numpy.arange(0, band.shape[1], 2), axis = 1)
+
+        # Append level to list ...
+        pyramid.append(level)
+
+    # Return answer ...
+    return pyramid
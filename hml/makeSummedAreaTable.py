@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def makeSummedAreaTable(img, /, *, bandSize = 256):
+    """
+    Make the summed-area table (integral image) of an image.
+
+    Arguments:
+    img -- 2D image with axes (ny, nx)
+
+    Keyword arguments:
+    bandSize -- the number of rows of the image to sum at a time (default 256)
+
+    Note:
+    The summed-area table has axes (ny + 1, nx + 1) and element [iy, ix] is the
+    sum of img[:iy, :ix], so the first row and the first column are zero. The
+    sum of any rectangle of pixels img[iy1:iy2, ix1:ix2] is then:
+
+        sat[iy2, ix2] - sat[iy1, ix2] - sat[iy2, ix1] + sat[iy1, ix1]
+
+    The summed-area table is accumulated in float64 (regardless of the type of
+    the image) and the image is only read one band of rows at a time, so it can
+    be a numpy.memmap.
+    """
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+    # Initialize array ...
+    sat = numpy.zeros((img.shape[0] + 1, img.shape[1] + 1), dtype = numpy.float64)
+
+    # Loop over bands of rows ...
+    for iy in range(0, img.shape[0], bandSize):
+        # Create short-hand ...
+        band = sat[iy + 1:iy + 1 + bandSize, 1:]
+
+        # Sum along the rows and then down the columns (carrying on from the
+        # last row of the previous band) ...
+        numpy.cumsum(img[iy:iy + bandSize, :], axis = 1, dtype = numpy.float64, out = band)
+        band[0, :] += sat[iy, 1:]
+        numpy.cumsum(band, axis = 0, out = band)
+
+    # Return answer ...
+    return sat
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def queryRaster(query, grid, header, /, *, crs = None, method = "pyramid", pyramid = None):
+    """
+    Answer a query of how much of a raster is within circles around a point.
+
+    Arguments:
+    query -- a dictionary describing the query
+    grid -- the 2D raster with axes (ny, nx)
+    header -- the header of the raster (see hml.loadRasterHeader())
+
+    Keyword arguments:
+    crs -- the cartopy.crs.CRS of the raster (default None, which means that
+           queries by latitude and longitude are not allowed)
+    method -- the method to pass to hml.sumImageWithinCircle() (default
+              "pyramid")
+    pyramid -- the pyramid of block sums of the raster (default None, which
+               means make it, if the method is "pyramid")
+
+    Note:
+    A query is either a single query or a batch of single queries. A single
+    query has a "radius" (in metres), which can be a list of radii, and either
+    an "easting" and a "northing" (in the same coordinate reference system as
+    the raster) or a "lat" and a "lon" (in degrees, on the WGS84 ellipsoid). For
+    example:
+
+        {"easting" : 530000.0, "northing" : 180000.0, "radius" : 2000.0}
+        {"lat" : 51.5, "lon" : -0.1, "radius" : [1000.0, 2000.0]}
+
+    The answer to a single query is a dictionary with the "easting" and
+    "northing" of the centre of the circles and the "area" within the circles
+    (which is a list if the "radius" was a list). A batch query is a dictionary
+    with a list of single queries called "queries" and its answer is a
+    dictionary with a list of answers called "answers". Any problems with a
+    query raise a ValueError.
+
+    The pyramid of block sums should be made once (see hml.makePyramid()) and
+    passed in if the same raster is queried many times, as hml.serveRaster()
+    does.
+    """
+
+    # Import sub-functions ...
+    from .makePyramid import makePyramid
+    from .sumImageWithinCircle import sumImageWithinCircle
+
+    # Check query ...
+    if not isinstance(query, dict):
+        raise ValueError(f"the query is not a dictionary ({repr(query)})") from None
+
+    # Check if the pyramid needs making ...
+    if method == "pyramid" and pyramid is None:
+        pyramid = makePyramid(grid)
+
+    # Check if the query is a batch ...
+    if "queries" in query:
+        # Check batch ...
+        if not isinstance(query["queries"], list):
+            raise ValueError(f"\"queries\" is not a list ({repr(query['queries'])})") from None
+
+        # Return answer ...
+        return {
+            "answers" : [
+                queryRaster(
+                    subQuery,
+                    grid,
+                    header,
+                        crs = crs,
+                     method = method,
+                    pyramid = pyramid,
+                )
+                for subQuery in query["queries"]
+            ],
+        }
+
+    # Find the centre of the circles ...
+    try:
+        if "easting" in query and "northing" in query:
+            easting = float(query["easting"])                                   # [m]
+            northing = float(query["northing"])                                 # [m]
+        elif "lat" in query and "lon" in query:
+            # Check that the raster can be georeferenced ...
+            if crs is None:
+                raise ValueError("the raster does not have a coordinate reference system, so it cannot be queried by latitude and longitude") from None
+
+            # Import special modules ...
+            try:
+                import cartopy
+                import cartopy.crs
+            except:
+                raise Exception("\"cartopy\" is not installed; run \"pip install --user Cartopy\"") from None
+
+            # Project the latitude and longitude ...
+            easting, northing = crs.transform_point(
+                float(query["lon"]),
+                float(query["lat"]),
+                cartopy.crs.Geodetic(),
+            )                                                                   # [m], [m]
+        else:
+            raise ValueError("the query does not have either an \"easting\" and a \"northing\" or a \"lat\" and a \"lon\"") from None
+
+        # Find the radii ...
+        if isinstance(query["radius"], list):
+            radii = [float(radius) for radius in query["radius"]]               # [m]
+        else:
+            radii = [float(query["radius"])]                                    # [m]
+    except KeyError:
+        raise ValueError("the query does not have a \"radius\"") from None
+    except TypeError:
+        raise ValueError(f"the query has a value which is not a number ({repr(query)})") from None
+
+    # Sum the raster within the circles ...
+    areas = []                                                                  # [m2]
+    for radius in radii:
+        areas.append(
+            sumImageWithinCircle(
+                grid,
+                header["x0"],
+                header["x0"] + header["px"] * float(header["shape"][1]),
+                header["y0"],
+                header["y0"] + header["px"] * float(header["shape"][0]),
+                radius,
+                     cx = easting,
+                     cy = northing,
+                 method = method,
+                pyramid = pyramid,
+            )
+        )
+
+    # Return answer ...
+    return {
+         "easting" : float(easting),
+        "northing" : float(northing),
+            "area" : areas if isinstance(query["radius"], list) else areas[0],
+    }
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def radialProfile(img, xmin, xmax, ymin, ymax, radii, /, *, chunkSize = 16384, cx = 0.0, cy = 0.0, ndiv = 0):
+    """
+    Sum the pixel values on an image that are within many concentric hard
+    circular masks.
+
+    Arguments:
+    img -- 2D image with axes (ny, nx)
+    xmin -- left edge of leftmost pixel
+    xmax -- right edge of rightmost pixel
+    ymin -- lower edge of lowermost pixel
+    ymax -- upper edge of uppermost pixel
+    radii -- 1D array of radii of circles
+
+    Keyword arguments:
+    chunkSize -- the number of pixels which straddle a circumference to find
+                 the fractions of at a time (default 16384)
+    cx -- x position of centre of circles (default 0.0)
+    cy -- y position of centre of circles (default 0.0)
+    ndiv -- number sub-divisions (default 0, which means find the exact
+            fractions)
+
+    Note:
+    This function returns the same answers as calling hml.sumImageWithinCircle()
+    once for each radius, but it only makes one pass over the pixels which are
+    within the largest circle. The nearest point and the furthest corner of
+    each pixel bound which circles it is entirely within (for which all of its
+    value is added) and which circles it straddles (for which part of its value
+    is added, with the fraction found like hml.findFractionOfPixelWithinCircle()
+    does). The whole pixels are binned by the smallest circle that they are
+    entirely within and then accumulated outwards, so each pixel is only
+    visited once for them.
+
+    If "ndiv" is not zero then the fraction of a sub-divided pixel is found one
+    row of sub-pixels at a time (by finding the span of sub-pixels which are
+    within the circle in each row) rather than by finding the distance to every
+    sub-pixel.
+    """
+
+    # Import standard modules ...
+    import math
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+    # Import sub-functions ...
+    from .findAreaOfRectangleWithinCircle import findAreaOfRectangleWithinCircle
+
+    # Sort the radii ...
+    radii = numpy.asarray(radii, dtype = numpy.float64)
+    order = numpy.argsort(radii)
+    sortedRadii = radii[order]
+
+    # Initialize totals ...
+    tots = numpy.zeros(radii.size, dtype = numpy.float64)
+    if radii.size == 0:
+        return tots
+
+    # Create short-hands ...
+    nx = img.shape[1]                                                           # [#]
+    ny = img.shape[0]                                                           # [#]
+    dx = (xmax - xmin) / float(nx)
+    dy = (ymax - ymin) / float(ny)
+
+    # Find the window of pixels which overlap the largest circle and return
+    # early if there are not any ...
+    ix1 = max(0, math.floor((cx - sortedRadii[-1] - xmin) / dx))
+    ix2 = min(nx, math.ceil((cx + sortedRadii[-1] - xmin) / dx))
+    iy1 = max(0, math.floor((cy - sortedRadii[-1] - ymin) / dy))
+    iy2 = min(ny, math.ceil((cy + sortedRadii[-1] - ymin) / dy))
+    if ix2 <= ix1 or iy2 <= iy1:
+        return tots
+
+    # Create nodes relative to the centre of the circles ...
+    xaxis = xmin + numpy.arange(ix1, ix2 + 1, dtype = numpy.float64) * dx - cx
+    yaxis = ymin + numpy.arange(iy1, iy2 + 1, dtype = numpy.float64) * dy - cy
+
+    # Find out the distance of each node to the centre of the circles and then
+    # the distance of the furthest corner of each pixel ...
+    dist = numpy.hypot(xaxis.reshape(1, -1), yaxis.reshape(-1, 1))
+    dmax = numpy.maximum.reduce([dist[:-1, :-1], dist[:-1, 1:], dist[1:, :-1], dist[1:, 1:]])
+    del dist
+
+    # Find out the distance of the nearest point of each pixel to the centre of
+    # the circles (which is not necessarily a corner) ...
+    xnear = numpy.where((xaxis[:-1] <= 0.0) & (xaxis[1:] >= 0.0), 0.0, numpy.minimum(numpy.abs(xaxis[:-1]), numpy.abs(xaxis[1:])))
+    ynear = numpy.where((yaxis[:-1] <= 0.0) & (yaxis[1:] >= 0.0), 0.0, numpy.minimum(numpy.abs(yaxis[:-1]), numpy.abs(yaxis[1:])))
+    dmin = numpy.hypot(xnear.reshape(1, -1), ynear.reshape(-1, 1))
+
+    # Find the pixels which are not empty and which are not all outside of the
+    # largest circle ...
+    jy, jx = numpy.nonzero((img[iy1:iy2, ix1:ix2] != 0.0) & (dmin < sortedRadii[-1]))
+    vals = img[iy1:iy2, ix1:ix2][jy, jx].astype(numpy.float64)
+    dmin = dmin[jy, jx]
+    dmax = dmax[jy, jx]
+
+    # Find the first circle that each pixel is entirely within and the first
+    # circle that each pixel is not all outside of ...
+    k1 = numpy.searchsorted(sortedRadii, dmin, side = "right")
+    k2 = numpy.searchsorted(sortedRadii, dmax, side = "left")
+
+    # Add all of the value of each pixel to the circle that it is first
+    # entirely within and accumulate outwards ...
+    tots += numpy.cumsum(numpy.bincount(k2, weights = vals, minlength = radii.size + 1)[:radii.size])
+
+    # Make a list of the pairs of pixels and circles where the pixel straddles
+    # the circumference ...
+    n = k2 - k1
+    pairPix = numpy.repeat(numpy.arange(vals.size), n)
+    pairK = numpy.repeat(k1, n) + numpy.arange(pairPix.size) - numpy.repeat(numpy.cumsum(n) - n, n)
+
+    # Create the offsets of the centroids of the sub-pixels ...
+    offsets = (numpy.arange(ndiv, dtype = numpy.float64) + 0.5) / float(max(ndiv, 1))
+
+    # Loop over chunks of pairs ...
+    for i in range(0, pairPix.size, chunkSize):
+        # Create short-hands ...
+        p = pairPix[i:i + chunkSize]
+        r = sortedRadii[pairK[i:i + chunkSize]].reshape(-1, 1)
+        x1 = xaxis[jx[p]].reshape(-1, 1)
+        y1 = yaxis[jy[p]].reshape(-1, 1)
+
+        # Check if the exact fractions are wanted ...
+        if ndiv == 0:
+            # Find the fraction of each pixel which is within the circle ...
+            frac = findAreaOfRectangleWithinCircle(x1, x1 + dx, y1, y1 + dy, r).reshape(-1) / (dx * dy)
+        else:
+            # Find the y position of the centroid of each row of sub-pixels and
+            # the half-width of the circle there ...
+            ys = y1 + offsets.reshape(1, -1) * dy
+            w2 = r * r - ys * ys
+            hw = numpy.sqrt(numpy.maximum(w2, 0.0))
+
+            # Count the sub-pixels in each row which are within the circle ...
+            lo = numpy.maximum(numpy.ceil((-hw - x1) * float(ndiv) / dx - 0.5), 0.0)
+            hi = numpy.minimum(numpy.floor((hw - x1) * float(ndiv) / dx - 0.5), float(ndiv - 1))
+            count = numpy.where(w2 >= 0.0, numpy.maximum(hi - lo + 1.0, 0.0), 0.0).sum(axis = 1)
+
+            # Find the fraction of each pixel which is within the circle ...
+            frac = count / float(ndiv * ndiv)
+
+        # Add part of the value of each pixel to the circle ...
+        tots += numpy.bincount(
+            pairK[i:i + chunkSize],
+              weights = vals[p] * frac,
+            minlength = radii.size,
+        )
+
+    # Return answer (in the original order of the radii) ...
+    ans = numpy.zeros(radii.size, dtype = numpy.float64)
+    ans[order] = tots
+    return ans
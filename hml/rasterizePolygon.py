@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 # Define function ...
-def rasterizePolygon(poly, /, *, px = 1024.0):
+def rasterizePolygon(poly, /, *, method = "vectorized", nchunk = 65536, px = 1024.0):
     """
     Rasterize a [Multi]Polygon.
 
@@ -9,11 +9,32 @@ def rasterizePolygon(poly, /, *, px = 1024.0):
     poly -- a shapely.geometry.[multi]polygon.[Multi]Polygon
 
     Keyword arguments:
+    method -- the method to use, either "analytic", "loop", "quadtree" or
+              "vectorized" (default "vectorized")
+    nchunk -- the maximum number of pixels to intersect at once when using the
+              "quadtree" or "vectorized" methods (default 65536)
     px -- pixel size (default 1024.0)
 
     Note:
     This function only works for [Multi]Polygons that solely exist in the
     (positive, positive) quadrant.
+
+    The "loop" method intersects every pixel in the bounding box with the
+    [Multi]Polygon one at a time. The "vectorized" method creates whole rows of
+    pixels at once, prepares the [Multi]Polygon and then classifies the pixels
+    in bulk: pixels that are entirely within the [Multi]Polygon are set to
+    px*px and only pixels that straddle the boundary are intersected. The
+    "quadtree" method does the same classification on blocks of pixels: blocks
+    that are entirely within the [Multi]Polygon are set to px*px, blocks that
+    are entirely outside of it are skipped and blocks that straddle its
+    boundary are split into four until they are single pixels, which are then
+    intersected; the number of tests scales with the perimeter rather than the
+    area. These three methods return identical answers. The "analytic" method
+    does not intersect any pixels at all, instead it walks along the edges of
+    the rings once and accumulates the exact area of each pixel that is covered
+    (see hml.rasterizeRings(), which uses the FORTRAN module if it has been
+    compiled); it agrees with the other methods to within the precision of
+    float32.
     """
 
     # Import standard modules ...
@@ -30,6 +51,9 @@ def rasterizePolygon(poly, /, *, px = 1024.0):
     except:
         raise Exception("\"shapely\" is not installed; run \"pip install --user Shapely\"") from None
 
+    # Import sub-functions ...
+    from .rasterizeRings import rasterizeRings
+
     # Check argument ...
     if not isinstance(poly, shapely.geometry.polygon.Polygon):
         if not isinstance(poly, shapely.geometry.multipolygon.MultiPolygon):
@@ -48,32 +72,219 @@ def rasterizePolygon(poly, /, *, px = 1024.0):
     # Initialize local grid ...
     localGrid = numpy.zeros((ny, nx), dtype = numpy.float32)                    # [m2]
 
-    # Loop over x-axis ...
-    for ix in range(nx):
+    # Check which method the user wants ...
+    if method == "analytic":
+        # Orient all of the Polygons so that their exteriors are
+        # counter-clockwise and their interiors are clockwise ...
+        if isinstance(poly, shapely.geometry.polygon.Polygon):
+            orientedPoly = shapely.geometry.polygon.orient(poly, sign = 1.0)
+        else:
+            orientedPoly = shapely.geometry.multipolygon.MultiPolygon(
+                [shapely.geometry.polygon.orient(part, sign = 1.0) for part in poly.geoms]
+            )
+
+        # Find the coordinates of all of the rings and rasterize them ...
+        coords, offsets = shapely.to_ragged_array([orientedPoly])[1:]
+        localGrid[:, :] = rasterizeRings(
+            coords,
+            offsets[0],
+                    ix1 = ix1,
+                    iy1 = iy1,
+                     nx = nx,
+                     ny = ny,
+            partOffsets = offsets[1],
+                     px = px,
+        )                                                                       # [m2]
+    elif method == "loop":
+        # Loop over x-axis ...
+        for ix in range(nx):
+            # Create short-hands ...
+            xmin = float(ix1 + ix) * px                                         # [m]
+            xmax = float(ix1 + ix + 1) * px                                     # [m]
+
+            # Loop over y-axis ...
+            for iy in range(ny):
+                # Create short-hands ...
+                ymin = float(iy1 + iy) * px                                     # [m]
+                ymax = float(iy1 + iy + 1) * px                                 # [m]
+
+                # Create a counter-clockwise polygon of the pixel, find its
+                # intersection with the [Multi]Polygon and add the area to
+                # the local grid ...
+                localGrid[iy, ix] += poly.intersection(
+                    shapely.geometry.polygon.Polygon(
+                        [
+                            (xmin, ymin),
+                            (xmax, ymin),
+                            (xmax, ymax),
+                            (xmin, ymax),
+                            (xmin, ymin),
+                        ]
+                    )
+                ).area                                                          # [m2]
+    elif method == "vectorized":
+        # Skip if there are no pixels ...
+        if nx == 0 or ny == 0:
+            return ix1, iy1, localGrid
+
+        # Prepare the [Multi]Polygon so that the bulk predicates are fast ...
+        shapely.prepare(poly)
+
         # Create short-hands ...
-        xmin = float(ix1 + ix) * px                                             # [m]
-        xmax = float(ix1 + ix + 1) * px                                         # [m]
+        # NOTE: These are calculated in exactly the same way as the "loop"
+        #       method so that the pixels are identical.
+        xedges = px * numpy.arange(ix1, ix2 + 1, dtype = numpy.float64)         # [m]
+        yedges = px * numpy.arange(iy1, iy2 + 1, dtype = numpy.float64)         # [m]
 
-        # Loop over y-axis ...
-        for iy in range(ny):
+        # Find how many rows can be done at once ...
+        nrow = max(1, nchunk // nx)
+
+        # Loop over chunks of rows ...
+        for iy in range(0, ny, nrow):
             # Create short-hands ...
-            ymin = float(iy1 + iy) * px                                         # [m]
-            ymax = float(iy1 + iy + 1) * px                                     # [m]
-
-            # Create a counter-clockwise polygon of the pixel, find its
-            # intersection with the [Multi]Polygon and add the area to the local
-            # grid ...
-            localGrid[iy, ix] += poly.intersection(
-                shapely.geometry.polygon.Polygon(
+            jy = min(ny, iy + nrow)
+            xmin, ymin = numpy.meshgrid(xedges[:-1], yedges[iy:jy])             # [m], [m]
+            xmax, ymax = numpy.meshgrid(xedges[1:], yedges[iy + 1:jy + 1])      # [m], [m]
+
+            # Create counter-clockwise polygons of all of the pixels (in
+            # exactly the same vertex order as the "loop" method) ...
+            pixels = shapely.polygons(
+                numpy.stack(
                     [
-                        (xmin, ymin),
-                        (xmax, ymin),
-                        (xmax, ymax),
-                        (xmin, ymax),
-                        (xmin, ymin),
-                    ]
+                        numpy.stack([xmin, ymin], axis = -1),
+                        numpy.stack([xmax, ymin], axis = -1),
+                        numpy.stack([xmax, ymax], axis = -1),
+                        numpy.stack([xmin, ymax], axis = -1),
+                        numpy.stack([xmin, ymin], axis = -1),
+                    ],
+                    axis = -2,
+                )
+            )
+
+            # Find the pixels that are entirely within the [Multi]Polygon
+            # and the pixels that straddle its boundary ...
+            inside = shapely.contains_properly(poly, pixels)
+            boundary = shapely.intersects(poly, pixels) & ~inside
+
+            # Populate the local grid ...
+            localGrid[iy:jy, :][inside] = px * px                               # [m2]
+            localGrid[iy:jy, :][boundary] = shapely.area(
+                shapely.intersection(poly, pixels[boundary])
+            )                                                                   # [m2]
+    elif method == "quadtree":
+        # Skip if there are no pixels ...
+        if nx == 0 or ny == 0:
+            return ix1, iy1, localGrid
+
+        # Prepare the [Multi]Polygon so that the bulk predicates are fast ...
+        shapely.prepare(poly)
+
+        # Create short-hands ...
+        # NOTE: These are calculated in exactly the same way as the "loop"
+        #       method so that the pixels are identical.
+        xedges = px * numpy.arange(ix1, ix2 + 1, dtype = numpy.float64)         # [m]
+        yedges = px * numpy.arange(iy1, iy2 + 1, dtype = numpy.float64)         # [m]
+
+        # Initialize the list of blocks with a single block which covers the
+        # whole local grid (each block is stored as the indices of its
+        # lower-left pixel and its width and height in pixels) ...
+        jx = numpy.zeros(1, dtype = numpy.int64)
+        jy = numpy.zeros(1, dtype = numpy.int64)
+        wx = numpy.array([nx], dtype = numpy.int64)
+        wy = numpy.array([ny], dtype = numpy.int64)
+
+        # Initialize the lists of single pixels which straddle the boundary ...
+        leafX = []
+        leafY = []
+
+        # Loop until there are no blocks left to classify ...
+        while jx.size > 0:
+            # Create counter-clockwise polygons of all of the blocks (in
+            # exactly the same vertex order as the "loop" method) ...
+            xmin = xedges[jx]                                                   # [m]
+            xmax = xedges[jx + wx]                                              # [m]
+            ymin = yedges[jy]                                                   # [m]
+            ymax = yedges[jy + wy]                                              # [m]
+            blocks = shapely.polygons(
+                numpy.stack(
+                    [
+                        numpy.stack([xmin, ymin], axis = -1),
+                        numpy.stack([xmax, ymin], axis = -1),
+                        numpy.stack([xmax, ymax], axis = -1),
+                        numpy.stack([xmin, ymax], axis = -1),
+                        numpy.stack([xmin, ymin], axis = -1),
+                    ],
+                    axis = -2,
+                )
+            )
+
+            # Find the blocks that are entirely within the [Multi]Polygon and
+            # the blocks that straddle its boundary ...
+            inside = shapely.contains_properly(poly, blocks)
+            boundary = shapely.intersects(poly, blocks) & ~inside
+
+            # Fill in the blocks that are entirely within the [Multi]Polygon ...
+            for i in numpy.flatnonzero(inside):
+                localGrid[jy[i]:jy[i] + wy[i], jx[i]:jx[i] + wx[i]] = px * px   # [m2]
+
+            # Save the single pixels that straddle the boundary for later ...
+            single = boundary & (wx == 1) & (wy == 1)
+            leafX.append(jx[single])
+            leafY.append(jy[single])
+
+            # Split the rest of the blocks that straddle the boundary into
+            # four (throwing away any children which have no pixels) ...
+            split = boundary & ~single
+            jx = jx[split]
+            jy = jy[split]
+            wx = wx[split]
+            wy = wy[split]
+            hx = wx // 2
+            hy = wy // 2
+            jx = numpy.concatenate([jx, jx + hx, jx, jx + hx])
+            jy = numpy.concatenate([jy, jy, jy + hy, jy + hy])
+            wx = numpy.concatenate([hx, wx - hx, hx, wx - hx])
+            wy = numpy.concatenate([hy, hy, wy - hy, wy - hy])
+            keep = (wx > 0) & (wy > 0)
+            jx = jx[keep]
+            jy = jy[keep]
+            wx = wx[keep]
+            wy = wy[keep]
+
+        # Convert the lists of single pixels which straddle the boundary to
+        # arrays ...
+        leafX = numpy.concatenate(leafX)
+        leafY = numpy.concatenate(leafY)
+
+        # Loop over chunks of single pixels which straddle the boundary ...
+        for i in range(0, leafX.size, nchunk):
+            # Create short-hands ...
+            kx = leafX[i:i + nchunk]
+            ky = leafY[i:i + nchunk]
+
+            # Create counter-clockwise polygons of the pixels (in exactly the
+            # same vertex order as the "loop" method), find their intersections
+            # with the [Multi]Polygon and add the areas to the local grid ...
+            localGrid[ky, kx] = shapely.area(
+                shapely.intersection(
+                    poly,
+                    shapely.polygons(
+                        numpy.stack(
+                            [
+                                numpy.stack([xedges[kx], yedges[ky]], axis = -1),
+                                numpy.stack([xedges[kx + 1], yedges[ky]], axis = -1),
+                                numpy.stack([xedges[kx + 1], yedges[ky + 1]], axis = -1),
+                                numpy.stack([xedges[kx], yedges[ky + 1]], axis = -1),
+                                numpy.stack([xedges[kx], yedges[ky]], axis = -1),
+                            ],
+                            axis = -2,
+                        )
+                    ),
                 )
-            ).area                                                              # [m2]
+            )                                                                   # [m2]
+    else:
+        # Crash ...
+        raise ValueError(f"\"method\" is an unexpected value ({repr(method)})") from None
 
     # Return answer ...
     return ix1, iy1, localGrid
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def rasterizePolygons(wkbs, /, *, method = "vectorized", px = 1024.0, shared = False):
+    """
+    Rasterize a batch of [Multi]Polygons.
+
+    Arguments:
+    wkbs -- a list of shapely.geometry.[multi]polygon.[Multi]Polygons which
+            have been serialized as WKB
+
+    Keyword arguments:
+    method -- the method to pass to hml.rasterizePolygon() (default "vectorized")
+    px -- pixel size (default 1024.0)
+    shared -- add the answers directly to the global grid in shared memory
+              (see hml.attachSharedGrid()) rather than returning them (default
+              False)
+
+    Note:
+    This function only works for [Multi]Polygons that solely exist in the
+    (positive, positive) quadrant.
+
+    This function returns a list of the answers from hml.rasterizePolygon(),
+    which is empty if "shared" is True. When adding to the global grid in shared
+    memory only one band of rows is locked at a time. Passing WKB (rather than
+    pickled Shapely objects) to a pool of workers is both smaller and faster to
+    decode.
+    """
+
+    # Import special modules ...
+    try:
+        import shapely
+    except:
+        raise Exception("\"shapely\" is not installed; run \"pip install --user Shapely\"") from None
+
+    # Import sub-functions ...
+    from .attachSharedGrid import sharedGrid
+    from .rasterizePolygon import rasterizePolygon
+
+    # Initialize list ...
+    results = []
+
+    # Loop over [Multi]Polygons ...
+    for poly in shapely.from_wkb(wkbs):
+        # Rasterize [Multi]Polygon ...
+        ix1, iy1, localGrid = rasterizePolygon(
+            poly,
+            method = method,
+                px = px,
+        )
+
+        # Check if the answer should be returned ...
+        if not shared:
+            # Append answer to list ...
+            results.append((ix1, iy1, localGrid))
+            continue
+
+        # Create short-hands ...
+        grid = sharedGrid["grid"]                                               # [m2]
+        nrow = sharedGrid["nrow"]
+
+        # Loop over the bands of rows that the local grid covers ...
+        for iband in range(iy1 // nrow, (iy1 + localGrid.shape[0] - 1) // nrow + 1):
+            # Find the rows of the local grid that are in this band ...
+            iy = max(iy1, iband * nrow)
+            jy = min(iy1 + localGrid.shape[0], (iband + 1) * nrow)
+
+            # Add local grid to global grid whilst holding the lock for this
+            # band ...
+            with sharedGrid["locks"][iband]:
+                grid[iy:jy, ix1:ix1 + localGrid.shape[1]] += localGrid[iy - iy1:jy - iy1, :] # [m2]
+
+    # Return answer ...
+    return results
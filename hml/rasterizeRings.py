@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def rasterizeRings(coords, ringOffsets, /, *, ix1 = 0, iy1 = 0, nx = 1024, ny = 1024, partOffsets = None, px = 1024.0):
+    """
+    Rasterize some rings by accumulating the signed area under each of their
+    edges.
+
+    Arguments:
+    coords -- a (npoint, 2) array of the coordinates of all of the rings
+    ringOffsets -- a (nring + 1) array of where each ring starts in "coords"
+
+    Keyword arguments:
+    ix1 -- the x index of the leftmost pixel of the grid (default 0)
+    iy1 -- the y index of the lowermost pixel of the grid (default 0)
+    nx -- number of x pixels (default 1024)
+    ny -- number of y pixels (default 1024)
+    partOffsets -- a (npart + 1) array of where each Polygon starts in
+                   "ringOffsets" (default None, which means that all of the
+                   rings are in one Polygon)
+    px -- pixel size (default 1024.0)
+
+    Note:
+    The rings must be closed, all of the exterior rings must be
+    counter-clockwise and all of the interior rings must be clockwise (which is
+    what "shapely.geometry.polygon.orient()" does). The rings do not need to be
+    within the grid: any parts of them that are outside of the grid are
+    correctly accounted for.
+
+    Every edge is cut wherever it crosses a pixel boundary, so that each piece
+    lies within a single pixel. Each piece adds the area between it and the
+    right-hand side of its pixel to its pixel and the rest of its height to the
+    next pixel along. A cumulative sum along the x-axis then turns these
+    contributions into the exact area of each pixel that is covered. The cost
+    scales with the perimeter (in pixels) plus the area of the grid.
+
+    If the rings are split up into Polygons with "partOffsets" then each
+    Polygon is rasterized on its own, within the part of the grid that it
+    covers, and the answers are added together. Polygons which overlap each
+    other are therefore counted once each (rather than the covered area of
+    each pixel being capped at one whole pixel for all of them together). If
+    the FORTRAN module has been compiled (see hml.f90) then the work is done
+    by hml.f90.funcs.rasterizerings() instead, which does the same thing for
+    each Polygon in parallel (using OpenMP).
+    """
+
+    # Import standard modules ...
+    import math
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+    # Import sub-functions ...
+    try:
+        from .f90 import funcs
+    except:
+        funcs = None
+
+    # Check if the FORTRAN module has been compiled ...
+    if funcs is not None:
+        # Check if all of the rings are in one Polygon ...
+        if partOffsets is None:
+            partOffsets = [0, len(ringOffsets) - 1]
+
+        # Return answer ...
+        return funcs.rasterizerings(
+            nx,
+            ny,
+            ix1,
+            iy1,
+            px,
+            numpy.ascontiguousarray(coords[:, 0], dtype = numpy.float64),
+            numpy.ascontiguousarray(coords[:, 1], dtype = numpy.float64),
+            numpy.asarray(ringOffsets, dtype = numpy.int64),
+            numpy.asarray(partOffsets, dtype = numpy.int64),
+        )                                                                       # [m2]
+
+    # Check if the rings are split up into Polygons ...
+    if partOffsets is not None and len(partOffsets) > 2:
+        # Initialize grid ...
+        grid = numpy.zeros((ny, nx), dtype = numpy.float64)                     # [m2]
+
+        # Loop over Polygons ...
+        for ip in range(len(partOffsets) - 1):
+            # Create short-hands for the rings of this Polygon and skip it if
+            # it does not have any coordinates ...
+            rings = numpy.asarray(ringOffsets[partOffsets[ip]:partOffsets[ip + 1] + 1], dtype = numpy.int64)
+            if rings[-1] == rings[0]:
+                continue
+            xy = coords[rings[0]:rings[-1], :]
+
+            # Find the part of the grid that this Polygon covers and skip it if
+            # it does not cover any of the grid ...
+            jx1 = max(ix1, math.floor(xy[:, 0].min() / px))
+            jx2 = min(ix1 + nx, math.ceil(xy[:, 0].max() / px))
+            jy1 = max(iy1, math.floor(xy[:, 1].min() / px))
+            jy2 = min(iy1 + ny, math.ceil(xy[:, 1].max() / px))
+            if jx2 <= jx1 or jy2 <= jy1:
+                continue
+
+            # Rasterize this Polygon and add it to the grid ...
+            grid[jy1 - iy1:jy2 - iy1, jx1 - ix1:jx2 - ix1] += rasterizeRings(
+                xy,
+                rings - rings[0],
+                ix1 = jx1,
+                iy1 = jy1,
+                 nx = jx2 - jx1,
+                 ny = jy2 - jy1,
+                 px = px,
+            )                                                                   # [m2]
+
+        # Return answer ...
+        return grid
+
+    # Convert the coordinates to pixel units relative to the corner of the
+    # grid ...
+    x = (coords[:, 0] - float(ix1) * px) / px                                   # [px]
+    y = (coords[:, 1] - float(iy1) * px) / px                                   # [px]
+
+    # Find the first point of every edge (which is every point apart from the
+    # last point of every ring) ...
+    first = numpy.ones(x.size, dtype = bool)
+    first[numpy.asarray(ringOffsets[1:], dtype = numpy.int64) - 1] = False
+    first = numpy.flatnonzero(first)
+
+    # Create short-hands for the ends of every edge and skip the horizontal
+    # edges (as they do not contribute anything) ...
+    x0 = x[first]                                                               # [px]
+    y0 = y[first]                                                               # [px]
+    x1 = x[first + 1]                                                           # [px]
+    y1 = y[first + 1]                                                           # [px]
+    keep = y0 != y1
+    x0 = x0[keep]                                                               # [px]
+    y0 = y0[keep]                                                               # [px]
+    x1 = x1[keep]                                                               # [px]
+    y1 = y1[keep]                                                               # [px]
+    nedge = x0.size                                                             # [#]
+
+    # Initialize accumulation grid ...
+    # NOTE: The accumulation grid has two extra columns: the first one catches
+    #       the contributions from the edges that are to the left of the grid
+    #       (which still cover the whole row) and the last one catches the
+    #       contributions from the edges that are to the right of the grid
+    #       (which are thrown away).
+    acc = numpy.zeros(ny * (nx + 2), dtype = numpy.float64)                     # [px2]
+
+    # Check if there are any edges ...
+    if nedge > 0:
+        # Find the first and last grid lines that each edge could cross (an
+        # edge can touch extra grid lines without it making any difference as
+        # the extra pieces have zero length) ...
+        kx1 = numpy.floor(numpy.minimum(x0, x1)).astype(numpy.int64)
+        kx2 = numpy.ceil(numpy.maximum(x0, x1)).astype(numpy.int64)
+        ky1 = numpy.floor(numpy.minimum(y0, y1)).astype(numpy.int64)
+        ky2 = numpy.ceil(numpy.maximum(y0, y1)).astype(numpy.int64)
+        ncx = numpy.where(x0 != x1, kx2 - kx1 + 1, 0)
+        ncy = ky2 - ky1 + 1
+
+        # Find the fraction along each edge where each crossing is ...
+        edge = numpy.repeat(numpy.arange(nedge), ncx)
+        k = kx1[edge] + numpy.arange(edge.size) - numpy.repeat(numpy.cumsum(ncx) - ncx, ncx)
+        tx = (k - x0[edge]) / (x1[edge] - x0[edge])
+        edge = numpy.repeat(numpy.arange(nedge), ncy)
+        k = ky1[edge] + numpy.arange(edge.size) - numpy.repeat(numpy.cumsum(ncy) - ncy, ncy)
+        ty = (k - y0[edge]) / (y1[edge] - y0[edge])
+
+        # Combine the crossings with the ends of each edge, throw away any
+        # crossings that are beyond the ends of each edge and then sort them
+        # along each edge ...
+        edge = numpy.concatenate(
+            [
+                numpy.arange(nedge),
+                numpy.arange(nedge),
+                numpy.repeat(numpy.arange(nedge), ncx),
+                numpy.repeat(numpy.arange(nedge), ncy),
+            ]
+        )
+        t = numpy.concatenate(
+            [
+                numpy.zeros(nedge, dtype = numpy.float64),
+                numpy.ones(nedge, dtype = numpy.float64),
+                tx,
+                ty,
+            ]
+        )
+        keep = (t >= 0.0) & (t <= 1.0)
+        edge = edge[keep]
+        t = t[keep]
+        order = numpy.lexsort((t, edge))
+        edge = edge[order]
+        t = t[order]
+
+        # Find the coordinates of the ends of all of the pieces of all of the
+        # edges ...
+        xp = x0[edge] + t * (x1[edge] - x0[edge])                               # [px]
+        yp = y0[edge] + t * (y1[edge] - y0[edge])                               # [px]
+        xp[t == 1.0] = x1[edge[t == 1.0]]                                       # [px]
+        yp[t == 1.0] = y1[edge[t == 1.0]]                                       # [px]
+
+        # Create short-hands for every piece ...
+        same = edge[1:] == edge[:-1]
+        xa = xp[:-1][same]                                                      # [px]
+        ya = yp[:-1][same]                                                      # [px]
+        xb = xp[1:][same]                                                       # [px]
+        yb = yp[1:][same]                                                       # [px]
+
+        # Find which pixel each piece is in (using its mid-point), how far
+        # across that pixel it is and how tall it is ...
+        xm = 0.5 * (xa + xb)                                                    # [px]
+        ix = numpy.floor(xm).astype(numpy.int64)
+        iy = numpy.floor(0.5 * (ya + yb)).astype(numpy.int64)
+        fx = xm - ix.astype(numpy.float64)                                      # [px]
+        dy = yb - ya                                                            # [px]
+
+        # Throw away the pieces that are above or below the grid and move the
+        # pieces that are to the left or right of the grid into the extra
+        # columns ...
+        keep = (iy >= 0) & (iy < ny) & (dy != 0.0)
+        ix = ix[keep] + 1
+        iy = iy[keep]
+        fx = fx[keep]                                                           # [px]
+        dy = dy[keep]                                                           # [px]
+
+        # Add the contributions to the accumulation grid ...
+        acc += numpy.bincount(
+            iy * (nx + 2) + numpy.clip(ix, 0, nx + 1),
+            minlength = acc.size,
+              weights = dy * (1.0 - fx),
+        )                                                                       # [px2]
+        acc += numpy.bincount(
+            iy * (nx + 2) + numpy.clip(ix + 1, 0, nx + 1),
+            minlength = acc.size,
+              weights = dy * fx,
+        )                                                                       # [px2]
+
+    # Sum the contributions along each row (counter-clockwise rings have
+    # upwards edges on their right-hand side, so the signs need flipping) and
+    # remove any rounding errors ...
+    frac = -numpy.cumsum(acc.reshape((ny, nx + 2)), axis = 1)[:, 1:-1]          # [px2]
+    numpy.place(frac, frac < 1.0e-12, 0.0)                                      # [px2]
+    numpy.place(frac, frac > 1.0, 1.0)                                          # [px2]
+
+    # Return answer ...
+    return frac * px * px
@@ -1,25 +1,82 @@
 #!/usr/bin/env python3
 
 # Define function ...
-def rasterizeShapefile(sfObj, /, *, nx = 1024, ny = 1024, px = 1024.0):
+def rasterizeShapefile(sfObj, /, *, fname = None, maxInFlight = 256, maxPixels = 1048576, maxVertices = 65536, method = None, nx = 1024, ny = 1024, offset = 0, processes = None, px = 1024.0, shared = False, tileSize = None):
     """
     Rasterize a ShapeFile.
 
     Arguments:
-    sfObj -- a shapefile.Reader of a ShapeFile
+    sfObj -- a shapefile.Reader of a ShapeFile, or the name of the directory of
+             a geometry store (see hml.ingestShapefile())
 
     Keyword arguments:
+    fname -- the name of a file to memory-map the global grid to (default None,
+             which means keep the global grid in RAM)
+    maxInFlight -- the maximum number of batches which can be submitted to the
+                   pool of workers before waiting for some of them to finish
+                   (default 256)
+    maxPixels -- split any Polygon whose bounding box has more than this many
+                 pixels into strips and rasterize each strip as a separate job
+                 (default 1048576, or None, which means do not split any
+                 Polygons)
+    maxVertices -- the number of vertices at which a batch of Polygons is
+                   submitted to the pool of workers (default 65536)
+    method -- the method to pass to hml.rasterizePolygon() (default None, which
+              means "analytic" if the FORTRAN module has been compiled and
+              "vectorized" if it has not)
     px -- pixel size (default 1024.0)
     nx -- number of x pixels (default 1024)
     ny -- number of y pixels (default 1024)
+    offset -- the offset (in bytes) of the global grid within "fname" (default
+              0)
+    processes -- the number of workers in the pool (default None, which means
+                 as many as there are CPUs)
+    shared -- keep the global grid in shared memory and have the workers add
+              their answers to it directly (default False)
+    tileSize -- split the grid into tiles of this many pixels square and
+                rasterize each tile separately (default None, which means do
+                not split the grid into tiles)
 
     Note:
     This function only works for ShapeFiles that solely exist in the (positive,
     positive) quadrant.
+
+    The Polygons are sent to a pool of long-lived workers as WKB in batches:
+    small Polygons are grouped together until the batch has "maxVertices"
+    vertices and big Polygons go alone. The results are added to the global
+    grid in the order that they finish (whilst the Polygons are still being
+    submitted) so that the memory usage does not grow with the number of
+    records in the ShapeFile. Splitting the biggest Polygons into strips (see
+    hml.splitPolygon()) stops a single huge Polygon from keeping one worker
+    busy long after all of the others have finished. If "shared" is True then
+    the workers add their answers straight into the global grid (locking one
+    band of 64 rows at a time), no answers are sent back and the parent only
+    schedules the work.
+
+    If "tileSize" is set then all of the Polygons are loaded into a
+    shapely.STRtree and each tile which contains some data is sent, along with
+    the Polygons that touch it, to a worker as a single job (see
+    hml.rasterizeTile()). The tiles do not overlap, so there are no conflicts
+    when adding them to the global grid, and empty tiles are skipped entirely.
+    "maxPixels" and "maxVertices" are ignored when using tiles.
+
+    If "fname" is set then the global grid is a numpy.memmap of that file
+    (which is created if it does not exist or zeroed if it does, in which case
+    it must be at least "offset" + 4 * nx * ny bytes long) and it is flushed
+    once every job has been added to it. The operating system writes the pages
+    of the file back whenever it needs to, so the global grid can be bigger
+    than the RAM. If "shared" is True as well then the workers memory-map the
+    file too instead of using shared memory. The returned global grid is the
+    numpy.memmap.
     """
 
     # Import standard modules ...
+    import functools
+    import itertools
     import multiprocessing
+    import multiprocessing.shared_memory
+    import os
+    import queue
 
     # Import special modules ...
     try:
@@ -32,81 +89,238 @@ def rasterizeShapefile(sfObj, /, *, nx = 1024, ny = 1024, px = 1024.0):
         raise Exception("\"shapefile\" is not installed; run \"pip install --user pyshp\"") from None
     try:
         import shapely
-        import shapely.geometry
-        import shapely.validation
     except:
         raise Exception("\"shapely\" is not installed; run \"pip install --user Shapely\"") from None
 
     # Import sub-functions ...
-    from .rasterizePolygon import rasterizePolygon
+    from .attachSharedGrid import attachSharedGrid
+    from .iterPolygons import iterPolygons
+    from .rasterizePolygons import rasterizePolygons
+    from .rasterizeTile import rasterizeTile
+    from .splitPolygon import splitPolygon
 
     # Check argument ...
-    if not isinstance(sfObj, shapefile.Reader):
-        raise TypeError("\"sfObj\" is not a shapefile.Reader")
-
-    # Initialize counter and global grid ...
-    n = 0                                                                       # [#]
-    globalGrid = numpy.zeros((ny, nx), dtype = numpy.float32)                   # [m2]
-
-    # Create a pool of workers ...
-    with multiprocessing.Pool(maxtasksperchild = 1) as pObj:
-        # Initialize list ...
-        results = []
-
-        # Loop over shape+record pairs ...
-        for shapeRecord in sfObj.iterShapeRecords():
-            # Crash if this shape+record is not a shapefile polygon ...
-            if shapeRecord.shape.shapeType != shapefile.POLYGON:
-                raise Exception("\"shape\" is not a POLYGON") from None
-
-            # Convert shapefile.Shape to shapely.geometry.polygon.Polygon or
-            # shapely.geometry.multipolygon.MultiPolygon ...
-            poly = shapely.geometry.shape(shapeRecord.shape)
-            if not poly.is_valid:
-                print(f"WARNING: Skipping a shape as it is not valid ({shapely.validation.explain_validity(poly)}).")
-                n += 1                                                          # [#]
-                continue
-            if poly.is_empty:
-                n += 1                                                          # [#]
-                continue
-
-            # Add rasterization job to worker pool ...
-            results.append(
-                pObj.apply_async(
-                    rasterizePolygon,
-                    (poly,),
-                    {
-                        "px" : px,
-                    },
+    if not isinstance(sfObj, (shapefile.Reader, str)):
+        raise TypeError("\"sfObj\" is not a shapefile.Reader or a str")
+
+    # Check if a method was chosen ...
+    if method is None:
+        # Use the FORTRAN module if it has been compiled ...
+        try:
+            from .f90 import funcs
+        except:
+            funcs = None
+        method = "vectorized" if funcs is None else "analytic"
+
+    # Initialize counters, batch, queue and shared memory ...
+    nInFlight = 0                                                               # [#]
+    nVertices = 0                                                               # [#]
+    batch = []
+    finished = queue.SimpleQueue()
+    shm = None
+
+    # Check if the global grid should be in a file ...
+    if fname is not None:
+        # Create global grid ...
+        globalGrid = numpy.memmap(
+            fname,
+             dtype = numpy.float32,
+              mode = "r+" if os.path.exists(fname) else "w+",
+            offset = offset,
+             shape = (ny, nx),
+        )                                                                       # [m2]
+
+        # Loop over bands of rows and zero them ...
+        # NOTE: This is done in bands so that an existing file does not have to
+        #       be loaded into RAM in one go.
+        for iy in range(0, ny, 256):
+            globalGrid[iy:iy + 256, :] = 0.0                                    # [m2]
+        globalGrid.flush()
+
+    # Catch errors so that the shared memory is always released ...
+    try:
+        # Check if the global grid should be in shared memory ...
+        if shared:
+            # Create a lock for every band of rows ...
+            nrow = 64                                                           # [#]
+            locks = [multiprocessing.Lock() for _ in range((ny + nrow - 1) // nrow)]
+
+            # Check if the global grid is in a file ...
+            if fname is not None:
+                # Create a function which attaches the workers to the file ...
+                initializer = functools.partial(
+                    attachSharedGrid,
+                     fname = fname,
+                    offset = offset,
                 )
+            else:
+                # Create shared memory and the global grid ...
+                shm = multiprocessing.shared_memory.SharedMemory(create = True, size = ny * nx * numpy.dtype(numpy.float32).itemsize)
+                globalGrid = numpy.ndarray((ny, nx), dtype = numpy.float32, buffer = shm.buf) # [m2]
+                globalGrid[:, :] = 0.0                                          # [m2]
+
+                # Create a function which attaches the workers to the shared
+                # memory ...
+                initializer = attachSharedGrid
+
+            # Create a pool of workers which are attached to the global grid ...
+            pObj = multiprocessing.Pool(
+                    processes = processes,
+                  initializer = initializer,
+                     initargs = (None if shm is None else shm.name, ny, nx, locks, nrow),
             )
+        else:
+            # Create global grid (if it is not in a file) and a pool of
+            # workers ...
+            if fname is None:
+                globalGrid = numpy.zeros((ny, nx), dtype = numpy.float32)       # [m2]
+            pObj = multiprocessing.Pool(processes = processes)
+
+        # Create short-hand for the keyword arguments of the jobs ...
+        kwds = {
+            "method" : method,
+                "px" : px,
+            "shared" : shared,
+        }
+
+        # Check if the grid should be split into tiles ...
+        if tileSize is not None:
+            # Load all of the valid [Multi]Polygons, serialize them and make a
+            # spatial index of them ...
+            polys = list(iterPolygons(sfObj))
+            wkbs = shapely.to_wkb(polys)
+            tree = shapely.STRtree(polys)
+
+            # Make a generator of the indices of the lower-left pixel of each
+            # tile ...
+            items = ((ix1, iy1) for iy1 in range(0, ny, tileSize) for ix1 in range(0, nx, tileSize))
+        else:
+            # Make a generator of the valid [Multi]Polygons ...
+            items = iterPolygons(sfObj)
+
+        # Use the pool of workers ...
+        with pObj:
+            # Loop over items (with an extra pass at the end to submit the last
+            # batch and to wait for all of the results) ...
+            for item in itertools.chain(items, [None]):
+                # Initialize list ...
+                jobs = []
+
+                # Check if this is a real item ...
+                if item is not None:
+                    # Check if the grid should be split into tiles ...
+                    if tileSize is not None:
+                        # Create short-hands ...
+                        ix1, iy1 = item
+                        tnx = min(tileSize, nx - ix1)
+                        tny = min(tileSize, ny - iy1)
+
+                        # Find the [Multi]Polygons that touch this tile and skip
+                        # this tile if there are none ...
+                        idx = tree.query(
+                            shapely.box(
+                                float(ix1) * px,
+                                float(iy1) * px,
+                                float(ix1 + tnx) * px,
+                                float(iy1 + tny) * px,
+                            ),
+                            predicate = "intersects",
+                        )
+                        if idx.size == 0:
+                            continue
+
+                        # Add tile to the list of jobs ...
+                        jobs.append((rasterizeTile, (list(wkbs[numpy.sort(idx)]), ix1, iy1, tnx, tny)))
+                    else:
+                        # Split this [Multi]Polygon into strips if it is too
+                        # big ...
+                        if maxPixels is None:
+                            strips = [item]
+                        else:
+                            strips = splitPolygon(
+                                item,
+                                maxPixels = maxPixels,
+                                       px = px,
+                            )
+
+                        # Check if this [Multi]Polygon was split ...
+                        if len(strips) > 1:
+                            # Add each strip to the list of jobs on its own ...
+                            for strip in strips:
+                                jobs.append((rasterizePolygons, ([shapely.to_wkb(strip)],)))
+                        else:
+                            # Submit the current batch first if this
+                            # [Multi]Polygon would make it too big (so that big
+                            # [Multi]Polygons go alone) ...
+                            if batch and nVertices + shapely.get_num_coordinates(item) > maxVertices:
+                                jobs.append((rasterizePolygons, (batch,)))
+                                nVertices = 0                                   # [#]
+                                batch = []
+
+                            # Add [Multi]Polygon to the batch ...
+                            batch.append(shapely.to_wkb(item))
+                            nVertices += shapely.get_num_coordinates(item)      # [#]
+
+                # Submit the batch if it is big enough or if there are no more
+                # items ...
+                if batch and (nVertices >= maxVertices or item is None):
+                    jobs.append((rasterizePolygons, (batch,)))
+                    nVertices = 0                                               # [#]
+                    batch = []
+
+                # Loop over jobs ...
+                for func, args in jobs:
+                    # Add rasterization job to worker pool (which will put the
+                    # results in the queue when it has finished) ...
+                    pObj.apply_async(
+                        func,
+                        args,
+                        kwds,
+                              callback = finished.put,
+                        error_callback = finished.put,
+                    )
+                    nInFlight += 1                                              # [#]
+
+                # Loop over results which have already finished (waiting for one
+                # if there are too many jobs in flight or if there are no more
+                # items) ...
+                while nInFlight >= maxInFlight or not finished.empty() or (item is None and nInFlight > 0):
+                    # Get results ...
+                    results = finished.get()
+                    nInFlight -= 1                                              # [#]
+
+                    # Check results ...
+                    if isinstance(results, BaseException):
+                        raise Exception("\"multiprocessing.Pool().apply_async()\" was not successful") from results
+
+                    # Loop over results ...
+                    for ix1, iy1, localGrid in results:
+                        # Add local grid to global grid ...
+                        globalGrid[iy1:iy1 + localGrid.shape[0], ix1:ix1 + localGrid.shape[1]] += localGrid # [m2]
+
+            # Close the pool of worker processes and wait for all of the tasks
+            # to finish ...
+            # NOTE: The "__exit__()" call of the context manager for
+            #       "multiprocessing.Pool()" calls "terminate()" instead of
+            #       "join()", so I must manage the end of the pool of worker
+            #       processes myself.
+            pObj.close()
+            pObj.join()
 
-        print(f"INFO: {n:,d} records were skipped because they were invalid")
-
-        # Loop over results ...
-        for result in results:
-            # Get result ...
-            ix1, iy1, localGrid = result.get()
-
-            # Check result ...
-            if not result.successful():
-                raise Exception("\"multiprocessing.Pool().apply_async()\" was not successful") from None
-
-            # Loop over x-axis ...
-            for ix in range(localGrid.shape[1]):
-                # Loop over y-axis ...
-                for iy in range(localGrid.shape[0]):
-                    # Add local grid to global grid ...
-                    globalGrid[iy1 + iy, ix1 + ix] += localGrid[iy, ix]         # [m2]
-
-        # Close the pool of worker processes and wait for all of the tasks to
-        # finish ...
-        # NOTE: The "__exit__()" call of the context manager for
-        #       "multiprocessing.Pool()" calls "terminate()" instead of
-        #       "join()", so I must manage the end of the pool of worker
-        #       processes myself.
-        pObj.close()
-        pObj.join()
+        # Flush the global grid to the file (if it is in one) ...
+        if fname is not None:
+            globalGrid.flush()
+    finally:
+        # Check if the global grid is in shared memory ...
+        if shm is not None:
+            # Release the shared memory (so that it is freed as soon as it is
+            # closed, even if something went wrong), copy the global grid out
+            # of it and then close it ...
+            # NOTE: The global grid must be copied before the shared memory is
+            #       closed because it is a view of it.
+            shm.unlink()
+            globalGrid = globalGrid.copy()                                      # [m2]
+            shm.close()
 
     # Return answer ...
     return globalGrid
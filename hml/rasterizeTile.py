@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def rasterizeTile(wkbs, ix1, iy1, nx, ny, /, *, method = "vectorized", px = 1024.0, shared = False):
+    """
+    Rasterize the parts of a batch of [Multi]Polygons that are within a tile.
+
+    Arguments:
+    wkbs -- a list of shapely.geometry.[multi]polygon.[Multi]Polygons which
+            have been serialized as WKB
+    ix1 -- the x index of the leftmost pixel of the tile
+    iy1 -- the y index of the lowermost pixel of the tile
+    nx -- number of x pixels in the tile
+    ny -- number of y pixels in the tile
+
+    Keyword arguments:
+    method -- the method to pass to hml.rasterizePolygon() (default "vectorized")
+    px -- pixel size (default 1024.0)
+    shared -- add the answer directly to the global grid in shared memory (see
+              hml.attachSharedGrid()) rather than returning it (default False)
+
+    Note:
+    This function only works for [Multi]Polygons that solely exist in the
+    (positive, positive) quadrant.
+
+    This function returns a list containing a single (ix1, iy1, tileGrid) tuple
+    (in the same style as hml.rasterizePolygons()), which is empty if "shared"
+    is True. As tiles never overlap, no locks are needed to add a tile to the
+    global grid in shared memory. If "method" is "analytic" then all of the
+    Polygons in the tile are rasterized in a single call to
+    hml.rasterizeRings() (which shares them out between threads if the FORTRAN
+    module has been compiled).
+    """
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+    try:
+        import shapely
+        import shapely.geometry
+    except:
+        raise Exception("\"shapely\" is not installed; run \"pip install --user Shapely\"") from None
+
+    # Import sub-functions ...
+    from .attachSharedGrid import sharedGrid
+    from .rasterizePolygon import rasterizePolygon
+    from .rasterizeRings import rasterizeRings
+
+    # Initialize tile grid and create a polygon of the tile ...
+    tileGrid = numpy.zeros((ny, nx), dtype = numpy.float32)                     # [m2]
+    tile = shapely.box(
+        float(ix1) * px,
+        float(iy1) * px,
+        float(ix1 + nx) * px,
+        float(iy1 + ny) * px,
+    )
+
+    # Check which method should be used ...
+    if method == "analytic":
+        # Find the intersection of all of the [Multi]Polygons with the tile and
+        # only keep the Polygons ...
+        parts = shapely.get_parts(shapely.intersection(shapely.from_wkb(wkbs), tile))
+        parts = parts[(shapely.get_type_id(parts) == shapely.GeometryType.POLYGON) & ~shapely.is_empty(parts)]
+
+        # Check if there are any Polygons ...
+        if parts.size > 0:
+            # Orient all of the Polygons so that their exteriors are
+            # counter-clockwise and their interiors are clockwise, find the
+            # coordinates of all of their rings and rasterize them all in one
+            # go ...
+            coords, offsets = shapely.to_ragged_array(
+                [shapely.geometry.polygon.orient(part, sign = 1.0) for part in parts]
+            )[1:]
+            tileGrid += rasterizeRings(
+                coords,
+                offsets[0],
+                        ix1 = ix1,
+                        iy1 = iy1,
+                         nx = nx,
+                         ny = ny,
+                partOffsets = offsets[1],
+                         px = px,
+            )                                                                   # [m2]
+    else:
+        # Loop over [Multi]Polygons ...
+        for poly in shapely.from_wkb(wkbs):
+            # Find the intersection of the [Multi]Polygon with the tile and
+            # only keep the Polygons (the intersection can also contain Points
+            # and LineStrings where the [Multi]Polygon touches the edge of the
+            # tile) ...
+            parts = shapely.get_parts(shapely.intersection(poly, tile))
+            parts = parts[(shapely.get_type_id(parts) == shapely.GeometryType.POLYGON) & ~shapely.is_empty(parts)]
+            if parts.size == 0:
+                continue
+
+            # Rasterize the part of the [Multi]Polygon that is within the tile
+            # and add it to the tile grid ...
+            jx1, jy1, localGrid = rasterizePolygon(
+                shapely.geometry.multipolygon.MultiPolygon(list(parts)),
+                method = method,
+                    px = px,
+            )
+            tileGrid[jy1 - iy1:jy1 - iy1 + localGrid.shape[0], jx1 - ix1:jx1 - ix1 + localGrid.shape[1]] += localGrid # [m2]
+
+    # Check if the answer should be returned ...
+    if not shared:
+        # Return answer ...
+        return [(ix1, iy1, tileGrid)]
+
+    # Add tile grid to global grid ...
+    sharedGrid["grid"][iy1:iy1 + ny, ix1:ix1 + nx] += tileGrid                  # [m2]
+
+    # Return answer ...
+    return []
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def saveRaster(fname, grid, /, *, compression = "zlib", crs = None, level = 6, px = 1024.0, tileSize = 256, x0 = 0.0, y0 = 0.0):
+    """
+    Save a grid as a raster container.
+
+    Arguments:
+    fname -- the name of the raster container
+    grid -- the (ny, nx) grid (which can be a numpy.memmap)
+
+    Keyword arguments:
+    compression -- the compression to use, either "none" or "zlib" (default
+                   "zlib")
+    crs -- the coordinate reference system of the raster, e.g. "EPSG:27700"
+           (default None)
+    level -- the zlib compression level (default 6)
+    px -- pixel size (default 1024.0)
+    tileSize -- the size of the (square) tiles when compressing (default 256)
+    x0 -- the x position of the left-hand side of the raster (default 0.0)
+    y0 -- the y position of the bottom of the raster (default 0.0)
+
+    Note:
+    See hml.createRaster() for a description of the raster container. When
+    compressing, the grid is split into tiles which are compressed one at a
+    time and stored one after the other; the header contains the offset
+    (relative to the start of the data) and the length of every tile, in
+    row-major order, so that a window can be read by only decompressing the
+    tiles that overlap it (see hml.loadRaster()). The grid is only read one
+    tile (or one band of rows) at a time and each tile is written as soon as it
+    has been compressed, so neither the grid nor the compressed tiles need to
+    fit in RAM. Room for the header is reserved before the tiles are written
+    (assuming that every tile is as long as zlib could possibly make it) and
+    the header is written once the offset and length of every tile is known.
+    The raster container is written to a temporary file first and then
+    renamed.
+    """
+
+    # Import standard modules ...
+    import json
+    import os
+    import zlib
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+    # Import sub-functions ...
+    from .createRaster import createRaster
+    from .loadRaster import loadRaster
+
+    # Create short-hands ...
+    ny, nx = grid.shape
+
+    # Check which compression should be used ...
+    if compression == "none":
+        # Create an empty raster container and memory-map it ...
+        createRaster(
+            f"{fname}.tmp",
+            nx,
+            ny,
+              crs = crs,
+            dtype = grid.dtype,
+               px = px,
+               x0 = x0,
+               y0 = y0,
+        )
+        data = loadRaster(f"{fname}.tmp", mode = "r+")
+
+        # Loop over bands of rows and copy them ...
+        for iy in range(0, ny, 256):
+            data[iy:iy + 256, :] = grid[iy:iy + 256, :]
+        data.flush()
+        del data
+    elif compression == "zlib":
+        # Find the number of tiles and the longest that a compressed tile could
+        # possibly be ...
+        # NOTE: zlib adds at most 5 bytes per 16 KiB block of incompressible
+        #       data plus 6 bytes for its header and checksum.
+        ntiles = ((ny + tileSize - 1) // tileSize) * ((nx + tileSize - 1) // tileSize) # [#]
+        n = tileSize * tileSize * grid.dtype.itemsize                           # [B]
+        maxLength = n + 5 * (n // 16384 + 1) + 6                                # [B]
+
+        # Create header (with the largest possible offset and length for every
+        # tile, so that there is enough room for the real ones) ...
+        header = {
+            "compression" : "zlib",
+                    "crs" : crs,
+             "dataOffset" : 0,
+                  "dtype" : grid.dtype.str,
+                     "px" : float(px),                                          # [m]
+                  "shape" : [ny, nx],
+              "tileShape" : [tileSize, tileSize],
+                  "tiles" : [[ntiles * maxLength, maxLength]] * ntiles,
+                "version" : 1,
+                     "x0" : float(x0),                                          # [m]
+                     "y0" : float(y0),                                          # [m]
+        }
+
+        # Find the offset of the data (leaving room for the digits of the
+        # offset itself in the header) ...
+        header["dataOffset"] = 4096 * ((16 + len(json.dumps(header)) + 20 + 4095) // 4096)
+
+        # Find the length of the reserved header ...
+        headerLength = len(json.dumps(header).encode("utf-8"))                  # [B]
+
+        # Open the temporary raster container ...
+        with open(f"{fname}.tmp", "wb") as fObj:
+            # Initialize list ...
+            header["tiles"] = []
+
+            # Loop over tiles, compress them and write them ...
+            fObj.seek(header["dataOffset"])
+            offset = 0                                                          # [B]
+            for iy in range(0, ny, tileSize):
+                for ix in range(0, nx, tileSize):
+                    chunk = zlib.compress(
+                        numpy.ascontiguousarray(grid[iy:iy + tileSize, ix:ix + tileSize]).tobytes(),
+                        level = level,
+                    )
+                    fObj.write(chunk)
+                    header["tiles"].append([offset, len(chunk)])
+                    offset += len(chunk)                                        # [B]
+
+            # Write the header into the reserved room at the start (padding it
+            # with spaces, which JSON ignores, so that its length is the same as
+            # the reserved header) ...
+            text = json.dumps(header).encode("utf-8").ljust(headerLength)
+            fObj.seek(0)
+            fObj.write(b"HMLRAST1")
+            fObj.write(len(text).to_bytes(8, byteorder = "little"))
+            fObj.write(text)
+    else:
+        raise ValueError(f"\"compression\" is an unexpected value ({repr(compression)})") from None
+
+    # Rename the raster container ...
+    os.replace(f"{fname}.tmp", fname)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def serveRaster(fname, /, *, host = "127.0.0.1", method = "pyramid", path = None, port = 8080):
+    """
+    Serve queries of how much of a raster is within circles around points.
+
+    Arguments:
+    fname -- the name of the raster container
+
+    Keyword arguments:
+    host -- the host to listen on (default "127.0.0.1")
+    method -- the method to pass to hml.sumImageWithinCircle() (default
+              "pyramid")
+    path -- the path of the Unix socket to listen on (default None, which means
+            listen on "host" and "port" instead)
+    port -- the port to listen on (default 8080)
+
+    Note:
+    This function loads the raster container once (which, if it is not
+    compressed, only memory-maps it) and makes the pyramid of block sums of the
+    raster once (see hml.makePyramid(), which requires that none of the pixels
+    are negative), so that they are ready for every query. It then serves HTTP
+    requests (see hml.handleRasterConnection() and hml.queryRaster()) using
+    asyncio until it is interrupted. For example:
+
+        curl "http://127.0.0.1:8080/?easting=530000&northing=180000&radius=2000"
+        curl --unix-socket hml.sock --data '{"queries" : [...]}' http://localhost/
+
+    Queries by latitude and longitude are only allowed if the raster container
+    has a coordinate reference system and if "cartopy" is installed.
+    """
+
+    # Import standard modules ...
+    import asyncio
+    import functools
+
+    # Import sub-functions ...
+    from .handleRasterConnection import handleRasterConnection
+    from .loadRaster import loadRaster
+    from .loadRasterHeader import loadRasterHeader
+    from .makePyramid import makePyramid
+
+    # Load the raster container ...
+    header = loadRasterHeader(fname)
+    grid = loadRaster(fname)
+
+    # Make the pyramid of block sums (if it is needed) ...
+    pyramid = makePyramid(grid) if method == "pyramid" else None
+
+    # Find the coordinate reference system (if it is possible) ...
+    crs = None
+    if header["crs"] is not None:
+        try:
+            import cartopy
+            import cartopy.crs
+            crs = cartopy.crs.CRS(header["crs"])
+        except:
+            pass
+
+    # Create the callback for each connection ...
+    callback = functools.partial(
+        handleRasterConnection,
+        grid,
+        header,
+            crs = crs,
+         method = method,
+        pyramid = pyramid,
+    )
+
+    # Create event loop ...
+    loop = asyncio.new_event_loop()
+
+    # Serve requests until interrupted ...
+    try:
+        if path is None:
+            server = loop.run_until_complete(asyncio.start_server(callback, host = host, port = port))
+        else:
+            server = loop.run_until_complete(asyncio.start_unix_server(callback, path = path))
+        loop.run_until_complete(server.serve_forever())
+    finally:
+        loop.close()
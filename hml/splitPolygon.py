@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def splitPolygon(poly, /, *, maxPixels = 1048576, px = 1024.0):
+    """
+    Split a [Multi]Polygon into grid-aligned strips.
+
+    Arguments:
+    poly -- a shapely.geometry.[multi]polygon.[Multi]Polygon
+
+    Keyword arguments:
+    maxPixels -- the maximum number of pixels in the bounding box of each strip
+                 (default 1048576)
+    px -- pixel size (default 1024.0)
+
+    Note:
+    This function only works for [Multi]Polygons that solely exist in the
+    (positive, positive) quadrant.
+
+    This function returns a list of [Multi]Polygons. If the bounding box of the
+    [Multi]Polygon has no more than "maxPixels" pixels then the list just
+    contains the [Multi]Polygon. Otherwise, the [Multi]Polygon is cut into
+    strips along its longest axis, each of which is a whole number of pixels
+    wide, so the rasters of the strips add up to the raster of the
+    [Multi]Polygon.
+    """
+
+    # Import standard modules ...
+    import math
+
+    # Import special modules ...
+    try:
+        import shapely
+        import shapely.geometry
+    except:
+        raise Exception("\"shapely\" is not installed; run \"pip install --user Shapely\"") from None
+
+    # Check argument ...
+    if not isinstance(poly, shapely.geometry.polygon.Polygon):
+        if not isinstance(poly, shapely.geometry.multipolygon.MultiPolygon):
+            raise TypeError("\"poly\" is not a shapely.geometry.[multi]polygon.[Multi]Polygon")
+
+    # Find bounding pixel indices in the global grid ...
+    ix1 = math.floor(poly.bounds[0] / px)
+    iy1 = math.floor(poly.bounds[1] / px)
+    ix2 = math.ceil(poly.bounds[2] / px)
+    iy2 = math.ceil(poly.bounds[3] / px)
+
+    # Find extent of the local grid ...
+    nx = ix2 - ix1
+    ny = iy2 - iy1
+
+    # Return answer if it is small enough ...
+    if nx * ny <= maxPixels:
+        return [poly]
+
+    # Initialize list ...
+    strips = []
+
+    # Check which axis is the longest ...
+    if nx >= ny:
+        # Find how wide each column can be and make the columns ...
+        n = max(1, maxPixels // ny)
+        boxes = [shapely.box(float(ix) * px, float(iy1) * px, float(min(ix + n, ix2)) * px, float(iy2) * px) for ix in range(ix1, ix2, n)]
+    else:
+        # Find how tall each row can be and make the rows ...
+        n = max(1, maxPixels // nx)
+        boxes = [shapely.box(float(ix1) * px, float(iy) * px, float(ix2) * px, float(min(iy + n, iy2)) * px) for iy in range(iy1, iy2, n)]
+
+    # Loop over boxes ...
+    for box in boxes:
+        # Find the intersection of the [Multi]Polygon with the box and only keep
+        # the Polygons (the intersection can also contain Points and
+        # LineStrings where the [Multi]Polygon touches the edge of the box) ...
+        parts = shapely.get_parts(shapely.intersection(poly, box))
+        parts = parts[(shapely.get_type_id(parts) == shapely.GeometryType.POLYGON) & ~shapely.is_empty(parts)]
+        if parts.size == 0:
+            continue
+
+        # Append strip to list ...
+        if parts.size == 1:
+            strips.append(parts[0])
+        else:
+            strips.append(shapely.geometry.multipolygon.MultiPolygon(list(parts)))
+
+    # Return answer ...
+    return strips
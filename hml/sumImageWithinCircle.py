@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 # Define function ...
-def sumImageWithinCircle(img, xmin, xmax, ymin, ymax, r, /, *, cx = 0.0, cy = 0.0, ndiv = 16):
+def sumImageWithinCircle(img, xmin, xmax, ymin, ymax, r, /, *, cacheDir = None, cx = 0.0, cy = 0.0, method = None, ndiv = 0, nq = 64, pyramid = None, sat = None):
     """
     Sum the pixel values on an image that are within a hard circular mask.
 
@@ -14,65 +14,138 @@ def sumImageWithinCircle(img, xmin, xmax, ymin, ymax, r, /, *, cx = 0.0, cy = 0.
     r -- radius of circle
 
     Keyword arguments:
+    cacheDir -- the directory to store kernels in, if the method is "kernel"
+                (default None, which means only cache them in RAM)
     cx -- x position of centre of circle (default 0.0)
     cy -- y position of centre of circle (default 0.0)
-    ndiv -- number sub-divisions (default 16)
+    method -- the method to use, either "fortran", "kernel", "loop", "pyramid"
+              or "vectorized" (default None, which means "fortran" if the
+              FORTRAN module has been compiled and "vectorized" if it has not)
+    ndiv -- number sub-divisions (default 0, which means find the exact
+            fractions)
+    nq -- the number of steps across a pixel to round the offsets of the centre
+          of the circle to, if the method is "kernel" (default 64, or 0, which
+          means do not round them)
+    pyramid -- the pyramid of block sums of the image, if the method is
+               "pyramid" (default None, which means make it)
+    sat -- the summed-area table of the image, if the method is "fortran" or
+           "vectorized" (default None, which means visit every pixel of the
+           image within the bounding box of the circle)
 
     Note:
-    This function is crying out for FORTRAN+OpenMP.
+    This function passes its arguments on to the function for the method:
+    hml.sumImageWithinCircleFortran(), hml.sumImageWithinCircleKernel(),
+    hml.sumImageWithinCircleLoop(), hml.sumImageWithinCirclePyramid() or
+    hml.sumImageWithinCircleVectorized() (or hml.sumImageWithinCircleSAT() if
+    the method is "vectorized" and the summed-area table of the image is
+    passed). See those functions for a description of each method. All of the
+    methods return the same answers, apart from the "kernel" method, which
+    moves the centre of the circle slightly unless "nq" is 0.
     """
 
-    # Import special modules ...
-    try:
-        import numpy
-    except:
-        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
-
     # Import sub-functions ...
-    from .findFractionOfPixelWithinCircle import findFractionOfPixelWithinCircle
-
-    # Create nodes relative to the centre of the circle ...
-    xaxis = numpy.linspace(xmin, xmax, num = img.shape[1] + 1) - cx
-    yaxis = numpy.linspace(ymin, ymax, num = img.shape[0] + 1) - cy
-
-    # Find out the distance of each node to the centre of the circle ...
-    dist = numpy.zeros((yaxis.size, xaxis.size), dtype = numpy.float64)
-    for ix in range(xaxis.size):
-        for iy in range(yaxis.size):
-            dist[iy, ix] = numpy.hypot(xaxis[ix], yaxis[iy])
-
-    # Initialize total ...
-    tot = 0.0
+    from .sumImageWithinCircleFortran import sumImageWithinCircleFortran
+    from .sumImageWithinCircleKernel import sumImageWithinCircleKernel
+    from .sumImageWithinCircleLoop import sumImageWithinCircleLoop
+    from .sumImageWithinCirclePyramid import sumImageWithinCirclePyramid
+    from .sumImageWithinCircleSAT import sumImageWithinCircleSAT
+    from .sumImageWithinCircleVectorized import sumImageWithinCircleVectorized
 
-    # Loop over x-axis ...
-    for ix in range(img.shape[1]):
-        # Loop over y-axis ...
-        for iy in range(img.shape[0]):
-            # Skip this pixel if it is empty ...
-            if img[iy, ix] == 0.0:
-                continue
+    # Check if a method was chosen ...
+    if method is None:
+        # Use the FORTRAN module if it has been compiled ...
+        try:
+            from .f90 import funcs
+        except:
+            funcs = None
+        method = "vectorized" if funcs is None else "fortran"
 
-            # Skip this pixel if it is all outside of the circle ...
-            if numpy.all(dist[iy:iy + 2, ix:ix + 2] >= r):
-                continue
+    # Check which method the user wants ...
+    if method == "fortran":
+        # Return answer ...
+        return sumImageWithinCircleFortran(
+            img,
+            xmin,
+            xmax,
+            ymin,
+            ymax,
+            r,
+              cx = cx,
+              cy = cy,
+            ndiv = ndiv,
+             sat = sat,
+        )
+    if method == "kernel":
+        # Return answer ...
+        return sumImageWithinCircleKernel(
+            img,
+            xmin,
+            xmax,
+            ymin,
+            ymax,
+            r,
+            cacheDir = cacheDir,
+                  cx = cx,
+                  cy = cy,
+                ndiv = ndiv,
+                  nq = nq,
+        )
+    if method == "loop":
+        # Return answer ...
+        return sumImageWithinCircleLoop(
+            img,
+            xmin,
+            xmax,
+            ymin,
+            ymax,
+            r,
+              cx = cx,
+              cy = cy,
+            ndiv = ndiv,
+        )
+    if method == "pyramid":
+        # Return answer ...
+        return sumImageWithinCirclePyramid(
+            img,
+            xmin,
+            xmax,
+            ymin,
+            ymax,
+            r,
+                 cx = cx,
+                 cy = cy,
+               ndiv = ndiv,
+            pyramid = pyramid,
+        )
+    if method == "vectorized":
+        # Check if a summed-area table was passed ...
+        if sat is not None:
+            # Return answer ...
+            return sumImageWithinCircleSAT(
+                img,
+                sat,
+                xmin,
+                xmax,
+                ymin,
+                ymax,
+                r,
+                  cx = cx,
+                  cy = cy,
+                ndiv = ndiv,
+            )
 
-            # Check if this pixel is entirely within the circle or if it
-            # straddles the circumference ...
-            if numpy.all(dist[iy:iy + 2, ix:ix + 2] <= r):
-                # Add all of the value to total ...
-                tot += img[iy, ix]
-            else:
-                # Add part of the value to total ...
-                tot += img[iy, ix] * findFractionOfPixelWithinCircle(
-                    xaxis[ix],
-                    xaxis[ix + 1],
-                    yaxis[iy],
-                    yaxis[iy + 1],
-                    r,
-                      cx = 0.0,
-                      cy = 0.0,
-                    ndiv = ndiv,
-                )
+        # Return answer ...
+        return sumImageWithinCircleVectorized(
+            img,
+            xmin,
+            xmax,
+            ymin,
+            ymax,
+            r,
+              cx = cx,
+              cy = cy,
+            ndiv = ndiv,
+        )
 
-    # Return answer ...
-    return tot
+    # Crash ...
+    raise ValueError(f"\"method\" is an unexpected value ({repr(method)})") from None
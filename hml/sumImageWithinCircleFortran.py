@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def sumImageWithinCircleFortran(img, xmin, xmax, ymin, ymax, r, /, *, cx = 0.0, cy = 0.0, ndiv = 0, sat = None):
+    """
+    Sum the pixel values on an image that are within a hard circular mask using
+    the FORTRAN module.
+
+    Arguments:
+    img -- 2D image with axes (ny, nx)
+    xmin -- left edge of leftmost pixel
+    xmax -- right edge of rightmost pixel
+    ymin -- lower edge of lowermost pixel
+    ymax -- upper edge of uppermost pixel
+    r -- radius of circle
+
+    Keyword arguments:
+    cx -- x position of centre of circle (default 0.0)
+    cy -- y position of centre of circle (default 0.0)
+    ndiv -- number sub-divisions (default 0, which means find the exact
+            fractions)
+    sat -- the summed-area table of the image (default None, which means visit
+           every pixel of the image within the bounding box of the circle)
+
+    Note:
+    This function is the "fortran" method of hml.sumImageWithinCircle(). If
+    the summed-area table of the image is not passed then it passes the part
+    of the image within the bounding box of the circle to
+    hml.f90.funcs.sumimagewithincircle(). If it is passed (see
+    hml.makeSummedAreaTable()) then it passes the whole image and the whole
+    summed-area table to hml.f90.funcs.sumimagewithincirclesat(), so they
+    should both be FORTRAN-ordered float64 arrays to avoid them being copied
+    on every call.
+    """
+
+    # Import standard modules ...
+    import math
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+    # Import sub-functions ...
+    try:
+        from .f90 import funcs
+    except:
+        raise Exception("the FORTRAN module has not been compiled; run \"make -r -C hml/f90\"") from None
+
+    # Check if a summed-area table was passed ...
+    if sat is not None:
+        # Return answer ...
+        return funcs.sumimagewithincirclesat(
+            ndiv = ndiv,
+            xmin = xmin,
+            xmax = xmax,
+            ymin = ymin,
+            ymax = ymax,
+               r = r,
+              cx = cx,
+              cy = cy,
+             img = numpy.asfortranarray(img, dtype = numpy.float64),
+             sat = numpy.asfortranarray(sat, dtype = numpy.float64),
+        )
+
+    # Create short-hands ...
+    nx = img.shape[1]                                                           # [#]
+    ny = img.shape[0]                                                           # [#]
+    dx = (xmax - xmin) / float(nx)
+    dy = (ymax - ymin) / float(ny)
+
+    # Find the window of pixels which overlap the circle and return early if
+    # there are not any ...
+    ix1 = max(0, math.floor((cx - r - xmin) / dx))
+    ix2 = min(nx, math.ceil((cx + r - xmin) / dx))
+    iy1 = max(0, math.floor((cy - r - ymin) / dy))
+    iy2 = min(ny, math.ceil((cy + r - ymin) / dy))
+    if ix2 <= ix1 or iy2 <= iy1:
+        return 0.0
+
+    # Return answer ...
+    return funcs.sumimagewithincircle(
+        ndiv = ndiv,
+        xmin = xmin + float(ix1) * dx,
+        xmax = xmin + float(ix2) * dx,
+        ymin = ymin + float(iy1) * dy,
+        ymax = ymin + float(iy2) * dy,
+           r = r,
+          cx = cx,
+          cy = cy,
+         img = numpy.asfortranarray(img[iy1:iy2, ix1:ix2], dtype = numpy.float64),
+    )
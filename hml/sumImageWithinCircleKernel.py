@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def sumImageWithinCircleKernel(img, xmin, xmax, ymin, ymax, r, /, *, cacheDir = None, cx = 0.0, cy = 0.0, ndiv = 0, nq = 64):
+    """
+    Sum the pixel values on an image that are within a hard circular mask using
+    a cached kernel.
+
+    Arguments:
+    img -- 2D image with axes (ny, nx)
+    xmin -- left edge of leftmost pixel
+    xmax -- right edge of rightmost pixel
+    ymin -- lower edge of lowermost pixel
+    ymax -- upper edge of uppermost pixel
+    r -- radius of circle
+
+    Keyword arguments:
+    cacheDir -- the directory to store kernels in (default None, which means
+                only cache them in RAM)
+    cx -- x position of centre of circle (default 0.0)
+    cy -- y position of centre of circle (default 0.0)
+    ndiv -- number sub-divisions (default 0, which means find the exact
+            fractions)
+    nq -- the number of steps across a pixel to round the offsets of the centre
+          of the circle to (default 64, or 0, which means do not round them)
+
+    Note:
+    This function is the "kernel" method of hml.sumImageWithinCircle(). It
+    finds the fractions of the pixels around the centre of the circle using
+    hml.findCircleKernel(), which caches them, and multiplies them by the same
+    part of the image. It is the fastest method once the kernels are cached
+    (when the same radius is used for many circles) but, unless "nq" is 0, the
+    centre of the circle is moved by up to 1 / (2 * "nq") of a pixel in each
+    direction so that the cached kernels can be reused. It requires square
+    pixels.
+    """
+
+    # Import standard modules ...
+    import math
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+    # Import sub-functions ...
+    from .findCircleKernel import findCircleKernel
+
+    # Create short-hands ...
+    nx = img.shape[1]                                                           # [#]
+    ny = img.shape[0]                                                           # [#]
+    dx = (xmax - xmin) / float(nx)
+    dy = (ymax - ymin) / float(ny)
+
+    # Check that the pixels are square ...
+    if not math.isclose(dx, dy):
+        raise ValueError(f"the pixels are not square ({dx:e} and {dy:e})") from None
+
+    # Find the pixel which contains the centre of the circle and the offset of
+    # the centre within it ...
+    fx = (cx - xmin) / dx
+    fy = (cy - ymin) / dy
+    jx = math.floor(fx)
+    jy = math.floor(fy)
+
+    # Find the kernel ...
+    kernel = findCircleKernel(
+        r,
+        cacheDir = cacheDir,
+            ndiv = ndiv,
+              nq = nq,
+              ox = fx - float(jx),
+              oy = fy - float(jy),
+              px = dx,
+    )
+    n = (kernel.shape[0] - 1) // 2                                              # [#]
+
+    # Find the window of pixels which overlap the kernel and return early if
+    # there are not any ...
+    ix1 = max(0, jx - n)
+    ix2 = min(nx, jx + n + 1)
+    iy1 = max(0, jy - n)
+    iy2 = min(ny, jy + n + 1)
+    if ix2 <= ix1 or iy2 <= iy1:
+        return 0.0
+
+    # Return answer ...
+    return float(
+        numpy.einsum(
+            "ij,ij->",
+            kernel[iy1 - jy + n:iy2 - jy + n, ix1 - jx + n:ix2 - jx + n],
+            img[iy1:iy2, ix1:ix2],
+        )
+    )
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def sumImageWithinCircleLoop(img, xmin, xmax, ymin, ymax, r, /, *, cx = 0.0, cy = 0.0, ndiv = 0):
+    """
+    Sum the pixel values on an image that are within a hard circular mask by
+    visiting every pixel.
+
+    Arguments:
+    img -- 2D image with axes (ny, nx)
+    xmin -- left edge of leftmost pixel
+    xmax -- right edge of rightmost pixel
+    ymin -- lower edge of lowermost pixel
+    ymax -- upper edge of uppermost pixel
+    r -- radius of circle
+
+    Keyword arguments:
+    cx -- x position of centre of circle (default 0.0)
+    cy -- y position of centre of circle (default 0.0)
+    ndiv -- number sub-divisions (default 0, which means find the exact
+            fractions)
+
+    Note:
+    This function is the "loop" method of hml.sumImageWithinCircle(). It
+    visits every pixel of the image one at a time in Python and is only kept
+    as a reference for the other methods.
+    """
+
+    # Import standard modules ...
+    import math
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+    # Import sub-functions ...
+    from .findFractionOfPixelsWithinCircle import findFractionOfPixelsWithinCircle
+
+    # Create nodes relative to the centre of the circle ...
+    xaxis = numpy.linspace(xmin, xmax, num = img.shape[1] + 1) - cx
+    yaxis = numpy.linspace(ymin, ymax, num = img.shape[0] + 1) - cy
+
+    # Find out the distance of each node to the centre of the circle and the
+    # distance of the nearest point of each row and column to the centre of
+    # the circle ...
+    dist = numpy.hypot(xaxis.reshape(1, -1), yaxis.reshape(-1, 1))
+    xnear = numpy.where((xaxis[:-1] <= 0.0) & (xaxis[1:] >= 0.0), 0.0, numpy.minimum(numpy.abs(xaxis[:-1]), numpy.abs(xaxis[1:])))
+    ynear = numpy.where((yaxis[:-1] <= 0.0) & (yaxis[1:] >= 0.0), 0.0, numpy.minimum(numpy.abs(yaxis[:-1]), numpy.abs(yaxis[1:])))
+
+    # Initialize total and lists ...
+    tot = 0.0
+    bx = []
+    by = []
+
+    # Loop over x-axis ...
+    for ix in range(img.shape[1]):
+        # Loop over y-axis ...
+        for iy in range(img.shape[0]):
+            # Skip this pixel if it is empty ...
+            if img[iy, ix] == 0.0:
+                continue
+
+            # Skip this pixel if it is all outside of the circle ...
+            if math.hypot(xnear[ix], ynear[iy]) >= r:
+                continue
+
+            # Check if this pixel is entirely within the circle or if it
+            # straddles the circumference ...
+            if numpy.all(dist[iy:iy + 2, ix:ix + 2] <= r):
+                # Add all of the value to total ...
+                tot += float(img[iy, ix])
+            else:
+                # Append the pixel to the lists ...
+                bx.append(ix)
+                by.append(iy)
+
+    # Add part of the value of the pixels which straddle the circumference to
+    # total ...
+    bx = numpy.array(bx, dtype = numpy.int64)
+    by = numpy.array(by, dtype = numpy.int64)
+    tot += float(
+        (
+            img[by, bx].astype(numpy.float64) * findFractionOfPixelsWithinCircle(
+                xaxis[bx],
+                xaxis[bx + 1],
+                yaxis[by],
+                yaxis[by + 1],
+                r,
+                ndiv = ndiv,
+            )
+        ).sum()
+    )
+
+    # Return answer ...
+    return tot
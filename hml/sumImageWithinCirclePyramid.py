@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def sumImageWithinCirclePyramid(img, xmin, xmax, ymin, ymax, r, /, *, cx = 0.0, cy = 0.0, ndiv = 0, pyramid = None):
+    """
+    Sum the pixel values on an image that are within a hard circular mask using
+    a pyramid of block sums.
+
+    Arguments:
+    img -- 2D image with axes (ny, nx)
+    xmin -- left edge of leftmost pixel
+    xmax -- right edge of rightmost pixel
+    ymin -- lower edge of lowermost pixel
+    ymax -- upper edge of uppermost pixel
+    r -- radius of circle
+
+    Keyword arguments:
+    cx -- x position of centre of circle (default 0.0)
+    cy -- y position of centre of circle (default 0.0)
+    ndiv -- number sub-divisions (default 0, which means find the exact
+            fractions)
+    pyramid -- the pyramid of block sums of the image (default None, which
+               means make it)
+
+    Note:
+    This function is the "pyramid" method of hml.sumImageWithinCircle(). The
+    pyramid of block sums of the image (see hml.makePyramid()) should be made
+    once and passed in if the same image is summed within many circles. It
+    starts with the single block at the top of the pyramid and descends one
+    level at a time: blocks which are entirely within the circle are added,
+    blocks which are all outside of the circle (or which are empty) are skipped
+    and only the blocks which straddle the circumference are split into their
+    four children on the next level down. The interior of the circle is
+    therefore covered by the coarsest blocks which fit and only the pixels on
+    the circumference are visited, so the cost is proportional to the radius
+    of the circle (in pixels) plus the number of levels. Blocks whose sums are
+    zero are taken to be empty, so the image must not have any negative pixels
+    (hml.makePyramid() checks this).
+    """
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+    # Import sub-functions ...
+    from .findFractionOfPixelsWithinCircle import findFractionOfPixelsWithinCircle
+    from .makePyramid import makePyramid
+
+    # Create short-hands ...
+    dx = (xmax - xmin) / float(img.shape[1])
+    dy = (ymax - ymin) / float(img.shape[0])
+
+    # Check if the pyramid needs making ...
+    if pyramid is None:
+        pyramid = makePyramid(img)
+
+    # Initialize total and start with the block at the top of the pyramid ...
+    tot = 0.0
+    bx = numpy.zeros(1, dtype = numpy.int64)
+    by = numpy.zeros(1, dtype = numpy.int64)
+
+    # Loop over levels (starting at the top) ...
+    for k in range(len(pyramid) - 1, -1, -1):
+        # Find the edges of the blocks relative to the centre of the circle ...
+        # NOTE: The blocks on the right and upper edges of the image may extend
+        #       beyond it, but the part beyond it is empty.
+        x1 = xmin + (bx * 2 ** k).astype(numpy.float64) * dx - cx
+        x2 = x1 + float(2 ** k) * dx
+        y1 = ymin + (by * 2 ** k).astype(numpy.float64) * dy - cy
+        y2 = y1 + float(2 ** k) * dy
+
+        # Find out the distance of the nearest point and the furthest corner of
+        # each block to the centre of the circle ...
+        xnear = numpy.where((x1 <= 0.0) & (x2 >= 0.0), 0.0, numpy.minimum(numpy.abs(x1), numpy.abs(x2)))
+        ynear = numpy.where((y1 <= 0.0) & (y2 >= 0.0), 0.0, numpy.minimum(numpy.abs(y1), numpy.abs(y2)))
+        dmin = numpy.hypot(xnear, ynear)
+        dmax = numpy.hypot(numpy.maximum(numpy.abs(x1), numpy.abs(x2)), numpy.maximum(numpy.abs(y1), numpy.abs(y2)))
+
+        # Classify the blocks which are not empty as being all outside of the
+        # circle, entirely within the circle or straddling the
+        # circumference ...
+        vals = numpy.asarray(pyramid[k][by, bx], dtype = numpy.float64)
+        outside = (vals == 0.0) | (dmin >= r)
+        inside = ~outside & (dmax <= r)
+        straddle = ~outside & ~inside
+
+        # Add all of the value of the blocks which are entirely within the
+        # circle to total ...
+        tot += float(vals[inside].sum())
+
+        # Check if this is the bottom of the pyramid ...
+        if k == 0:
+            # Add part of the value of the pixels which straddle the
+            # circumference to total ...
+            tot += float(
+                (
+                    vals[straddle] * findFractionOfPixelsWithinCircle(
+                        x1[straddle],
+                        x2[straddle],
+                        y1[straddle],
+                        y2[straddle],
+                        r,
+                        ndiv = ndiv,
+                    )
+                ).sum()
+            )
+            break
+
+        # Split the blocks which straddle the circumference into their children
+        # on the next level down (skipping the ones which are beyond the edges
+        # of the next level down) ...
+        bx = (2 * bx[straddle].reshape(-1, 1) + numpy.array([0, 1, 0, 1], dtype = numpy.int64).reshape(1, -1)).reshape(-1)
+        by = (2 * by[straddle].reshape(-1, 1) + numpy.array([0, 0, 1, 1], dtype = numpy.int64).reshape(1, -1)).reshape(-1)
+        keep = (bx < pyramid[k - 1].shape[1]) & (by < pyramid[k - 1].shape[0])
+        bx = bx[keep]
+        by = by[keep]
+
+    # Return answer ...
+    return tot
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def sumImageWithinCircleSAT(img, sat, xmin, xmax, ymin, ymax, r, /, *, cx = 0.0, cy = 0.0, ndiv = 0):
+    """
+    Sum the pixel values on an image that are within a hard circular mask using
+    a summed-area table.
+
+    Arguments:
+    img -- 2D image with axes (ny, nx)
+    sat -- the summed-area table of the image (see hml.makeSummedAreaTable())
+    xmin -- left edge of leftmost pixel
+    xmax -- right edge of rightmost pixel
+    ymin -- lower edge of lowermost pixel
+    ymax -- upper edge of uppermost pixel
+    r -- radius of circle
+
+    Keyword arguments:
+    cx -- x position of centre of circle (default 0.0)
+    cy -- y position of centre of circle (default 0.0)
+    ndiv -- number sub-divisions (default 0, which means find the exact
+            fractions)
+
+    Note:
+    This function is the "vectorized" method of hml.sumImageWithinCircle() when
+    the summed-area table of the image is passed. Only the rows of the image
+    which overlap the circle are visited. In each row, the span of pixels which
+    are entirely within the circle is summed with one look-up in the
+    summed-area table and only the pixels either side of it, which straddle
+    the circumference, are visited one at a time. The cost is then proportional
+    to the radius of the circle (in pixels) rather than to the size of the
+    image, which is worth it when the same image is summed within many
+    circles.
+    """
+
+    # Import standard modules ...
+    import math
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+    # Import sub-functions ...
+    from .findFractionOfPixelsWithinCircle import findFractionOfPixelsWithinCircle
+
+    # Create short-hands ...
+    nx = img.shape[1]                                                           # [#]
+    ny = img.shape[0]                                                           # [#]
+    dx = (xmax - xmin) / float(nx)
+    dy = (ymax - ymin) / float(ny)
+
+    # Create nodes relative to the centre of the circle ...
+    xaxis = numpy.linspace(xmin, xmax, num = nx + 1) - cx
+    yaxis = numpy.linspace(ymin, ymax, num = ny + 1) - cy
+
+    # Initialize total and lists ...
+    tot = 0.0
+    bx = []
+    by = []
+
+    # Loop over the rows which overlap the circle ...
+    for iy in range(max(0, math.floor((cy - r - ymin) / dy)), min(ny, math.ceil((cy + r - ymin) / dy))):
+        # Find the distances from the centre of the circle to the nearest and
+        # furthest edges of this row ...
+        if yaxis[iy] <= 0.0 <= yaxis[iy + 1]:
+            dNear = 0.0
+        else:
+            dNear = min(abs(yaxis[iy]), abs(yaxis[iy + 1]))
+        dFar = max(abs(yaxis[iy]), abs(yaxis[iy + 1]))
+
+        # Skip this row if it is all outside of the circle ...
+        if dNear >= r:
+            continue
+
+        # Find the span of pixels which overlap the circle ...
+        hw = math.sqrt(r * r - dNear * dNear)
+        ox1 = max(0, math.floor((cx - hw - xmin) / dx))
+        ox2 = min(nx, math.ceil((cx + hw - xmin) / dx))
+
+        # Skip this row if none of its pixels overlap the circle (which happens
+        # when the centre of the circle is beyond the left or right edge of the
+        # image) ...
+        if ox1 >= ox2:
+            continue
+
+        # Find the span of pixels which are entirely within the circle (if
+        # there are any) ...
+        ix1 = ox1
+        ix2 = ox1
+        if dFar < r:
+            hw = math.sqrt(r * r - dFar * dFar)
+            ix1 = min(ox2, max(ox1, math.ceil((cx - hw - xmin) / dx)))
+            ix2 = min(ox2, max(ix1, math.floor((cx + hw - xmin) / dx)))
+
+        # Add all of the span of pixels which are entirely within the
+        # circle ...
+        tot += sat[iy + 1, ix2] - sat[iy, ix2] - sat[iy + 1, ix1] + sat[iy, ix1]
+
+        # Loop over the pixels either side of the span ...
+        for ix in list(range(ox1, ix1)) + list(range(ix2, ox2)):
+            # Skip this pixel if it is empty ...
+            if img[iy, ix] == 0.0:
+                continue
+
+            # Find the distances from the centre of the circle to the nearest
+            # and furthest edges of this column ...
+            if xaxis[ix] <= 0.0 <= xaxis[ix + 1]:
+                xNear = 0.0
+            else:
+                xNear = min(abs(xaxis[ix]), abs(xaxis[ix + 1]))
+            xFar = max(abs(xaxis[ix]), abs(xaxis[ix + 1]))
+
+            # Skip this pixel if it is all outside of the circle ...
+            if math.hypot(xNear, dNear) >= r:
+                continue
+
+            # Check if this pixel is entirely within the circle or if it
+            # straddles the circumference ...
+            if math.hypot(xFar, dFar) <= r:
+                # Add all of the value to total ...
+                tot += float(img[iy, ix])
+            else:
+                # Append the pixel to the lists ...
+                bx.append(ix)
+                by.append(iy)
+
+    # Add part of the value of the pixels which straddle the circumference to
+    # total ...
+    bx = numpy.array(bx, dtype = numpy.int64)
+    by = numpy.array(by, dtype = numpy.int64)
+    tot += float(
+        (
+            img[by, bx].astype(numpy.float64) * findFractionOfPixelsWithinCircle(
+                xaxis[bx],
+                xaxis[bx + 1],
+                yaxis[by],
+                yaxis[by + 1],
+                r,
+                ndiv = ndiv,
+            )
+        ).sum()
+    )
+
+    # Return answer ...
+    return tot
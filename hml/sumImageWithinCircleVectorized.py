@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def sumImageWithinCircleVectorized(img, xmin, xmax, ymin, ymax, r, /, *, cx = 0.0, cy = 0.0, ndiv = 0):
+    """
+    Sum the pixel values on an image that are within a hard circular mask using
+    array operations.
+
+    Arguments:
+    img -- 2D image with axes (ny, nx)
+    xmin -- left edge of leftmost pixel
+    xmax -- right edge of rightmost pixel
+    ymin -- lower edge of lowermost pixel
+    ymax -- upper edge of uppermost pixel
+    r -- radius of circle
+
+    Keyword arguments:
+    cx -- x position of centre of circle (default 0.0)
+    cy -- y position of centre of circle (default 0.0)
+    ndiv -- number sub-divisions (default 0, which means find the exact
+            fractions)
+
+    Note:
+    This function is the "vectorized" method of hml.sumImageWithinCircle(). It
+    only considers the pixels within the bounding box of the circle: it
+    classifies them as outside, inside or straddling the circumference using
+    the distances of their nearest points and their furthest corners to the
+    centre of the circle, sums the ones inside in one go and finds the
+    fractions of the ones straddling the circumference in one call to
+    hml.findFractionOfPixelsWithinCircle().
+    """
+
+    # Import standard modules ...
+    import math
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+    # Import sub-functions ...
+    from .findFractionOfPixelsWithinCircle import findFractionOfPixelsWithinCircle
+
+    # Create short-hands ...
+    nx = img.shape[1]                                                           # [#]
+    ny = img.shape[0]                                                           # [#]
+    dx = (xmax - xmin) / float(nx)
+    dy = (ymax - ymin) / float(ny)
+
+    # Find the window of pixels which overlap the circle and return early if
+    # there are not any ...
+    ix1 = max(0, math.floor((cx - r - xmin) / dx))
+    ix2 = min(nx, math.ceil((cx + r - xmin) / dx))
+    iy1 = max(0, math.floor((cy - r - ymin) / dy))
+    iy2 = min(ny, math.ceil((cy + r - ymin) / dy))
+    if ix2 <= ix1 or iy2 <= iy1:
+        return 0.0
+
+    # Create nodes relative to the centre of the circle ...
+    xaxis = xmin + numpy.arange(ix1, ix2 + 1, dtype = numpy.float64) * dx - cx
+    yaxis = ymin + numpy.arange(iy1, iy2 + 1, dtype = numpy.float64) * dy - cy
+
+    # Find out the distance of each node to the centre of the circle and then
+    # the distance of the furthest corner of each pixel ...
+    dist = numpy.hypot(xaxis.reshape(1, -1), yaxis.reshape(-1, 1))
+    dmax = numpy.maximum.reduce([dist[:-1, :-1], dist[:-1, 1:], dist[1:, :-1], dist[1:, 1:]])
+
+    # Find out the distance of the nearest point of each pixel to the centre of
+    # the circle (which is not necessarily a corner) ...
+    xnear = numpy.where((xaxis[:-1] <= 0.0) & (xaxis[1:] >= 0.0), 0.0, numpy.minimum(numpy.abs(xaxis[:-1]), numpy.abs(xaxis[1:])))
+    ynear = numpy.where((yaxis[:-1] <= 0.0) & (yaxis[1:] >= 0.0), 0.0, numpy.minimum(numpy.abs(yaxis[:-1]), numpy.abs(yaxis[1:])))
+    dmin = numpy.hypot(xnear.reshape(1, -1), ynear.reshape(-1, 1))
+
+    # Classify the pixels which are not empty as being all outside of the
+    # circle, entirely within the circle or straddling the circumference ...
+    window = img[iy1:iy2, ix1:ix2]
+    outside = (window == 0.0) | (dmin >= r)
+    inside = ~outside & (dmax <= r)
+    by, bx = numpy.nonzero(~outside & ~inside)
+
+    # Return answer ...
+    return float(window[inside].sum(dtype = numpy.float64)) + float(
+        (
+            window[by, bx].astype(numpy.float64) * findFractionOfPixelsWithinCircle(
+                xaxis[bx],
+                xaxis[bx + 1],
+                yaxis[by],
+                yaxis[by + 1],
+                r,
+                ndiv = ndiv,
+            )
+        ).sum()
+    )
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def sumImageWithinCircles(img, xmin, xmax, ymin, ymax, cx, cy, radii, /, *, ndiv = 0, sat = None):
+    """
+    Sum the pixel values on an image that are within hard circular masks
+    around many centres.
+
+    Arguments:
+    img -- 2D image with axes (ny, nx)
+    xmin -- left edge of leftmost pixel
+    xmax -- right edge of rightmost pixel
+    ymin -- lower edge of lowermost pixel
+    ymax -- upper edge of uppermost pixel
+    cx -- 1D array of x positions of centres of circles
+    cy -- 1D array of y positions of centres of circles
+    radii -- 1D array of radii of circles
+
+    Keyword arguments:
+    ndiv -- number sub-divisions (default 0, which means find the exact
+            fractions)
+    sat -- the summed-area table of the image (default None, which means make
+           it if it is needed)
+
+    Note:
+    This function returns a (ncentre, nradius) array of the same answers as
+    calling hml.sumImageWithinCircle() for each centre and radius.
+
+    If the FORTRAN module has been compiled (see hml.f90) then the work is done
+    by hml.f90.funcs.sumimagewithincircles() instead, which shares the centres
+    out in parallel (using OpenMP) and sums each circle using the summed-area
+    table of the image (see hml.makeSummedAreaTable()), so that each circle
+    only visits the pixels on its circumference. The image and the summed-area
+    table are only passed to the FORTRAN module once (and are only copied if
+    they are not already FORTRAN-ordered float64 arrays). If the FORTRAN module
+    has not been compiled then hml.radialProfile() is called for each centre,
+    which only visits the pixels within the largest circle.
+    """
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+
+    # Import sub-functions ...
+    from .makeSummedAreaTable import makeSummedAreaTable
+    from .radialProfile import radialProfile
+    try:
+        from .f90 import funcs
+    except:
+        funcs = None
+
+    # Convert the centres and radii to arrays ...
+    cx = numpy.asarray(cx, dtype = numpy.float64).reshape(-1)
+    cy = numpy.asarray(cy, dtype = numpy.float64).reshape(-1)
+    radii = numpy.asarray(radii, dtype = numpy.float64).reshape(-1)
+    if cx.size != cy.size:
+        raise ValueError(f"\"cx\" and \"cy\" are different sizes ({cx.size:,d} and {cy.size:,d})") from None
+
+    # Check if the FORTRAN module has been compiled ...
+    if funcs is not None:
+        # Check if the summed-area table needs making ...
+        if sat is None:
+            sat = makeSummedAreaTable(img)
+
+        # Return answer ...
+        return funcs.sumimagewithincircles(
+            ndiv,
+            xmin,
+            xmax,
+            ymin,
+            ymax,
+            radii,
+            cx,
+            cy,
+            numpy.asfortranarray(img, dtype = numpy.float64),
+            numpy.asfortranarray(sat, dtype = numpy.float64),
+        )
+
+    # Initialize array ...
+    tots = numpy.zeros((cx.size, radii.size), dtype = numpy.float64)
+
+    # Loop over centres ...
+    for ic in range(cx.size):
+        # Find the sums within all of the circles around this centre ...
+        tots[ic, :] = radialProfile(
+            img,
+            xmin,
+            xmax,
+            ymin,
+            ymax,
+            radii,
+              cx = cx[ic],
+              cy = cy[ic],
+            ndiv = ndiv,
+        )
+
+    # Return answer ...
+    return tots
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+
+# Define function ...
+def updateRaster(sfObj, fname, /, *, crs = None, maxVertices = 65536, method = None, nx = 1024, ny = 1024, processes = None, px = 1024.0):
+    """
+    Update the raster of a ShapeFile by only rasterizing the records which have
+    changed since it was last made.
+
+    Arguments:
+    sfObj -- a shapefile.Reader of a ShapeFile, or the name of the directory of
+             a geometry store (see hml.ingestShapefile())
+    fname -- the name of the raster container (see hml.createRaster())
+
+    Keyword arguments:
+    crs -- the coordinate reference system of the raster, e.g. "EPSG:27700"
+           (default None)
+    maxVertices -- the number of vertices at which a batch of Polygons is
+                   submitted to the pool of workers (default 65536)
+    method -- the method to pass to hml.rasterizePolygon() (default None, which
+              means "analytic" if the FORTRAN module has been compiled and
+              "vectorized" if it has not)
+    nx -- number of x pixels (default 1024)
+    ny -- number of y pixels (default 1024)
+    processes -- the number of workers in the pool (default None, which means
+                 as many as there are CPUs)
+    px -- pixel size (default 1024.0)
+
+    Note:
+    This function only works for ShapeFiles that solely exist in the (positive,
+    positive) quadrant.
+
+    A fingerprint index is saved next to the raster container (with the suffix
+    ".idx.npz") which contains the BLAKE2b hash and the WKB of every valid
+    [Multi]Polygon that is in the raster. The [Multi]Polygons of the ShapeFile
+    are compared against the fingerprint index (treating both as multisets, so
+    that duplicate records are counted properly): the [Multi]Polygons which
+    have been removed (or changed) are rasterized and subtracted from the
+    raster and the [Multi]Polygons which have been added (or changed) are
+    rasterized and added to the raster. The cost therefore scales with the
+    number of records which have changed rather than with the size of the
+    ShapeFile. If the raster container or the fingerprint index is missing (or
+    was made with a different grid) then the whole raster is made again using
+    hml.rasterizeShapefile(), which writes straight into the data of a new
+    uncompressed raster container.
+
+    The changes are made to a copy of the raster container, which is then
+    renamed along with the new fingerprint index, so an interrupted update
+    leaves the old raster intact. Subtracting a [Multi]Polygon does not
+    exactly undo adding it in float32, so an updated raster agrees with one
+    that has been made from scratch to within the precision of float32 (any
+    tiny negative areas left behind are set to zero). If the raster container
+    is compressed then it cannot be memory-mapped, so it is loaded into RAM,
+    updated and then saved again with the same compression and tiles (see
+    hml.saveRaster()).
+
+    This function returns the number of [Multi]Polygons which were added and
+    the number which were removed.
+    """
+
+    # Import standard modules ...
+    import collections
+    import functools
+    import hashlib
+    import multiprocessing
+    import os
+    import shutil
+
+    # Import special modules ...
+    try:
+        import numpy
+    except:
+        raise Exception("\"numpy\" is not installed; run \"pip install --user numpy\"") from None
+    try:
+        import shapely
+    except:
+        raise Exception("\"shapely\" is not installed; run \"pip install --user Shapely\"") from None
+
+    # Import sub-functions ...
+    from .createRaster import createRaster
+    from .iterPolygons import iterPolygons
+    from .loadRaster import loadRaster
+    from .loadRasterHeader import loadRasterHeader
+    from .rasterizePolygons import rasterizePolygons
+    from .rasterizeShapefile import rasterizeShapefile
+    from .saveRaster import saveRaster
+
+    # Check if a method was chosen ...
+    if method is None:
+        # Use the FORTRAN module if it has been compiled ...
+        try:
+            from .f90 import funcs
+        except:
+            funcs = None
+        method = "vectorized" if funcs is None else "analytic"
+
+    # Load all of the valid [Multi]Polygons, serialize them and find their
+    # fingerprints ...
+    polys = list(iterPolygons(sfObj))
+    wkbs = shapely.to_wkb(polys)
+    fingerprints = numpy.array(
+        [hashlib.blake2b(wkb, digest_size = 16).hexdigest() for wkb in wkbs],
+        dtype = "<U32",
+    )
+
+    # Create short-hands for the names of the fingerprint index and the
+    # temporary files ...
+    iname = f"{fname}.idx.npz"
+    tname = f"{fname}.tmp"
+    jname = f"{fname}.idx.tmp.npz"
+
+    # Initialize the old fingerprint index (in case there is not one) ...
+    oldFingerprints = numpy.zeros(0, dtype = "<U32")
+    oldWkbOffsets = numpy.zeros(1, dtype = numpy.int64)
+    oldWkbs = numpy.zeros(0, dtype = numpy.uint8)
+
+    # Check if the raster can be updated ...
+    if os.path.exists(fname) and os.path.exists(iname):
+        # Load the fingerprint index ...
+        with numpy.load(iname) as index:
+            oldGrid = (int(index["nx"]), int(index["ny"]), float(index["px"]))
+            oldFingerprints = index["fingerprints"]
+            oldWkbOffsets = index["wkbOffsets"]
+            oldWkbs = index["wkbs"]
+        update = oldGrid == (nx, ny, px)
+    else:
+        update = False
+
+    # Check if the raster needs making from scratch ...
+    if not update:
+        # Create a temporary raster container and rasterize the ShapeFile
+        # straight into it ...
+        header = createRaster(
+            tname,
+            nx,
+            ny,
+            crs = crs,
+             px = px,
+        )
+        rasterizeShapefile(
+            sfObj,
+                  fname = tname,
+            maxVertices = maxVertices,
+                 method = method,
+                     nx = nx,
+                     ny = ny,
+                 offset = header["dataOffset"],
+              processes = processes,
+                     px = px,
+        )
+
+        # Save the fingerprint index and rename both files ...
+        numpy.savez(
+            jname,
+            fingerprints = fingerprints,
+              wkbOffsets = numpy.cumsum([0] + [len(wkb) for wkb in wkbs], dtype = numpy.int64),
+                    wkbs = numpy.frombuffer(b"".join(wkbs), dtype = numpy.uint8),
+                      nx = nx,
+                      ny = ny,
+                      px = px,
+        )
+        os.replace(tname, fname)
+        os.replace(jname, iname)
+
+        # Return answers ...
+        return len(wkbs), 0
+
+    # Find the multisets of the [Multi]Polygons which have been removed and
+    # added ...
+    nRemoved = collections.Counter(oldFingerprints.tolist()) - collections.Counter(fingerprints.tolist())
+    nAdded = collections.Counter(fingerprints.tolist()) - collections.Counter(oldFingerprints.tolist())
+
+    # Find the WKBs of the [Multi]Polygons which have been removed ...
+    removed = []
+    for i, fingerprint in enumerate(oldFingerprints.tolist()):
+        if nRemoved[fingerprint] > 0:
+            removed.append(oldWkbs[oldWkbOffsets[i]:oldWkbOffsets[i + 1]].tobytes())
+            nRemoved[fingerprint] -= 1
+
+    # Find the WKBs of the [Multi]Polygons which have been added ...
+    added = []
+    for i, fingerprint in enumerate(fingerprints.tolist()):
+        if nAdded[fingerprint] > 0:
+            added.append(wkbs[i])
+            nAdded[fingerprint] -= 1
+
+    # Return early if nothing has changed ...
+    if len(removed) == 0 and len(added) == 0:
+        return 0, 0
+
+    # Initialize lists ...
+    batches = []
+    signs = []
+
+    # Loop over the [Multi]Polygons which have been removed and added ...
+    for sign, changed in [(-1.0, removed), (1.0, added)]:
+        # Loop over [Multi]Polygons and group them into batches by their number
+        # of vertices ...
+        nVertices = 0                                                           # [#]
+        batch = []
+        for wkb in changed:
+            n = shapely.get_num_coordinates(shapely.from_wkb(wkb))              # [#]
+            if len(batch) > 0 and nVertices + n > maxVertices:
+                batches.append(batch)
+                signs.append(sign)
+                nVertices = 0                                                   # [#]
+                batch = []
+            nVertices += n                                                      # [#]
+            batch.append(wkb)
+        if len(batch) > 0:
+            batches.append(batch)
+            signs.append(sign)
+
+    # Load the header ...
+    header = loadRasterHeader(fname)
+
+    # Check if the data are compressed ...
+    if header["compression"] == "none":
+        # Copy the raster container and memory-map the copy ...
+        shutil.copyfile(fname, tname)
+        globalGrid = loadRaster(tname, mode = "r+")                             # [m2]
+    else:
+        # Load the raster container into RAM ...
+        # NOTE: Changes to a compressed raster container are not written back
+        #       to it, so it is saved again once it has been updated.
+        globalGrid = loadRaster(fname)                                          # [m2]
+
+    # Create a pool of workers ...
+    with multiprocessing.Pool(processes = processes) as pObj:
+        # Loop over the batches as they finish (in order) ...
+        for sign, results in zip(signs, pObj.imap(functools.partial(rasterizePolygons, method = method, px = px), batches)):
+            # Loop over the answers ...
+            for ix1, iy1, localGrid in results:
+                # Add (or subtract) the local grid to (or from) the global grid
+                # and remove any rounding errors ...
+                window = globalGrid[iy1:iy1 + localGrid.shape[0], ix1:ix1 + localGrid.shape[1]] # [m2]
+                window += sign * localGrid                                      # [m2]
+                numpy.place(window, window < 0.0, 0.0)                          # [m2]
+
+        # Close the pool of worker processes and wait for all of the tasks to
+        # finish ...
+        # NOTE: The "__exit__()" call of the context manager for
+        #       "multiprocessing.Pool()" calls "terminate()" instead of
+        #       "join()", so I must manage the end of the pool of worker
+        #       processes myself.
+        pObj.close()
+        pObj.join()
+
+    # Check if the data are compressed ...
+    if header["compression"] == "none":
+        # Flush the global grid ...
+        globalGrid.flush()
+    else:
+        # Save the global grid as a temporary raster container ...
+        saveRaster(
+            tname,
+            globalGrid,
+            compression = header["compression"],
+                    crs = header["crs"],
+                     px = header["px"],
+               tileSize = header["tileShape"][0],
+                     x0 = header["x0"],
+                     y0 = header["y0"],
+        )
+    del globalGrid
+
+    # Save the fingerprint index and rename both files ...
+    numpy.savez(
+        jname,
+        fingerprints = fingerprints,
+          wkbOffsets = numpy.cumsum([0] + [len(wkb) for wkb in wkbs], dtype = numpy.int64),
+                wkbs = numpy.frombuffer(b"".join(wkbs), dtype = numpy.uint8),
+                  nx = nx,
+                  ny = ny,
+                  px = px,
+    )
+    os.replace(tname, fname)
+    os.replace(jname, iname)
+
+    # Return answers ...
+    return len(added), len(removed)
@@ -56,7 +56,6 @@ if __name__ == "__main__":
 
     # Import my modules ...
     import hml
-    import hml.f90
     try:
         import pyguymer3
         import pyguymer3.geo
@@ -95,10 +94,8 @@ if __name__ == "__main__":
 
     # **************************************************************************
 
-    # Set pixel size, number of sub-divisions, number of radii and extent of
-    # grid ...
+    # Set pixel size, number of radii and extent of grid ...
     px = 128                                                                    # [m]
-    ndiv = 128                                                                  # [#]
     nr = 128                                                                    # [#]
     nx = 5200                                                                   # [#]
     ny = 5200                                                                   # [#]
@@ -106,11 +103,9 @@ if __name__ == "__main__":
     # Set field-of-view ...
     fov = 0.5                                                                   # [°]
 
-    # Use mode to override pixel size, number of sub-divisions, number of radii
-    # and extent of grid ...
+    # Use mode to override pixel size, number of radii and extent of grid ...
     if args.debug:
         px = 1024                                                               # [m]
-        ndiv = 16                                                               # [#]
         nr = 16                                                                 # [#]
         nx = 650                                                                # [#]
         ny = 650                                                                # [#]
@@ -171,65 +166,76 @@ if __name__ == "__main__":
 
     # **************************************************************************
 
-    # Initialize extents ...
-    x1 = 1.0e10                                                                 # [m]
-    y1 = 1.0e10                                                                 # [m]
-    x2 = 0.0                                                                    # [m]
-    y2 = 0.0                                                                    # [m]
+    # Find the names of the geometry stores ...
+    # NOTE: The geometry stores are named after the SHA-256 hashes of the ZIP
+    #       files so that they are made again whenever a ZIP file changes.
+    gnames = {}
+    for stub in ["alwaysOpen", "limitedAccess", "openAccess"]:
+        sha256 = pyguymer3.sha256(f"{stub}.zip")
+        gnames[stub] = f"{stub}.{sha256}.geom"
 
     # **************************************************************************
 
-    print("Finding extent of \"alwaysOpen.zip\" ...")
-
-    # Load dataset ...
-    with zipfile.ZipFile("alwaysOpen.zip", "r") as zfObj:
-        # Read files into RAM so that they become seekable ...
-        # NOTE: https://stackoverflow.com/a/12025492
-        dbfObj = io.BytesIO(zfObj.read("d00dbcdd-ca42-4b51-9889-50627184f7602020313-1-1rdxbnd.c0er.dbf"))
-        shpObj = io.BytesIO(zfObj.read("d00dbcdd-ca42-4b51-9889-50627184f7602020313-1-1rdxbnd.c0er.shp"))
-        shxObj = io.BytesIO(zfObj.read("d00dbcdd-ca42-4b51-9889-50627184f7602020313-1-1rdxbnd.c0er.shx"))
+    # Check if the ZIP file needs ingesting ...
+    if not os.path.exists(gnames["alwaysOpen"]):
+        print("Ingesting \"alwaysOpen.zip\" ...")
 
-        # Open shapefile ...
-        sfObj = shapefile.Reader(dbf = dbfObj, shp = shpObj, shx = shxObj)
+        # Load dataset ...
+        with zipfile.ZipFile("alwaysOpen.zip", "r") as zfObj:
+            # Read files into RAM so that they become seekable ...
+            # NOTE: https://stackoverflow.com/a/12025492
+            shpObj = io.BytesIO(zfObj.read("d00dbcdd-ca42-4b51-9889-50627184f7602020313-1-1rdxbnd.c0er.shp"))
+            shxObj = io.BytesIO(zfObj.read("d00dbcdd-ca42-4b51-9889-50627184f7602020313-1-1rdxbnd.c0er.shx"))
 
-        # Update extents ...
-        x1, y1, x2, y2 = hml.findExtent(sfObj, x1 = x1, y1 = y1, x2 = x2, y2 = y2)  # [m], [m], [m], [m]
+            # Open shapefile and save it as a geometry store ...
+            sfObj = shapefile.Reader(shp = shpObj, shx = shxObj)
+            hml.ingestShapefile(sfObj, gnames["alwaysOpen"])
 
     # **************************************************************************
 
-    print("Finding extent of \"limitedAccess.zip\" ...")
+    # Check if the ZIP file needs ingesting ...
+    if not os.path.exists(gnames["limitedAccess"]):
+        print("Ingesting \"limitedAccess.zip\" ...")
 
-    # Load dataset ...
-    with zipfile.ZipFile("limitedAccess.zip", "r") as zfObj:
-        # Read files into RAM so that they become seekable ...
-        # NOTE: https://stackoverflow.com/a/12025492
-        dbfObj = io.BytesIO(zfObj.read("9a97e056-3bd9-4817-a9c5-ad7de1f31a1d2020313-1-rlrdj0.1jac.dbf"))
-        shpObj = io.BytesIO(zfObj.read("9a97e056-3bd9-4817-a9c5-ad7de1f31a1d2020313-1-rlrdj0.1jac.shp"))
-        shxObj = io.BytesIO(zfObj.read("9a97e056-3bd9-4817-a9c5-ad7de1f31a1d2020313-1-rlrdj0.1jac.shx"))
-
-        # Open shapefile ...
-        sfObj = shapefile.Reader(dbf = dbfObj, shp = shpObj, shx = shxObj)
+        # Load dataset ...
+        with zipfile.ZipFile("limitedAccess.zip", "r") as zfObj:
+            # Read files into RAM so that they become seekable ...
+            # NOTE: https://stackoverflow.com/a/12025492
+            shpObj = io.BytesIO(zfObj.read("9a97e056-3bd9-4817-a9c5-ad7de1f31a1d2020313-1-rlrdj0.1jac.shp"))
+            shxObj = io.BytesIO(zfObj.read("9a97e056-3bd9-4817-a9c5-ad7de1f31a1d2020313-1-rlrdj0.1jac.shx"))
 
-        # Update extents ...
-        x1, y1, x2, y2 = hml.findExtent(sfObj, x1 = x1, y1 = y1, x2 = x2, y2 = y2)  # [m], [m], [m], [m]
+            # Open shapefile and save it as a geometry store ...
+            sfObj = shapefile.Reader(shp = shpObj, shx = shxObj)
+            hml.ingestShapefile(sfObj, gnames["limitedAccess"])
 
     # **************************************************************************
 
-    print("Finding extent of \"openAccess.zip\" ...")
+    # Check if the ZIP file needs ingesting ...
+    if not os.path.exists(gnames["openAccess"]):
+        print("Ingesting \"openAccess.zip\" ...")
 
-    # Load dataset ...
-    with zipfile.ZipFile("openAccess.zip", "r") as zfObj:
-        # Read files into RAM so that they become seekable ...
-        # NOTE: https://stackoverflow.com/a/12025492
-        dbfObj = io.BytesIO(zfObj.read("CRoW_Access_Land___Natural_England.dbf"))
-        shpObj = io.BytesIO(zfObj.read("CRoW_Access_Land___Natural_England.shp"))
-        shxObj = io.BytesIO(zfObj.read("CRoW_Access_Land___Natural_England.shx"))
+        # Load dataset ...
+        with zipfile.ZipFile("openAccess.zip", "r") as zfObj:
+            # Read files into RAM so that they become seekable ...
+            # NOTE: https://stackoverflow.com/a/12025492
+            shpObj = io.BytesIO(zfObj.read("CRoW_Access_Land___Natural_England.shp"))
+            shxObj = io.BytesIO(zfObj.read("CRoW_Access_Land___Natural_England.shx"))
 
-        # Open shapefile ...
-        sfObj = shapefile.Reader(dbf = dbfObj, shp = shpObj, shx = shxObj)
+            # Open shapefile and save it as a geometry store ...
+            sfObj = shapefile.Reader(shp = shpObj, shx = shxObj)
+            hml.ingestShapefile(sfObj, gnames["openAccess"])
 
-        # Update extents ...
-        x1, y1, x2, y2 = hml.findExtent(sfObj, x1 = x1, y1 = y1, x2 = x2, y2 = y2)  # [m], [m], [m], [m]
+    # **************************************************************************
+
+    # Initialize extents ...
+    x1 = 1.0e10                                                                 # [m]
+    y1 = 1.0e10                                                                 # [m]
+    x2 = 0.0                                                                    # [m]
+    y2 = 0.0                                                                    # [m]
+
+    # Loop over geometry stores and update extents ...
+    for stub in ["alwaysOpen", "limitedAccess", "openAccess"]:
+        x1, y1, x2, y2 = hml.findExtent(gnames[stub], x1 = x1, y1 = y1, x2 = x2, y2 = y2)  # [m], [m], [m], [m]
 
     # **************************************************************************
 
@@ -245,107 +251,112 @@ if __name__ == "__main__":
 
     # **************************************************************************
 
-    # Check if the ZIP file needs rasterizing ...
-    if not os.path.exists("alwaysOpen.bin"):
-        print("Rasterizing \"alwaysOpen.zip\" ...")
+    # Initialize flag ...
+    updated = False
 
-        # Load dataset ...
-        with zipfile.ZipFile("alwaysOpen.zip", "r") as zfObj:
-            # Read files into RAM so that they become seekable ...
-            # NOTE: https://stackoverflow.com/a/12025492
-            dbfObj = io.BytesIO(zfObj.read("d00dbcdd-ca42-4b51-9889-50627184f7602020313-1-1rdxbnd.c0er.dbf"))
-            shpObj = io.BytesIO(zfObj.read("d00dbcdd-ca42-4b51-9889-50627184f7602020313-1-1rdxbnd.c0er.shp"))
-            shxObj = io.BytesIO(zfObj.read("d00dbcdd-ca42-4b51-9889-50627184f7602020313-1-1rdxbnd.c0er.shx"))
+    print("Rasterizing \"alwaysOpen.zip\" ...")
 
-            # Open shapefile ...
-            sfObj = shapefile.Reader(dbf = dbfObj, shp = shpObj, shx = shxObj)
+    # Update the raster (which only rasterizes the records which have changed
+    # since the last run, or all of them if there is no raster yet) ...
+    nAdded, nRemoved = hml.updateRaster(
+        gnames["alwaysOpen"],
+        "alwaysOpen.hml",
+        crs = "EPSG:27700",
+         nx = nx,
+         ny = ny,
+         px = float(px),
+    )
+    print(f"    {nAdded:,d} records were added and {nRemoved:,d} records were removed")
 
-            # Rasterize and save to BIN ...
-            grid = hml.rasterizeShapefile(sfObj, px = float(px), nx = nx, ny = ny)
-            grid.tofile("alwaysOpen.bin")
+    # Remove the out-of-date PNG if the raster has changed ...
+    if nAdded > 0 or nRemoved > 0:
+        updated = True
+        if os.path.exists("alwaysOpen.png"):
+            os.remove("alwaysOpen.png")
 
     # **************************************************************************
 
-    # Check if the ZIP file needs rasterizing ...
-    if not os.path.exists("limitedAccess.bin"):
-        print("Rasterizing \"limitedAccess.zip\" ...")
-
-        # Load dataset ...
-        with zipfile.ZipFile("limitedAccess.zip", "r") as zfObj:
-            # Read files into RAM so that they become seekable ...
-            # NOTE: https://stackoverflow.com/a/12025492
-            dbfObj = io.BytesIO(zfObj.read("9a97e056-3bd9-4817-a9c5-ad7de1f31a1d2020313-1-rlrdj0.1jac.dbf"))
-            shpObj = io.BytesIO(zfObj.read("9a97e056-3bd9-4817-a9c5-ad7de1f31a1d2020313-1-rlrdj0.1jac.shp"))
-            shxObj = io.BytesIO(zfObj.read("9a97e056-3bd9-4817-a9c5-ad7de1f31a1d2020313-1-rlrdj0.1jac.shx"))
-
-            # Open shapefile ...
-            sfObj = shapefile.Reader(dbf = dbfObj, shp = shpObj, shx = shxObj)
+    print("Rasterizing \"limitedAccess.zip\" ...")
+
+    # Update the raster (which only rasterizes the records which have changed
+    # since the last run, or all of them if there is no raster yet) ...
+    nAdded, nRemoved = hml.updateRaster(
+        gnames["limitedAccess"],
+        "limitedAccess.hml",
+        crs = "EPSG:27700",
+         nx = nx,
+         ny = ny,
+         px = float(px),
+    )
+    print(f"    {nAdded:,d} records were added and {nRemoved:,d} records were removed")
 
-            # Rasterize and save to BIN ...
-            grid = hml.rasterizeShapefile(sfObj, px = float(px), nx = nx, ny = ny)
-            grid.tofile("limitedAccess.bin")
+    # Remove the out-of-date PNG if the raster has changed ...
+    if nAdded > 0 or nRemoved > 0:
+        updated = True
+        if os.path.exists("limitedAccess.png"):
+            os.remove("limitedAccess.png")
 
     # **************************************************************************
 
-    # Check if the ZIP file needs rasterizing ...
-    if not os.path.exists("openAccess.bin"):
-        print("Rasterizing \"openAccess.zip\" ...")
-
-        # Load dataset ...
-        with zipfile.ZipFile("openAccess.zip", "r") as zfObj:
-            # Read files into RAM so that they become seekable ...
-            # NOTE: https://stackoverflow.com/a/12025492
-            dbfObj = io.BytesIO(zfObj.read("CRoW_Access_Land___Natural_England.dbf"))
-            shpObj = io.BytesIO(zfObj.read("CRoW_Access_Land___Natural_England.shp"))
-            shxObj = io.BytesIO(zfObj.read("CRoW_Access_Land___Natural_England.shx"))
-
-            # Open shapefile ...
-            sfObj = shapefile.Reader(dbf = dbfObj, shp = shpObj, shx = shxObj)
+    print("Rasterizing \"openAccess.zip\" ...")
+
+    # Update the raster (which only rasterizes the records which have changed
+    # since the last run, or all of them if there is no raster yet) ...
+    nAdded, nRemoved = hml.updateRaster(
+        gnames["openAccess"],
+        "openAccess.hml",
+        crs = "EPSG:27700",
+         nx = nx,
+         ny = ny,
+         px = float(px),
+    )
+    print(f"    {nAdded:,d} records were added and {nRemoved:,d} records were removed")
 
-            # Rasterize and save to BIN ...
-            grid = hml.rasterizeShapefile(sfObj, px = float(px), nx = nx, ny = ny)
-            grid.tofile("openAccess.bin")
+    # Remove the out-of-date PNG if the raster has changed ...
+    if nAdded > 0 or nRemoved > 0:
+        updated = True
+        if os.path.exists("openAccess.png"):
+            os.remove("openAccess.png")
 
     # **************************************************************************
 
     # Check if the rasters needs merging ...
-    if not os.path.exists("merged.bin"):
+    if updated or not os.path.exists("merged.hml"):
         print("Merging rasters ...")
 
-        # Load all three rasters, add them together and save to BIN ...
-        # NOTE: I do not need to .reshape() them here as the total is being
-        #       saved back to the disk immediately.
-        (
-            numpy.fromfile("alwaysOpen.bin", dtype = numpy.float32) +
-            numpy.fromfile("limitedAccess.bin", dtype = numpy.float32) +
-            numpy.fromfile("openAccess.bin", dtype = numpy.float32)
-        ).tofile("merged.bin")
+        # Make sure that everything which is made from the merged raster is
+        # made again ...
+        updated = True
+        if os.path.exists("merged.png"):
+            os.remove("merged.png")
+
+        # Add the three rasters together (one band of rows at a time, so that
+        # none of the rasters have to be loaded into RAM in one go) ...
+        hml.Raster("alwaysOpen.hml").add(
+            "merged.hml.tmp",
+            hml.Raster("limitedAccess.hml"),
+            hml.Raster("openAccess.hml"),
+        )
+        os.replace("merged.hml.tmp", "merged.hml")
 
     # **************************************************************************
 
-    # Loop over BINs ...
-    for bname in sorted(glob.glob("*.bin")):
-        # Deduce PNG name and skip this BIN if the PNG already exists ...
-        iname = f'{bname.removesuffix(".bin")}.png'
+    # Loop over rasters ...
+    for bname in sorted(glob.glob("*.hml")):
+        # Deduce PNG name and skip this raster if the PNG already exists ...
+        iname = f'{bname.removesuffix(".hml")}.png'
         if os.path.exists(iname):
             continue
 
         print(f"Making \"{iname}\" ...")
 
-        # Load BIN, flip it, scale it correctly and save as PNG ...
+        # Save raster as PNG ...
         # NOTE: The OSGB reference system has positive axes from an origin in
         #       the lower-left corner whereas the PNG reference system has
         #       positive axes from an origin in the upper-left corner.
-        #       Therefore, the y-axis needs flipping before the BIN can be saved
-        #       as a PNG.
-        grid = numpy.fromfile(bname, dtype = numpy.float32).reshape((ny, nx))   # [m2]
-        grid = numpy.flip(grid, axis = 0)                                       # [m2]
-        grid /= float(px * px)                                                  # [fraction]
-        grid *= 255.0                                                           # [colour level]
-        numpy.place(grid, grid > 255.0, 255.0)                                  # [colour level]
-        numpy.place(grid, grid <   0.0,   0.0)                                  # [colour level]
-        pyguymer3.image.save_array_as_image(
-            grid,
+        #       Therefore, the y-axis is flipped when the raster is saved as a
+        #       PNG.
+        hml.Raster(bname).toPNG(
             iname,
                  ct = "turbo",
               debug = args.debug,
@@ -363,15 +374,16 @@ if __name__ == "__main__":
         (54.779, -1.583, "Durham Train Station"     , "durham"     ),           # [°], [°]
     ]
 
-    # Load grid ...
-    grid = numpy.fromfile("merged.bin", dtype = numpy.float32).reshape((ny, nx))# [m2]
+    # Open merged raster and memory-map it ...
+    merged = hml.Raster("merged.hml")
+    grid = merged.grid                                                          # [m2]
 
     # Make a coloured version (with an alpha channel to hide pixels with no, or
     # little, open land) ...
-    colouredGrid = numpy.zeros((ny, nx, 4), dtype = numpy.uint8)
-    for iy in range(ny):
-        for ix in range(nx):
-            level = min(255, max(0, round(255.0 * grid[iy, ix] / float(px * px))))
+    colouredGrid = numpy.zeros((merged.ny, merged.nx, 4), dtype = numpy.uint8)
+    for iy in range(merged.ny):
+        for ix in range(merged.nx):
+            level = min(255, max(0, round(255.0 * grid[iy, ix] / (merged.px * merged.px))))
             colouredGrid[iy, ix, 0] = colourTables["turbo"][level][0]
             colouredGrid[iy, ix, 1] = colourTables["turbo"][level][1]
             colouredGrid[iy, ix, 2] = colourTables["turbo"][level][2]
@@ -381,8 +393,8 @@ if __name__ == "__main__":
 
     # Loop over locations ...
     for lat, lon, title, stub in locs:
-        # Skip this plot if it already exists ...
-        if os.path.exists(f"{stub}.png"):
+        # Skip this plot if it already exists (and is up-to-date) ...
+        if not updated and os.path.exists(f"{stub}.png"):
             continue
 
         print(f"Making \"{stub}.png\" ...")
@@ -413,7 +425,7 @@ if __name__ == "__main__":
         # Draw data ...
         ax.imshow(
             colouredGrid,
-                   extent = [0.0, nx * px, 0.0, ny * px],
+                   extent = merged.extent,
                    origin = "lower",
                 transform = cartopy.crs.OSGB(),
         )
@@ -447,8 +459,8 @@ if __name__ == "__main__":
 
     # Loop over locations ...
     for lat, lon, title, stub in locs:
-        # Skip this CSV if it already exists ...
-        if os.path.exists(f"{stub}.csv"):
+        # Skip this CSV if it already exists (and is up-to-date) ...
+        if not updated and os.path.exists(f"{stub}.csv"):
             continue
 
         print(f"Making \"{stub}.csv\" ...")
@@ -460,6 +472,11 @@ if __name__ == "__main__":
             debug = args.debug,
         )
 
+        # Find out how much open land there is within all of the circles in
+        # one pass over the window of the merged raster which contains the
+        # largest circle ...
+        tots = merged.radialProfile(pointEN.x, pointEN.y, radii)                # [m2]
+
         # Open output file ...
         with open(f"{stub}.csv", "wt", encoding = "utf-8") as fObj:
             # Write header ...
@@ -467,21 +484,8 @@ if __name__ == "__main__":
 
             # Loop over radii (except the first one) ...
             for ir in range(1, nr):
-                # Find out how much open land there is within this circle ...
-                tot = hml.f90.funcs.sumimagewithincircle(
-                    ndiv = ndiv,
-                    xmin = 0.0,
-                    xmax = float(nx * px),
-                    ymin = 0.0,
-                    ymax = float(ny * px),
-                       r = radii[ir],
-                      cx = pointEN.x,
-                      cy = pointEN.y,
-                     img = grid,
-                )
-
                 # Save total to the CSV ...
-                fObj.write(f"{radii[ir]:.15e},{tot:.15e}\n")
+                fObj.write(f"{radii[ir]:.15e},{tots[ir]:.15e}\n")
 
     # **************************************************************************
 
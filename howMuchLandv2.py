@@ -50,7 +50,6 @@ if __name__ == "__main__":
 
     # Import my modules ...
     import hml
-    import hml.f90
     try:
         import pyguymer3
         import pyguymer3.geo
@@ -81,15 +80,8 @@ if __name__ == "__main__":
 
     # **************************************************************************
 
-    # Set pixel size, number of sub-divisions and extent of grid ...
-    px = 128                                                                    # [m]
-    ndiv = 128                                                                  # [#]
-    nx = 5200                                                                   # [#]
-    ny = 5200                                                                   # [#]
-
-    # Use mode to override number of sub-divisions ...
-    if args.debug:
-        ndiv = 16                                                               # [#]
+    # Open the merged raster (which is made by "howMuchLandv1.py") ...
+    merged = hml.Raster("merged.hml")
 
     # **************************************************************************
 
@@ -235,7 +227,7 @@ if __name__ == "__main__":
     #       first 3 channels.
     ax.imshow(
         matplotlib.pyplot.imread("merged.png")[:, :, :3],
-           extent = [0.0, 128.0 * 5200.0, 0.0, 128.0 * 5200.0],
+           extent = merged.extent,
            origin = "upper",
         transform = cartopy.crs.OSGB(),
     )
@@ -260,41 +252,37 @@ if __name__ == "__main__":
 
     # **************************************************************************
 
-    # Load grid ...
-    grid = numpy.fromfile("merged.bin", dtype = numpy.float32).reshape((ny, nx))# [m2]
-
     # Make radii ...
     radii = numpy.linspace(0.0, 50.0e3, num = 6)                                # [m]
 
-    # Loop over stations ...
-    for name in names:
-        print(f"Integrating around \"{name}\" ...")
+    # Deduce key names ...
+    radiusKeys = [f"{round(radii[ir]):,d}m" for ir in range(1, radii.size)]
 
-        # Initialize dictionary ...
+    # Find the stations which are missing any integrals ...
+    todo = []
+    for name in names:
         if "integrals" not in data[name]:
             data[name]["integrals"] = {}
-
-        # Loop over radii (except the first one) ...
-        for ir in range(1, radii.size):
-            # Deduce key name and skip if it already exists ...
-            key = f"{round(radii[ir]):,d}m"
-            if key in data[name]["integrals"]:
-                continue
-
-            print(f" > {key} ...")
-
-            # Find out how much open land there is within this circle ...
-            data[name]["integrals"][key] = hml.f90.funcs.sumimagewithincircle(
-                  cx = float(data[name]["easting"]),
-                  cy = float(data[name]["northing"]),
-                 img = grid,
-                ndiv = ndiv,
-                   r = radii[ir],
-                xmax = float(nx * px),
-                xmin = 0.0,
-                ymax = float(ny * px),
-                ymin = 0.0,
-            )                                                                   # [m2]
+        if any(key not in data[name]["integrals"] for key in radiusKeys):
+            todo.append(name)
+
+    # Check if there are any stations to integrate around ...
+    if len(todo) > 0:
+        print(f"Integrating around {len(todo):,d} stations ...")
+
+        # Find out how much open land there is within all of the circles
+        # around all of the stations at once ...
+        tots = merged.sumWithinCircles(
+            [float(data[name]["easting"]) for name in todo],
+            [float(data[name]["northing"]) for name in todo],
+            radii[1:],
+        )                                                                       # [m2]
+
+        # Loop over stations and radii (except the first one) ...
+        for ic, name in enumerate(todo):
+            for ir, key in enumerate(radiusKeys):
+                # Save total to the database ...
+                data[name]["integrals"][key] = float(tots[ic, ir])              # [m2]
 
     # Save database ...
     with open("howMuchLandv2.json", "wt", encoding = "utf-8") as fObj:
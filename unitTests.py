@@ -2,6 +2,7 @@
 
 # Import standard modules ...
 import math
+import sys
 import unittest
 
 # Import my modules ...
@@ -13,6 +14,171 @@ class MyTestCase(unittest.TestCase):
     Test the module "hml"
     """
 
+    # Define a test ...
+    def test_convolveImageWithCircle(self):
+        """
+        Test the function "hml.convolveImageWithCircle()"
+        """
+
+        # Import special modules ...
+        import numpy
+
+        # Create an image with some empty pixels (and an empty corner, so that
+        # some tiles are skipped) ...
+        img = numpy.random.default_rng(0).random((30, 40))
+        numpy.place(img, img < 0.3, 0.0)
+        img[:8, :8] = 0.0
+
+        # Loop over radii (including one which is smaller than a pixel and one
+        # which is bigger than a tile) ...
+        for r in [30.0, 350.0, 1200.0]:
+            # Convolve the image with the circle (using small tiles) ...
+            tots = hml.convolveImageWithCircle(img, r, px = 100.0, tileSize = 8)
+
+            # Loop over some pixels (including ones on the edges of the
+            # image) ...
+            for iy, ix in [(0, 0), (3, 5), (15, 20), (29, 39), (7, 8)]:
+                # Assert result ...
+                self.assertAlmostEqual(
+                    float(tots[iy, ix]),
+                    hml.sumImageWithinCircle(img, 0.0, 4000.0, 0.0, 3000.0, r, cx = 100.0 * ix + 50.0, cy = 100.0 * iy + 50.0),
+                )
+
+    # Define a test ...
+    def test_findAreaOfRectangleWithinCircle(self):
+        """
+        Test the function "hml.findAreaOfRectangleWithinCircle()"
+        """
+
+        # Import special modules ...
+        import numpy
+
+        # Assert results ...
+        self.assertAlmostEqual(
+            hml.findAreaOfRectangleWithinCircle(0.0, 1.0, 0.0, 1.0, 1.0),
+            math.pi / 4.0,
+            places = 12,
+        )
+        self.assertAlmostEqual(
+            hml.findAreaOfRectangleWithinCircle(-2.0, 2.0, -2.0, 2.0, 1.0),
+            math.pi,
+            places = 12,
+        )
+        self.assertAlmostEqual(
+            hml.findAreaOfRectangleWithinCircle(3.0, 4.0, 3.0, 4.0, 1.0),
+            0.0,
+            places = 12,
+        )
+
+        # Assert results (for half of the circle and for the segment of the
+        # circle beyond x = 0.5) ...
+        self.assertTrue(
+            numpy.allclose(
+                hml.findAreaOfRectangleWithinCircle(
+                    numpy.array([0.0, 0.5]),
+                    numpy.array([2.0, 2.0]),
+                    -2.0,
+                    2.0,
+                    1.0,
+                ),
+                [math.pi / 2.0, math.pi / 3.0 - math.sqrt(3.0) / 4.0],
+                rtol = 0.0,
+                atol = 1.0e-12,
+            )
+        )
+
+    # Define a test ...
+    def test_findCircleKernel(self):
+        """
+        Test the function "hml.findCircleKernel()"
+        """
+
+        # Import standard modules ...
+        import tempfile
+
+        # Import special modules ...
+        import numpy
+
+        # Loop over radii (including one which is smaller than a pixel) ...
+        for r in [30.0, 350.0, 1200.0]:
+            # Loop over offsets (including ones which are rounded) ...
+            for ox, oy in [(0.5, 0.5), (0.0, 0.75), (0.3, 0.9)]:
+                # Find the kernel ...
+                kernel = hml.findCircleKernel(r, nq = 8, ox = ox, oy = oy, px = 100.0)
+
+                # Assert results ...
+                self.assertEqual(kernel.shape, (2 * math.ceil(r / 100.0) + 1, 2 * math.ceil(r / 100.0) + 1))
+                self.assertAlmostEqual(float(kernel.sum()), math.pi * r * r / 1.0e4)
+                self.assertIs(kernel, hml.findCircleKernel(r, nq = 8, ox = round(8 * ox) / 8.0, oy = round(8 * oy) / 8.0, px = 100.0))
+                self.assertFalse(kernel.flags.writeable)
+
+        # Assert that the cache is limited by the total size of the kernels
+        # (where this kernel is 11x11 float64 values) ...
+        kernel = hml.findCircleKernel(500.0, maxBytes = 2 * 11 * 11 * 8, px = 100.0)
+        self.assertEqual(kernel.nbytes, 11 * 11 * 8)
+        self.assertLessEqual(sum(cached.nbytes for cached in sys.modules["hml.findCircleKernel"].circleKernels.values()), 2 * 11 * 11 * 8)
+        self.assertIs(kernel, hml.findCircleKernel(500.0, px = 100.0))
+
+        # Create a temporary directory ...
+        with tempfile.TemporaryDirectory() as tname:
+            # Find a kernel (which saves it in the directory) and then find it
+            # again (which loads it from the directory, as it is not cached in
+            # RAM any more) ...
+            kernel = hml.findCircleKernel(250.0, cacheDir = tname, nq = 0, ox = 0.1, oy = 0.2, px = 100.0)
+            hml.findCircleKernel(500.0, maxBytes = 0, px = 100.0)
+
+            # Assert results ...
+            self.assertTrue(numpy.array_equal(kernel, hml.findCircleKernel(250.0, cacheDir = tname, nq = 0, ox = 0.1, oy = 0.2, px = 100.0)))
+
+    # Define a test ...
+    def test_findExtent(self):
+        """
+        Test the function "hml.findExtent()"
+        """
+
+        # Import standard modules ...
+        import io
+        import tempfile
+
+        # Import special modules ...
+        import shapefile
+
+        # Create a ShapeFile in RAM with two triangles in it ...
+        dbfObj = io.BytesIO()
+        shpObj = io.BytesIO()
+        shxObj = io.BytesIO()
+        with shapefile.Writer(dbf = dbfObj, shp = shpObj, shx = shxObj, shapeType = shapefile.POLYGON) as sfObj:
+            sfObj.field("NAME", "C")
+            sfObj.poly([[[1000.0, 2000.0], [1000.0, 3000.0], [4000.0, 2000.0], [1000.0, 2000.0]]])
+            sfObj.record("first")
+            sfObj.poly([[[5000.0, 6000.0], [5000.0, 8000.0], [7000.0, 6000.0], [5000.0, 6000.0]]])
+            sfObj.record("second")
+
+        # Loop over ways of finding the extent ...
+        for validate in [False, True]:
+            # Assert results ...
+            self.assertEqual(
+                hml.findExtent(
+                    shapefile.Reader(dbf = dbfObj, shp = shpObj, shx = shxObj),
+                    validate = validate,
+                ),
+                (1000.0, 2000.0, 7000.0, 8000.0),
+            )
+
+        # Create a temporary directory ...
+        with tempfile.TemporaryDirectory() as tname:
+            # Save the ShapeFile to disk ...
+            for ext, fObj in [("dbf", dbfObj), ("shp", shpObj), ("shx", shxObj)]:
+                with open(f"{tname}/test.{ext}", "wb") as gObj:
+                    gObj.write(fObj.getvalue())
+
+            # Assert results (where the ".shp" file is memory-mapped) ...
+            with shapefile.Reader(f"{tname}/test") as sfObj:
+                self.assertEqual(
+                    hml.findExtent(sfObj, validate = True),
+                    (1000.0, 2000.0, 7000.0, 8000.0),
+                )
+
     # Define a test ...
     def test_findFractionOfPixelWithinCircle(self):
         """
@@ -29,7 +195,7 @@ class MyTestCase(unittest.TestCase):
                 1.0,
             ),
             math.pi / 4.0,
-            places = 1,
+            places = 12,
         )
         self.assertAlmostEqual(
             hml.findFractionOfPixelWithinCircle(
@@ -56,7 +222,7 @@ class MyTestCase(unittest.TestCase):
                 cy = 0.5,
             ),
             math.pi * pow(0.5, 2),
-            places = 1,
+            places = 12,
         )
         self.assertAlmostEqual(
             hml.findFractionOfPixelWithinCircle(
@@ -73,6 +239,877 @@ class MyTestCase(unittest.TestCase):
             places = 3,
         )
 
+    # Define a test ...
+    def test_findFractionOfPixelsWithinCircle(self):
+        """
+        Test the function "hml.findFractionOfPixelsWithinCircle()"
+        """
+
+        # Import special modules ...
+        import numpy
+
+        # Create some pixels (which are inside, outside and straddling the
+        # circle) ...
+        rng = numpy.random.default_rng(0)
+        xmin = rng.uniform(-2.0, 1.0, size = 50)
+        ymin = rng.uniform(-2.0, 1.0, size = 50)
+        xmax = xmin + rng.uniform(0.1, 1.0, size = 50)
+        ymax = ymin + rng.uniform(0.1, 1.0, size = 50)
+
+        # Loop over numbers of sub-divisions ...
+        for ndiv in [0, 16]:
+            # Find the fractions of all of the pixels at once (in small chunks
+            # when sub-dividing) ...
+            fracs = hml.findFractionOfPixelsWithinCircle(
+                xmin,
+                xmax,
+                ymin,
+                ymax,
+                1.3,
+                chunkSize = 1000,
+                       cx = 0.2,
+                       cy = -0.1,
+                     ndiv = ndiv,
+            )
+
+            # Assert results ...
+            self.assertEqual(fracs.shape, (50,))
+            for i in range(50):
+                self.assertAlmostEqual(
+                    fracs[i],
+                    hml.findFractionOfPixelWithinCircle(
+                        xmin[i],
+                        xmax[i],
+                        ymin[i],
+                        ymax[i],
+                        1.3,
+                          cx = 0.2,
+                          cy = -0.1,
+                        ndiv = ndiv,
+                    ),
+                )
+
+    # Define a test ...
+    def test_queryRaster(self):
+        """
+        Test the function "hml.queryRaster()"
+        """
+
+        # Import standard modules ...
+        import asyncio
+        import functools
+        import json
+        import tempfile
+
+        # Import special modules ...
+        import numpy
+
+        # Create an image with some empty pixels ...
+        img = numpy.random.default_rng(0).random((30, 40)).astype(numpy.float32)
+        numpy.place(img, img < 0.3, 0.0)
+
+        # Create a temporary directory ...
+        with tempfile.TemporaryDirectory() as tname:
+            # Save the image and load it again ...
+            hml.saveRaster(f"{tname}/test.hml", img, compression = "none", px = 100.0, x0 = 1000.0, y0 = 2000.0)
+            header = hml.loadRasterHeader(f"{tname}/test.hml")
+            grid = hml.loadRaster(f"{tname}/test.hml")
+
+            # Find the answers the slow way ...
+            ans1 = hml.sumImageWithinCircle(img, 1000.0, 5000.0, 2000.0, 5000.0, 800.0, cx = 3050.0, cy = 3450.0, method = "loop")
+            ans2 = hml.sumImageWithinCircle(img, 1000.0, 5000.0, 2000.0, 5000.0, 1500.0, cx = 3050.0, cy = 3450.0, method = "loop")
+
+            # Assert results ...
+            self.assertAlmostEqual(
+                hml.queryRaster({"easting" : 3050.0, "northing" : 3450.0, "radius" : 800.0}, grid, header)["area"],
+                ans1,
+            )
+            answer = hml.queryRaster({"queries" : [{"easting" : 3050.0, "northing" : 3450.0, "radius" : [800.0, 1500.0]}]}, grid, header)
+            self.assertAlmostEqual(answer["answers"][0]["area"][0], ans1)
+            self.assertAlmostEqual(answer["answers"][0]["area"][1], ans2)
+            with self.assertRaises(ValueError):
+                hml.queryRaster({"easting" : 3050.0, "northing" : 3450.0}, grid, header)
+            with self.assertRaises(ValueError):
+                hml.queryRaster({"lat" : 51.5, "lon" : -0.1, "radius" : 800.0}, grid, header)
+
+            # Create event loop and serve requests on a Unix socket ...
+            loop = asyncio.new_event_loop()
+            server = loop.run_until_complete(
+                asyncio.start_unix_server(
+                    functools.partial(hml.handleRasterConnection, grid, header, pyramid = hml.makePyramid(grid)),
+                    path = f"{tname}/test.sock",
+                )
+            )
+
+            # Send a GET request and then a POST request (which closes the
+            # connection) on the same connection and read both responses ...
+            body = json.dumps({"easting" : 3050.0, "northing" : 3450.0, "radius" : 1500.0}).encode("utf-8")
+            reader, writer = loop.run_until_complete(asyncio.open_unix_connection(path = f"{tname}/test.sock"))
+            writer.write(b"GET /?easting=3050&northing=3450&radius=800&radius=1500 HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            writer.write(f"POST / HTTP/1.1\r\nContent-Length: {len(body):d}\r\nConnection: close\r\n\r\n".encode("ascii") + body)
+            data = loop.run_until_complete(reader.read())
+
+            # Clean up ...
+            writer.close()
+            server.close()
+            loop.run_until_complete(server.wait_closed())
+            loop.close()
+
+            # Split the responses ...
+            head1, rest, body2 = data.split(b"\r\n\r\n")
+            body1 = rest[:int(head1.split(b"Content-Length: ")[1])]
+
+            # Assert results ...
+            self.assertTrue(head1.startswith(b"HTTP/1.1 200 OK"))
+            self.assertAlmostEqual(json.loads(body1)["area"][0], ans1)
+            self.assertAlmostEqual(json.loads(body1)["area"][1], ans2)
+            self.assertAlmostEqual(json.loads(body2)["area"], ans2)
+
+    # Define a test ...
+    def test_radialProfile(self):
+        """
+        Test the function "hml.radialProfile()"
+        """
+
+        # Import special modules ...
+        import numpy
+
+        # Create an image with some empty pixels ...
+        img = numpy.random.default_rng(0).random((30, 40))
+        numpy.place(img, img < 0.3, 0.0)
+
+        # Define some radii (which are not in order) ...
+        radii = numpy.array([800.0, 0.0, 2500.0, 30.0, 1600.0, 9000.0])
+
+        # Loop over centres (including ones which are in the middle of a pixel,
+        # on the corner of a pixel and off the edge of the image) ...
+        for cx, cy in [(2050.0, 1450.0), (2000.0, 1500.0), (-300.0, 1000.0)]:
+            # Find the sums within all of the circles at once ...
+            tots = hml.radialProfile(img, 0.0, 4000.0, 0.0, 3000.0, radii, cx = cx, cy = cy)
+
+            # Assert results ...
+            for r, tot in zip(radii, tots):
+                self.assertAlmostEqual(
+                    tot,
+                    hml.sumImageWithinCircle(img, 0.0, 4000.0, 0.0, 3000.0, r, cx = cx, cy = cy),
+                )
+
+    # Define a test ...
+    def test_Raster(self):
+        """
+        Test the class "hml.Raster"
+        """
+
+        # Import standard modules ...
+        import tempfile
+
+        # Import special modules ...
+        import numpy
+
+        # Create an image with some empty pixels ...
+        img = numpy.random.default_rng(0).random((30, 40)).astype(numpy.float32)
+        numpy.place(img, img < 0.3, 0.0)
+
+        # Create a temporary directory ...
+        with tempfile.TemporaryDirectory() as tname:
+            # Loop over compressions ...
+            for compression in ["none", "zlib"]:
+                # Save the image and open it ...
+                hml.saveRaster(
+                    f"{tname}/test.hml",
+                    img,
+                    compression = compression,
+                            crs = "EPSG:27700",
+                             px = 100.0,
+                       tileSize = 16,
+                             x0 = 1000.0,
+                             y0 = 2000.0,
+                )
+                raster = hml.Raster(f"{tname}/test.hml")
+
+                # Assert results ...
+                self.assertEqual(raster.crs, "EPSG:27700")
+                self.assertEqual(raster.extent, [1000.0, 5000.0, 2000.0, 5000.0])
+                self.assertAlmostEqual(raster.sum(bandSize = 7), float(img.sum(dtype = numpy.float64)), places = 4)
+
+                # Assert that summing a compressed raster did not decompress all
+                # of it at once ...
+                if compression == "zlib":
+                    self.assertIsNone(raster.loadedGrid)
+
+                # Load a window and assert results ...
+                window, extent = raster.window(1750.0, 2300.0, 1000.0, 2450.0)
+                self.assertEqual(extent, [1700.0, 2300.0, 2000.0, 2500.0])
+                self.assertTrue(numpy.array_equal(window, img[:5, 7:13]))
+                self.assertEqual(raster.window(-9000.0, -8000.0, 2000.0, 3000.0)[0].size, 0)
+
+                # Sum the raster within circles and assert results ...
+                self.assertAlmostEqual(
+                    raster.sumWithinCircle(3050.0, 3450.0, 800.0),
+                    hml.sumImageWithinCircle(img, 1000.0, 5000.0, 2000.0, 5000.0, 800.0, cx = 3050.0, cy = 3450.0),
+                )
+                self.assertEqual(raster.sumWithinCircle(-9000.0, 3450.0, 800.0), 0.0)
+                tots = raster.radialProfile(3050.0, 3450.0, [800.0, 1500.0])
+                self.assertAlmostEqual(tots[1], hml.sumImageWithinCircle(img, 1000.0, 5000.0, 2000.0, 5000.0, 1500.0, cx = 3050.0, cy = 3450.0))
+                self.assertTrue(numpy.allclose(raster.sumWithinCircles([3050.0], [3450.0], [800.0, 1500.0])[0, :], tots))
+                self.assertTrue(
+                    numpy.allclose(
+                        raster.sumWithinCircles([1550.0, 3050.0, 5200.0], [2450.0, 3450.0, 4800.0], [300.0, 800.0]),
+                        hml.sumImageWithinCircles(img, 1000.0, 5000.0, 2000.0, 5000.0, [1550.0, 3050.0, 5200.0], [2450.0, 3450.0, 4800.0], [300.0, 800.0]),
+                    )
+                )
+                self.assertTrue(numpy.array_equal(raster.sumWithinCircles([-9000.0], [3450.0], [800.0]), numpy.zeros((1, 1))))
+
+                # Do some arithmetic and assert results ...
+                total = raster.add(f"{tname}/total.hml", raster, raster.multiply(f"{tname}/double.hml", 2.0, bandSize = 7), bandSize = 7)
+                self.assertEqual(total.extent, raster.extent)
+                self.assertTrue(numpy.allclose(total.grid, 4.0 * img))
+
+    # Define a test ...
+    def test_rasterizePolygon(self):
+        """
+        Test the function "hml.rasterizePolygon()"
+        """
+
+        # Import special modules ...
+        import numpy
+        import shapely
+        import shapely.geometry
+
+        # Create a Polygon with a hole in it ...
+        poly = shapely.geometry.polygon.Polygon(
+            [
+                ( 1000.0,  1000.0),
+                (11000.0,  1500.0),
+                ( 9000.0, 12000.0),
+                ( 1000.0,  1000.0),
+            ],
+            [
+                [
+                    (6000.0, 4000.0),
+                    (5000.0, 6000.0),
+                    (7000.0, 6000.0),
+                    (6000.0, 4000.0),
+                ],
+            ],
+        )
+
+        # Rasterize the Polygon using the slow method ...
+        ix1, iy1, localGrid = hml.rasterizePolygon(
+            poly,
+            method = "loop",
+                px = 512.0,
+        )
+
+        # Assert results ...
+        self.assertAlmostEqual(
+            float(localGrid.sum(dtype = numpy.float64)),
+            poly.area,
+            delta = 1.0,
+        )
+
+        # Loop over methods ...
+        for method in ["quadtree", "vectorized"]:
+            # Assert results ...
+            self.assertEqual(
+                hml.rasterizePolygon(
+                    poly,
+                    method = method,
+                        px = 512.0,
+                )[:2],
+                (ix1, iy1),
+            )
+            self.assertTrue(
+                numpy.array_equal(
+                    hml.rasterizePolygon(
+                        poly,
+                        method = method,
+                            px = 512.0,
+                    )[2],
+                    localGrid,
+                )
+            )
+
+        # Assert results ...
+        self.assertTrue(
+            numpy.allclose(
+                hml.rasterizePolygon(
+                    poly,
+                    method = "analytic",
+                        px = 512.0,
+                )[2],
+                localGrid,
+                atol = 1.0e-2,
+                rtol = 1.0e-6,
+            )
+        )
+
+    # Define a test ...
+    def test_rasterizeShapefile(self):
+        """
+        Test the function "hml.rasterizeShapefile()"
+        """
+
+        # Import standard modules ...
+        import io
+        import tempfile
+
+        # Import special modules ...
+        import numpy
+        import shapefile
+
+        # Create a ShapeFile in RAM with a triangle and a square with a hole in
+        # it ...
+        dbfObj = io.BytesIO()
+        shpObj = io.BytesIO()
+        shxObj = io.BytesIO()
+        with shapefile.Writer(dbf = dbfObj, shp = shpObj, shx = shxObj, shapeType = shapefile.POLYGON) as sfObj:
+            sfObj.field("NAME", "C")
+            sfObj.poly(
+                [
+                    [
+                        [ 1000.0,  1000.0],
+                        [ 1000.0,  9000.0],
+                        [ 9000.0,  5000.0],
+                        [ 1000.0,  1000.0],
+                    ],
+                ]
+            )
+            sfObj.record("triangle")
+            sfObj.poly(
+                [
+                    [
+                        [20000.0, 20000.0],
+                        [20000.0, 30000.0],
+                        [30000.0, 30000.0],
+                        [30000.0, 20000.0],
+                        [20000.0, 20000.0],
+                    ],
+                    [
+                        [22000.0, 22000.0],
+                        [28000.0, 22000.0],
+                        [28000.0, 28000.0],
+                        [22000.0, 22000.0],
+                    ],
+                ]
+            )
+            sfObj.record("square")
+
+        # Loop over ways of storing the global grid ...
+        for shared in [False, True]:
+            # Loop over ways of splitting the global grid ...
+            for tileSize in [None, 16]:
+                # Loop over methods ...
+                for method in ["analytic", "vectorized"]:
+                    # Rasterize the ShapeFile ...
+                    grid = hml.rasterizeShapefile(
+                        shapefile.Reader(dbf = dbfObj, shp = shpObj, shx = shxObj),
+                        maxInFlight = 1,
+                                 nx = 64,
+                                 ny = 64,
+                                 px = 512.0,
+                             method = method,
+                             shared = shared,
+                           tileSize = tileSize,
+                    )
+
+                    # Assert results ...
+                    self.assertEqual(grid.shape, (64, 64))
+                    self.assertAlmostEqual(
+                        float(grid.sum(dtype = numpy.float64)),
+                        32.0e6 + 82.0e6,
+                        delta = 1.0,
+                    )
+
+        # Rasterize the ShapeFile with every [Multi]Polygon in its own batch
+        # and with all of them in one batch ...
+        grids = []
+        for maxVertices in [1, 65536]:
+            grids.append(
+                hml.rasterizeShapefile(
+                    shapefile.Reader(dbf = dbfObj, shp = shpObj, shx = shxObj),
+                    maxInFlight = 1,
+                    maxVertices = maxVertices,
+                             nx = 64,
+                             ny = 64,
+                             px = 512.0,
+                         method = "vectorized",
+                )
+            )
+
+        # Assert results ...
+        self.assertTrue(numpy.array_equal(grids[0], grids[1]))
+
+        # Create a ShapeFile in RAM with two squares which overlap each
+        # other ...
+        dbfObj2 = io.BytesIO()
+        shpObj2 = io.BytesIO()
+        shxObj2 = io.BytesIO()
+        with shapefile.Writer(dbf = dbfObj2, shp = shpObj2, shx = shxObj2, shapeType = shapefile.POLYGON) as sfObj:
+            sfObj.field("NAME", "C")
+            for x0, y0 in [(1000.0, 1000.0), (5000.0, 5000.0)]:
+                sfObj.poly(
+                    [
+                        [
+                            [x0         , y0         ],
+                            [x0         , y0 + 8000.0],
+                            [x0 + 8000.0, y0 + 8000.0],
+                            [x0 + 8000.0, y0         ],
+                            [x0         , y0         ],
+                        ],
+                    ]
+                )
+                sfObj.record("square")
+
+        # Loop over methods ...
+        for method in ["analytic", "vectorized"]:
+            # Rasterize the ShapeFile with and without splitting the global
+            # grid into tiles ...
+            grids2 = []
+            for tileSize in [None, 16]:
+                grids2.append(
+                    hml.rasterizeShapefile(
+                        shapefile.Reader(dbf = dbfObj2, shp = shpObj2, shx = shxObj2),
+                        maxInFlight = 1,
+                                 nx = 64,
+                                 ny = 64,
+                                 px = 512.0,
+                             method = method,
+                           tileSize = tileSize,
+                    )
+                )
+
+            # Assert results ...
+            self.assertAlmostEqual(
+                float(grids2[1].sum(dtype = numpy.float64)),
+                128.0e6,
+                delta = 1.0,
+            )
+            self.assertTrue(numpy.allclose(grids2[0], grids2[1], atol = 1.0e-2))
+
+        # Create a temporary directory ...
+        with tempfile.TemporaryDirectory() as tname:
+            # Save the ShapeFile as a geometry store and rasterize it ...
+            hml.ingestShapefile(
+                shapefile.Reader(dbf = dbfObj, shp = shpObj, shx = shxObj),
+                f"{tname}/test.geom",
+            )
+            grid = hml.rasterizeShapefile(
+                f"{tname}/test.geom",
+                maxInFlight = 1,
+                         nx = 64,
+                         ny = 64,
+                         px = 512.0,
+            )
+
+            # Assert results ...
+            self.assertEqual(grid.shape, (64, 64))
+            self.assertAlmostEqual(
+                float(grid.sum(dtype = numpy.float64)),
+                32.0e6 + 82.0e6,
+                delta = 1.0,
+            )
+
+            # Loop over ways of storing the global grid ...
+            for shared in [False, True]:
+                # Create a file with a header and some rubbish where the
+                # global grid will go ...
+                with open(f"{tname}/test.bin", "wb") as fObj:
+                    fObj.write(b"\xff" * (128 + 4 * 64 * 64))
+
+                # Rasterize the ShapeFile into the file ...
+                hml.rasterizeShapefile(
+                    shapefile.Reader(dbf = dbfObj, shp = shpObj, shx = shxObj),
+                          fname = f"{tname}/test.bin",
+                    maxInFlight = 1,
+                             nx = 64,
+                             ny = 64,
+                         offset = 128,
+                             px = 512.0,
+                         method = "vectorized",
+                         shared = shared,
+                )
+
+                # Assert results ...
+                with open(f"{tname}/test.bin", "rb") as fObj:
+                    self.assertEqual(fObj.read(128), b"\xff" * 128)
+                    self.assertTrue(
+                        numpy.array_equal(
+                            numpy.frombuffer(fObj.read(), dtype = numpy.float32).reshape(64, 64),
+                            grids[1],
+                        )
+                    )
+
+    # Define a test ...
+    def test_saveRaster(self):
+        """
+        Test the function "hml.saveRaster()"
+        """
+
+        # Import standard modules ...
+        import tempfile
+
+        # Import special modules ...
+        import numpy
+
+        # Create a grid which does not divide into whole tiles ...
+        grid = numpy.arange(40 * 50, dtype = numpy.float32).reshape((40, 50))
+
+        # Create a temporary directory ...
+        with tempfile.TemporaryDirectory() as tname:
+            # Loop over compressions ...
+            for compression in ["none", "zlib"]:
+                # Save the grid ...
+                hml.saveRaster(
+                    f"{tname}/test.hml",
+                    grid,
+                    compression = compression,
+                            crs = "EPSG:27700",
+                             px = 512.0,
+                       tileSize = 16,
+                )
+
+                # Assert results ...
+                header = hml.loadRasterHeader(f"{tname}/test.hml")
+                self.assertEqual(header["compression"], compression)
+                self.assertEqual(header["crs"], "EPSG:27700")
+                self.assertEqual(header["dataOffset"] % 4096, 0)
+                self.assertEqual(header["shape"], [40, 50])
+                self.assertTrue(
+                    numpy.array_equal(hml.loadRaster(f"{tname}/test.hml"), grid)
+                )
+                self.assertTrue(
+                    numpy.array_equal(
+                        hml.loadRaster(f"{tname}/test.hml", ix1 = 7, iy1 = 13, nx = 30, ny = 20),
+                        grid[13:33, 7:37],
+                    )
+                )
+                with self.assertRaises(ValueError):
+                    hml.loadRaster(f"{tname}/test.hml", ix1 = 40, nx = 20)
+
+            # Save a grid which cannot be compressed and assert results ...
+            grid = numpy.random.default_rng(0).random((40, 50))
+            hml.saveRaster(f"{tname}/test.hml", grid, tileSize = 16)
+            header = hml.loadRasterHeader(f"{tname}/test.hml")
+            self.assertEqual(header["dataOffset"] % 4096, 0)
+            self.assertEqual(header["tiles"][1][0], header["tiles"][0][1])
+            self.assertTrue(
+                numpy.array_equal(hml.loadRaster(f"{tname}/test.hml"), grid)
+            )
+
+    # Define a test ...
+    def test_splitPolygon(self):
+        """
+        Test the function "hml.splitPolygon()"
+        """
+
+        # Import special modules ...
+        import numpy
+        import shapely
+        import shapely.geometry
+
+        # Create a Polygon with a hole in it ...
+        poly = shapely.geometry.polygon.Polygon(
+            [
+                ( 1000.0,  1000.0),
+                (11000.0,  1500.0),
+                ( 9000.0, 12000.0),
+                ( 1000.0,  1000.0),
+            ],
+            [
+                [
+                    (6000.0, 4000.0),
+                    (5000.0, 6000.0),
+                    (7000.0, 6000.0),
+                    (6000.0, 4000.0),
+                ],
+            ],
+        )
+
+        # Assert result ...
+        self.assertEqual(hml.splitPolygon(poly, px = 512.0), [poly])
+
+        # Split the Polygon into strips ...
+        strips = hml.splitPolygon(poly, maxPixels = 60, px = 512.0)
+
+        # Assert results ...
+        self.assertGreater(len(strips), 1)
+        self.assertAlmostEqual(sum(strip.area for strip in strips), poly.area, delta = 1.0e-6)
+        self.assertAlmostEqual(shapely.union_all(strips).symmetric_difference(poly).area, 0.0, delta = 1.0e-6)
+        for strip in strips:
+            self.assertLessEqual(
+                (math.ceil(strip.bounds[2] / 512.0) - math.floor(strip.bounds[0] / 512.0)) * (math.ceil(strip.bounds[3] / 512.0) - math.floor(strip.bounds[1] / 512.0)),
+                60,
+            )
+
+        # Rasterize the Polygon and its strips ...
+        grids = []
+        for polys in [[poly], strips]:
+            grid = numpy.zeros((32, 32), dtype = numpy.float64)
+            for part in polys:
+                ix1, iy1, localGrid = hml.rasterizePolygon(part, px = 512.0)
+                grid[iy1:iy1 + localGrid.shape[0], ix1:ix1 + localGrid.shape[1]] += localGrid
+            grids.append(grid)
+
+        # Assert result ...
+        self.assertTrue(numpy.allclose(grids[0], grids[1], atol = 1.0e-2))
+
+    # Define a test ...
+    def test_sumImageWithinCircle(self):
+        """
+        Test the function "hml.sumImageWithinCircle()"
+        """
+
+        # Import standard modules ...
+        import importlib
+
+        # Import special modules ...
+        import numpy
+
+        # Create an image with some empty pixels ...
+        img = numpy.random.default_rng(0).random((30, 40))
+        numpy.place(img, img < 0.3, 0.0)
+
+        # Make the summed-area table ...
+        sat = hml.makeSummedAreaTable(img, bandSize = 7)
+
+        # Assert results ...
+        self.assertAlmostEqual(float(sat[-1, -1]), float(img.sum()))
+        self.assertAlmostEqual(float(sat[17, 23]), float(img[:17, :23].sum()))
+
+        # Make the pyramid of block sums ...
+        pyramid = hml.makePyramid(img, bandSize = 3)
+
+        # Assert results ...
+        self.assertEqual([level.shape for level in pyramid], [(30, 40), (15, 20), (8, 10), (4, 5), (2, 3), (1, 2), (1, 1)])
+        self.assertAlmostEqual(float(pyramid[-1][0, 0]), float(img.sum()))
+        self.assertAlmostEqual(float(pyramid[2][7, 9]), float(img[28:, 36:].sum()))
+
+        # Assert that an image with negative pixels (where blocks whose sums
+        # are zero are not empty) is rejected ...
+        with self.assertRaises(ValueError):
+            hml.makePyramid(numpy.array([[1.0, -1.0], [0.0, 0.0]]))
+
+        # Create list of methods (only testing the FORTRAN module if it has
+        # been compiled) ...
+        methods = ["kernel", "pyramid", "vectorized"]
+        try:
+            importlib.import_module("hml.f90")
+            methods.append("fortran")
+        except:
+            pass
+
+        # Loop over circles (including ones which are bigger than the image,
+        # smaller than a pixel and which are off the edge of the image) ...
+        for cx, cy, r in [(2000.0, 1500.0, 800.0), (0.0, 0.0, 9000.0), (2050.0, 1450.0, 30.0), (-300.0, 1000.0, 700.0)]:
+            # Find the answer the slow way ...
+            ans = hml.sumImageWithinCircle(img, 0.0, 4000.0, 0.0, 3000.0, r, cx = cx, cy = cy, method = "loop")
+
+            # Loop over methods (and whether the summed-area table is
+            # used) ...
+            for method in methods:
+                for table in [None, sat]:
+                    # Assert results ...
+                    self.assertAlmostEqual(
+                        hml.sumImageWithinCircle(img, 0.0, 4000.0, 0.0, 3000.0, r, cx = cx, cy = cy, method = method, pyramid = pyramid, sat = table),
+                        ans,
+                    )
+
+    # Define a test ...
+    def test_sumImageWithinCircleEdge(self):
+        """
+        Test the functions which sum an image within circles with circles which
+        cut into a pixel without reaching any of its corners
+        """
+
+        # Import standard modules ...
+        import importlib
+
+        # Import special modules ...
+        import numpy
+
+        # Create an image with only one pixel which is not empty ...
+        img = numpy.zeros((30, 40), dtype = numpy.float64)
+        img[10, 20] = 1.0
+
+        # Create list of methods (only testing the FORTRAN module if it has
+        # been compiled) ...
+        methods = ["loop", "vectorized"]
+        try:
+            importlib.import_module("hml.f90")
+            methods.append("fortran")
+        except:
+            pass
+
+        # Loop over circles (one which cuts a sliver off the bottom edge of
+        # the pixel and one which is entirely within the pixel) and their
+        # areas within the pixel ...
+        for cx, cy, r, area in [
+            (2050.0,  950.0, 60.0, 3600.0 * math.acos(50.0 / 60.0) - 50.0 * math.sqrt(3600.0 - 2500.0)),
+            (2050.0, 1050.0, 30.0, math.pi * 900.0),
+        ]:
+            # Loop over methods (and whether the summed-area table is
+            # used) ...
+            for method in methods:
+                for table in [None, hml.makeSummedAreaTable(img)]:
+                    # Assert result ...
+                    self.assertAlmostEqual(
+                        hml.sumImageWithinCircle(img, 0.0, 4000.0, 0.0, 3000.0, r, cx = cx, cy = cy, method = method, sat = table),
+                        area / 10000.0,
+                    )
+
+            # Assert results ...
+            self.assertAlmostEqual(
+                float(hml.radialProfile(img, 0.0, 4000.0, 0.0, 3000.0, numpy.array([r]), cx = cx, cy = cy)[0]),
+                area / 10000.0,
+            )
+            self.assertAlmostEqual(
+                float(hml.sumImageWithinCircles(img, 0.0, 4000.0, 0.0, 3000.0, [cx], [cy], [r])[0, 0]),
+                area / 10000.0,
+            )
+
+        # Create an image with some empty pixels ...
+        img = numpy.random.default_rng(0).random((30, 40))
+        numpy.place(img, img < 0.3, 0.0)
+
+        # Loop over circles whose centres are beyond the right edge, beyond
+        # the top-right corner and beyond the bottom-left corner of the
+        # image ...
+        for cx, cy, r in [
+            (4500.0, 1050.0, 600.0),
+            (4500.0, 3500.0, 800.0),
+            (-500.0, -500.0, 800.0),
+        ]:
+            # Find the answer by visiting every pixel ...
+            tot = hml.sumImageWithinCircle(img, 0.0, 4000.0, 0.0, 3000.0, r, cx = cx, cy = cy, method = "loop")
+
+            # Loop over methods (and whether the summed-area table is
+            # used) ...
+            for method in methods:
+                for table in [None, hml.makeSummedAreaTable(img)]:
+                    # Assert result ...
+                    self.assertAlmostEqual(
+                        hml.sumImageWithinCircle(img, 0.0, 4000.0, 0.0, 3000.0, r, cx = cx, cy = cy, method = method, sat = table),
+                        tot,
+                    )
+
+    # Define a test ...
+    def test_sumImageWithinCircles(self):
+        """
+        Test the function "hml.sumImageWithinCircles()"
+        """
+
+        # Import special modules ...
+        import numpy
+
+        # Create an image with some empty pixels ...
+        img = numpy.random.default_rng(0).random((30, 40))
+        numpy.place(img, img < 0.3, 0.0)
+
+        # Define some centres (including some beyond the edges and corners of
+        # the image) and radii ...
+        cx = [2050.0, 2000.0, -300.0, 3900.0, 4500.0, 4500.0, -500.0]
+        cy = [1450.0, 1500.0, 1000.0, 100.0, 1050.0, 3500.0, -500.0]
+        radii = [30.0, 800.0, 2500.0]
+
+        # Find the sums within all of the circles at once ...
+        tots = hml.sumImageWithinCircles(img, 0.0, 4000.0, 0.0, 3000.0, cx, cy, radii)
+
+        # Assert results ...
+        self.assertEqual(tots.shape, (7, 3))
+        for ic in range(7):
+            for ir in range(3):
+                self.assertAlmostEqual(
+                    tots[ic, ir],
+                    hml.sumImageWithinCircle(img, 0.0, 4000.0, 0.0, 3000.0, radii[ir], cx = cx[ic], cy = cy[ic]),
+                )
+
+    # Define a test ...
+    def test_updateRaster(self):
+        """
+        Test the function "hml.updateRaster()"
+        """
+
+        # Import standard modules ...
+        import io
+        import tempfile
+
+        # Import special modules ...
+        import numpy
+        import shapefile
+
+        # Define three triangles (with areas of 8e6 m2, 8e6 m2 and 18e6 m2) ...
+        triangles = [
+            [[[1000.0, 1000.0], [1000.0, 5000.0], [5000.0, 1000.0], [1000.0, 1000.0]]],
+            [[[9000.0, 9000.0], [9000.0, 13000.0], [13000.0, 9000.0], [9000.0, 9000.0]]],
+            [[[20000.0, 2000.0], [20000.0, 8000.0], [26000.0, 2000.0], [20000.0, 2000.0]]],
+        ]
+
+        # Create a temporary directory ...
+        with tempfile.TemporaryDirectory() as tname:
+            # Loop over versions of the ShapeFile (which lose the first
+            # triangle and gain the third one) ...
+            for version, (nAdded, nRemoved, area) in enumerate([(2, 0, 16.0e6), (1, 1, 26.0e6)]):
+                # Create a ShapeFile in RAM with two of the triangles in it ...
+                dbfObj = io.BytesIO()
+                shpObj = io.BytesIO()
+                shxObj = io.BytesIO()
+                with shapefile.Writer(dbf = dbfObj, shp = shpObj, shx = shxObj, shapeType = shapefile.POLYGON) as sfObj:
+                    sfObj.field("NAME", "C")
+                    for triangle in triangles[version:version + 2]:
+                        sfObj.poly(triangle)
+                        sfObj.record("triangle")
+
+                # Update the raster ...
+                # NOTE: The first version makes the raster from scratch.
+                self.assertEqual(
+                    hml.updateRaster(
+                        shapefile.Reader(dbf = dbfObj, shp = shpObj, shx = shxObj),
+                        f"{tname}/test.hml",
+                        nx = 64,
+                        ny = 64,
+                        px = 512.0,
+                    ),
+                    (nAdded, nRemoved),
+                )
+
+                # Assert results ...
+                self.assertAlmostEqual(
+                    float(hml.loadRaster(f"{tname}/test.hml").sum(dtype = numpy.float64)),
+                    area,
+                    delta = 1.0,
+                )
+
+            # Compress the raster and then update it (with a ShapeFile which
+            # gains the first triangle back and loses the third one) ...
+            hml.saveRaster(f"{tname}/test.hml", hml.loadRaster(f"{tname}/test.hml"), px = 512.0, tileSize = 16)
+            dbfObj = io.BytesIO()
+            shpObj = io.BytesIO()
+            shxObj = io.BytesIO()
+            with shapefile.Writer(dbf = dbfObj, shp = shpObj, shx = shxObj, shapeType = shapefile.POLYGON) as sfObj:
+                sfObj.field("NAME", "C")
+                for triangle in triangles[:2]:
+                    sfObj.poly(triangle)
+                    sfObj.record("triangle")
+            self.assertEqual(
+                hml.updateRaster(
+                    shapefile.Reader(dbf = dbfObj, shp = shpObj, shx = shxObj),
+                    f"{tname}/test.hml",
+                    nx = 64,
+                    ny = 64,
+                    px = 512.0,
+                ),
+                (1, 1),
+            )
+
+            # Assert results (the raster is still compressed) ...
+            self.assertEqual(hml.loadRasterHeader(f"{tname}/test.hml")["compression"], "zlib")
+            self.assertAlmostEqual(
+                float(hml.loadRaster(f"{tname}/test.hml").sum(dtype = numpy.float64)),
+                16.0e6,
+                delta = 1.0,
+            )
+
 # Use the proper idiom in the main module ...
 # NOTE: See https://docs.python.org/3.12/library/multiprocessing.html#the-spawn-and-forkserver-start-methods
 if __name__ == "__main__":